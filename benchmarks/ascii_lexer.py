@@ -0,0 +1,42 @@
+"""Cursor's ASCII fast path against its general path.
+
+    python benchmarks/ascii_lexer.py --size 500000
+
+Non-ASCII characters in each corpus mix are replaced with 'x' so every text
+takes the fast path. For each mix the best of --repeat runs is reported for
+Cursor.tokenize() with the fast path and with is_ascii cleared, which lexes
+the same text the way a text with non-ASCII characters is lexed.
+"""
+
+import argparse
+import re
+
+from common import best_time, corpus_arguments
+from corpus import MIXES, generate
+
+from cjlang.lexer.cursor import Cursor
+
+
+def general(text: str):
+    cursor = Cursor(text)
+    cursor.is_ascii = False
+    return cursor.tokenize()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang ASCII lexer benchmark")
+    corpus_arguments(parser, size=500_000)
+    args = parser.parse_args()
+
+    for mix in args.mix or MIXES:
+        text = re.sub(r"[^\x00-\x7f]", "x", generate(args.size, mix, args.seed))
+        slow = best_time(lambda: general(text), args.repeat)
+        fast = best_time(lambda: Cursor(text).tokenize(), args.repeat)
+        print(
+            f"{mix:>12}: general {len(text) / slow / 1e6:5.2f} M chars/s, "
+            f"ASCII {len(text) / fast / 1e6:5.2f} M chars/s ({slow / fast:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
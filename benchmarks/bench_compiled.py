@@ -0,0 +1,95 @@
+"""Compare lexer throughput of the pure-Python and the cythonized build.
+
+Build the extension modules in place first (scripts/build.sh), then run:
+
+    python benchmarks/bench_compiled.py
+
+The pure-Python side runs against a copy of src/ without any compiled modules.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from common import SRC
+from corpus import generate
+
+WORKER = """
+import json, sys, time
+from cjlang.lexer import cursor
+from cjlang.lexer.cursor import Cursor
+
+text = sys.stdin.read()
+repeat = int(sys.argv[1])
+best = None
+for _ in range(repeat):
+    start = time.perf_counter()
+    tokens = Cursor(text).tokenize()
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+print(json.dumps({
+    "module": cursor.__file__,
+    "tokens": len(tokens),
+    "seconds": best,
+}))
+"""
+
+
+def run(path: str, text: str, repeat: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=path)
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, str(repeat)],
+        input=text,
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000, help="characters in the corpus")
+    parser.add_argument("--mix", default="mixed", help="corpus mix, see corpus.py")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs, best is reported")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    text = generate(args.size, args.mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        pure_src = os.path.join(tmp, "src")
+        shutil.copytree(
+            SRC, pure_src, ignore=shutil.ignore_patterns("*.so", "*.pyd", "*.c", "*.html", "__pycache__")
+        )
+        results = {
+            "pure": run(pure_src, text, args.repeat),
+            "compiled": run(SRC, text, args.repeat),
+        }
+
+    if results["compiled"]["module"].endswith(".py"):
+        print("warning: no compiled cursor module found, run scripts/build.sh first", file=sys.stderr)
+
+    size_mb = len(text.encode("utf-8")) / 1e6
+    for name, result in results.items():
+        result["tokens_per_second"] = result["tokens"] / result["seconds"]
+        result["mb_per_second"] = size_mb / result["seconds"]
+        print(
+            f"{name:>8}: {result['seconds'] * 1000:8.1f} ms  "
+            f"{result['tokens_per_second']:12.0f} tokens/s  {result['mb_per_second']:6.2f} MB/s"
+        )
+    results["speedup"] = results["pure"]["seconds"] / results["compiled"]["seconds"]
+    print(f" speedup: {results['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Lexing UTF-8 bytes with ByteCursor against decoding first and lexing with Cursor.
+
+    python benchmarks/byte_lexer.py --size 500000
+
+For each corpus mix the best of --repeat runs is reported for decode +
+Cursor.tokenize(), ByteCursor.tokenize() with byte offsets and with code
+point offsets, along with the share of non-ASCII bytes in the corpus.
+"""
+
+import argparse
+
+from common import best_time, corpus_arguments
+from corpus import MIXES, generate
+
+from cjlang.lexer.byte_cursor import ByteCursor
+from cjlang.lexer.cursor import Cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang byte lexer benchmark")
+    corpus_arguments(parser, size=500_000)
+    args = parser.parse_args()
+
+    for mix in args.mix or MIXES:
+        data = generate(args.size, mix, args.seed).encode("utf-8")
+        non_ascii = sum(byte >= 0x80 for byte in data) / max(len(data), 1)
+        text = best_time(lambda: Cursor(data.decode("utf-8")).tokenize(), args.repeat)
+        raw = best_time(lambda: ByteCursor(data).tokenize(), args.repeat)
+        points = best_time(lambda: ByteCursor(data, code_points=True).tokenize(), args.repeat)
+        print(
+            f"{mix:>12}: decode + Cursor {len(data) / text / 1e6:5.2f} MB/s, "
+            f"ByteCursor {len(data) / raw / 1e6:5.2f} MB/s ({text / raw:.2f}x), "
+            f"with code points {len(data) / points / 1e6:5.2f} MB/s ({text / points:.2f}x), "
+            f"{non_ascii:.1%} non-ASCII bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
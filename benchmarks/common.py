@@ -0,0 +1,61 @@
+"""Timing and argument helpers shared by the benchmark scripts.
+
+    from common import best_time, corpus_arguments
+
+Importing this module puts the repository's src/ first on sys.path, so the
+scripts measure the checkout they live in rather than an installed cjlang.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Tuple, TypeVar
+
+from corpus import MIXES
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+T = TypeVar("T")
+
+
+def best_run(function: Callable[[], T], repeat: int) -> Tuple[float, T]:
+    """Shortest wall time in seconds of repeat calls, and the last call's result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    return best_run(function, repeat)[0]
+
+
+def corpus_arguments(
+    parser: argparse.ArgumentParser,
+    size: int,
+    size_help: str = "characters per corpus",
+    several_mixes: bool = True,
+    repeat: bool = True,
+):
+    """Add the --size, --mix, --repeat and --seed options of a corpus benchmark.
+
+    With several_mixes, --mix may be given more than once and defaults to
+    None, meaning every mix; otherwise it names one mix, "mixed" by default.
+    """
+    parser.add_argument("--size", type=int, default=size, help=size_help)
+    if several_mixes:
+        parser.add_argument("--mix", action="append", choices=MIXES, help="corpus mixes (default: all)")
+    else:
+        parser.add_argument("--mix", choices=MIXES, default="mixed")
+    if repeat:
+        parser.add_argument("--repeat", type=int, default=3, help="timed runs, best is reported")
+    parser.add_argument("--seed", type=int, default=0)
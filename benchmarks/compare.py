@@ -0,0 +1,59 @@
+"""Compare two result files written by run.py.
+
+    python benchmarks/compare.py results/base.json results/HEAD.json
+
+Prints the throughput ratio per (mix, phase) and exits with status 1 when
+any entry is slower than --threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def index(report: Dict) -> Dict[Tuple[str, str], Dict]:
+    return {(result["mix"], result["phase"]): result for result in report["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare cjlang benchmark results")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.9,
+        help="minimum accepted head/base throughput ratio",
+    )
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    print(f"base {base['meta']['revision']}  head {head['meta']['revision']}")
+    base_results, head_results = index(base), index(head)
+
+    regressions = 0
+    for key in sorted(base_results.keys() & head_results.keys()):
+        old, new = base_results[key], head_results[key]
+        speed = new["tokens_per_second"] / old["tokens_per_second"]
+        memory = new["peak_memory_bytes"] / old["peak_memory_bytes"]
+        flag = ""
+        if speed < args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key[0]:>12} {key[1]:>9}: speed {speed:5.2f}x  memory {memory:5.2f}x{flag}")
+
+    ratio = head["import_seconds"] / base["import_seconds"]
+    print(f"{'import':>22}: time {ratio:5.2f}x")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Deterministic synthetic Cangjie corpora for benchmarks.
+
+    text = generate(1_000_000, mix="identifiers", seed=0)
+
+The same (size, mix, seed) always yields the same text, so results can be
+compared between commits.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+ASCII_WORDS = [
+    "value", "count", "index", "buffer", "result", "item", "node", "size",
+    "name", "offset", "length", "parent", "child", "cache", "state", "token",
+]
+CJK_WORDS = ["变量", "函数", "结果", "数组", "索引", "节点", "缓存", "仓颉", "长度", "名称"]
+TYPES = ["Int64", "Int32", "UInt8", "Float64", "Bool", "Rune", "Unit"]
+
+
+def ascii_identifier(rng: random.Random) -> str:
+    word = rng.choice(ASCII_WORDS)
+    if rng.random() < 0.5:
+        word += rng.choice(ASCII_WORDS).capitalize()
+    if rng.random() < 0.3:
+        word += str(rng.randrange(100))
+    return word
+
+
+def cjk_identifier(rng: random.Random) -> str:
+    word = rng.choice(CJK_WORDS)
+    if rng.random() < 0.5:
+        word += rng.choice(CJK_WORDS)
+    if rng.random() < 0.3:
+        word += "_" + rng.choice(ASCII_WORDS)
+    return word
+
+
+def numeric_literal(rng: random.Random) -> str:
+    choice = rng.randrange(7)
+    if choice == 0:
+        return str(rng.randrange(1, 10**9))
+    if choice == 1:
+        return f"{rng.randrange(1, 10**6):_}" + rng.choice(["", "i64", "u8"])
+    if choice == 2:
+        return f"0x{rng.randrange(16**8):X}"
+    if choice == 3:
+        return f"0b{rng.randrange(2**16):b}"
+    if choice == 4:
+        return f"0o{rng.randrange(8**6):o}"
+    if choice == 5:
+        return f"{rng.randrange(1000)}.{rng.randrange(1000)}e-{rng.randrange(1, 20)}"
+    return f"{rng.randrange(1000)}.{rng.randrange(1, 1000)}" + rng.choice(["", "f32", "f64"])
+
+
+def identifier_body(rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(rng.randrange(4, 12)):
+        lines.append(
+            f"    let {ascii_identifier(rng)}: {rng.choice(TYPES)} = "
+            f"{ascii_identifier(rng)} + {ascii_identifier(rng)}.{ascii_identifier(rng)}"
+        )
+    return lines
+
+
+def cjk_body(rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(rng.randrange(4, 12)):
+        lines.append(
+            f"    var {cjk_identifier(rng)} = {cjk_identifier(rng)}({cjk_identifier(rng)}, "
+            f"{ascii_identifier(rng)})"
+        )
+    return lines
+
+
+def numeric_body(rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(rng.randrange(4, 12)):
+        operands = [numeric_literal(rng) for _ in range(rng.randrange(2, 6))]
+        lines.append(f"    let {ascii_identifier(rng)} = [{', '.join(operands)}]")
+    return lines
+
+
+def nesting_body(rng: random.Random) -> List[str]:
+    depth = rng.randrange(8, 24)
+    lines = []
+    for level in range(depth):
+        indent = "    " * (level + 1)
+        lines.append(f"{indent}if ({ascii_identifier(rng)} < ({ascii_identifier(rng)} * {level})) {{")
+    lines.append("    " * (depth + 1) + f"return {ascii_identifier(rng)}[{ascii_identifier(rng)}]")
+    for level in reversed(range(depth)):
+        lines.append("    " * (level + 1) + "}")
+    return lines
+
+
+def comment_body(rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(rng.randrange(4, 12)):
+        words = " ".join(rng.choice(ASCII_WORDS + CJK_WORDS) for _ in range(rng.randrange(4, 16)))
+        if rng.random() < 0.5:
+            lines.append(f"    // {words}")
+        else:
+            lines.append(f"    /* {words}\n     * {words} */")
+        lines.append(f"    {ascii_identifier(rng)} = {ascii_identifier(rng)}")
+    return lines
+
+
+BODIES: Dict[str, Callable[[random.Random], List[str]]] = {
+    "identifiers": identifier_body,
+    "cjk": cjk_body,
+    "numeric": numeric_body,
+    "nesting": nesting_body,
+    "comments": comment_body,
+}
+MIXES = list(BODIES) + ["mixed"]
+
+
+def generate(size: int, mix: str = "mixed", seed: int = 0) -> str:
+    """Return at least size characters of Cangjie source made of top-level functions."""
+    if mix != "mixed" and mix not in BODIES:
+        raise ValueError(f"unknown corpus mix {mix!r}, expected one of {MIXES}")
+    rng = random.Random(f"{mix}:{seed}")
+    bodies = list(BODIES.values())
+    parts = ["package bench\n\nimport std.collection.*\n"]
+    length = len(parts[0])
+    number = 0
+    while length < size:
+        if mix == "mixed":
+            body = bodies[number % len(bodies)]
+        else:
+            body = BODIES[mix]
+        lines = [f"\nfunc {ascii_identifier(rng)}{number}(): Unit {{"]
+        lines.extend(body(rng))
+        lines.append("}\n")
+        part = "\n".join(lines)
+        parts.append(part)
+        length += len(part)
+        number += 1
+    return "".join(parts)
@@ -0,0 +1,99 @@
+"""Keystroke-to-diagnostics latency of the language server.
+
+    python benchmarks/lsp_latency.py --lines 10000 --keystrokes 200
+
+Opens a synthetic document of --lines lines, then types a short word one
+character at a time at random positions inside it, deleting the word again
+afterwards so that damage does not accumulate. Each sample is the time to
+apply one keystroke, re-analyze and build the publishDiagnostics payload,
+i.e. the work done per keystroke once the debounce delay has passed.
+
+Semantic tokens are timed separately per keystroke: a full result joining
+every segment's encoded tokens, and a delta result against the previous one.
+
+Keystrokes that change where the parser resynchronizes, such as an unclosed
+'(' in a declaration header, re-analyze everything up to the next point where
+it does and show up as the slow tail.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import common  # noqa: F401, puts src/ first on sys.path
+from corpus import MIXES, generate
+
+from cjlang.lsp import semantic
+from cjlang.lsp.document import Document
+from cjlang.lsp.server import lsp_diagnostics
+
+
+WORDS = ["value", " + 1", "x.y", "count2", "(a, b)"]
+
+
+def document_text(lines: int, mix: str, seed: int) -> str:
+    text = generate(lines * 40, mix, seed)
+    while text.count("\n") < lines:
+        text = generate(len(text) * 2, mix, seed)
+    return "\n".join(text.split("\n")[:lines]) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang language server latency")
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--keystrokes", type=int, default=200)
+    parser.add_argument("--mix", choices=MIXES, default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    text = document_text(args.lines, args.mix, args.seed)
+    start = time.perf_counter()
+    document = Document(text)
+    lsp_diagnostics(document)
+    open_seconds = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    lines = text.split("\n")
+    samples = []
+    full_samples = []
+    delta_samples = []
+    chunks = document.semantic_chunks()
+    while len(samples) < args.keystrokes:
+        line = rng.randrange(len(lines))
+        character = rng.randrange(len(lines[line]) + 1)
+        word = rng.choice(WORDS)
+        for offset, char in enumerate(word):
+            position = (line, character + offset)
+            start = time.perf_counter()
+            document.apply_change(position, position, char)
+            lsp_diagnostics(document)
+            samples.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            semantic.join(document.semantic_chunks())
+            full_samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            previous, chunks = chunks, document.semantic_chunks()
+            semantic.delta(previous, chunks)
+            delta_samples.append(time.perf_counter() - start)
+        document.apply_change((line, character), (line, character + len(word)), "")
+        chunks = document.semantic_chunks()
+
+    samples.sort()
+    print(f"document: {args.lines} lines, {len(text)} chars, {len(document.segments)} segments")
+    print(f"open: {open_seconds * 1000:.1f} ms")
+    print(
+        f"keystroke: median {statistics.median(samples) * 1000:.2f} ms, "
+        f"p95 {samples[int(len(samples) * 0.95) - 1] * 1000:.2f} ms, "
+        f"max {samples[-1] * 1000:.2f} ms, "
+        f"{sum(sample < 0.01 for sample in samples) / len(samples):.0%} under 10 ms"
+    )
+    print(
+        f"semantic tokens: full median {statistics.median(full_samples) * 1000:.2f} ms, "
+        f"delta median {statistics.median(delta_samples) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
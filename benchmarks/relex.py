@@ -0,0 +1,63 @@
+"""Re-lexing after an edit from checkpoints against tokenizing the whole text again.
+
+    python benchmarks/relex.py --size 1000000 --edits 50
+
+Applies --edits random single-character insertions to a corpus of --size
+characters and reports the mean time per edit of Cursor.tokenize() on the
+whole new text and of relex() from the checkpoints, for each --every.
+"""
+
+import argparse
+import random
+import time
+
+from common import corpus_arguments
+from corpus import generate
+
+from cjlang.lexer.checkpoints import Checkpoints, relex
+from cjlang.lexer.cursor import Cursor
+
+
+def edits(text: str, count: int, seed: int):
+    """(new text, start, old end, new end) of count single-character insertions."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = rng.randrange(len(text))
+        text = text[:start] + " " + text[start:]
+        yield text, start, start, start + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang incremental re-lexing benchmark")
+    corpus_arguments(parser, size=1_000_000, several_mixes=False, repeat=False)
+    parser.add_argument("--edits", type=int, default=50)
+    parser.add_argument("--every", type=int, nargs="+", default=[64, 256, 1024])
+    args = parser.parse_args()
+
+    text = generate(args.size, args.mix, args.seed)
+    start = time.perf_counter()
+    for new_text, _, _, _ in edits(text, args.edits, args.seed):
+        Cursor(new_text).tokenize()
+    full = (time.perf_counter() - start) / args.edits
+    print(f"{'full':>10}: {full * 1000:9.2f} ms per edit")
+
+    for every in args.every:
+        cursor = Cursor(text)
+        tokens = cursor.tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every)
+        start = time.perf_counter()
+        for new_text, edit_start, old_end, new_end in edits(text, args.edits, args.seed):
+            tokens, checkpoints = relex(
+                Cursor(new_text, symbols=cursor.symbols),
+                tokens,
+                checkpoints,
+                edit_start,
+                old_end,
+                new_end,
+            )
+        seconds = (time.perf_counter() - start) / args.edits
+        print(f"{every:>10}: {seconds * 1000:9.2f} ms per edit ({full / seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
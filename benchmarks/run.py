@@ -0,0 +1,173 @@
+"""Tokenize and parse throughput on synthetic corpora.
+
+    python benchmarks/run.py --size 1000000 --output results/HEAD.json
+    python benchmarks/compare.py results/base.json results/HEAD.json
+
+Each corpus mix is tokenized and parsed; the best of --repeat runs gives
+the throughput, and a separate traced run gives the peak memory.
+
+    python benchmarks/run.py --profile results/profile.json
+    python benchmarks/run.py --profile results/new.json --profile-base results/profile.json
+
+--profile parses every mix once with the instrumented lexer and parser and
+writes the per-token, per-scanner and per-production report, optionally
+printing its difference to an earlier report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+from common import ROOT, SRC, best_run, corpus_arguments
+from corpus import MIXES, generate
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+from cjlang.profiling import Profile, ProfilingCursor, ProfilingParser, diff_reports
+
+
+def tokenize(text: str) -> int:
+    return len(Cursor(text).tokenize())
+
+
+def parse(text: str) -> int:
+    parser = CangjieParser(Cursor(text))
+    parser.parse()
+    return len(parser.tokens)
+
+
+PHASES: Dict[str, Callable[[str], int]] = {
+    "tokenize": tokenize,
+    "parse": parse,
+}
+
+
+def peak_memory(function: Callable[[str], int], text: str) -> int:
+    tracemalloc.start()
+    try:
+        function(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def profile(size: int, mixes: List[str], seed: int) -> Dict:
+    """Instrumented parse of every mix, accumulated into one report."""
+    result = Profile()
+    for mix in mixes:
+        ProfilingParser(ProfilingCursor(generate(size, mix, seed), profile=result)).parse()
+    return result.report()
+
+
+def write_json(path: str, data: Dict):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def import_time(repeat: int) -> float:
+    """Best wall time of importing the parser in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        "import cjlang.parser.parser; print(time.perf_counter() - start)"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        )
+        times.append(float(result.stdout))
+    return min(times)
+
+
+def git_revision() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(size: int, mixes: List[str], phases: List[str], repeat: int, seed: int) -> Dict:
+    results = []
+    for mix in mixes:
+        text = generate(size, mix, seed)
+        size_mb = len(text.encode("utf-8")) / 1e6
+        for phase in phases:
+            function = PHASES[phase]
+            seconds, tokens = best_run(lambda: function(text), repeat)
+            result = {
+                "mix": mix,
+                "phase": phase,
+                "chars": len(text),
+                "tokens": tokens,
+                "seconds": seconds,
+                "tokens_per_second": tokens / seconds,
+                "mb_per_second": size_mb / seconds,
+                "peak_memory_bytes": peak_memory(function, text),
+            }
+            results.append(result)
+            print(
+                f"{mix:>12} {phase:>9}: {seconds * 1000:9.1f} ms "
+                f"{result['tokens_per_second']:11.0f} tokens/s "
+                f"{result['mb_per_second']:6.2f} MB/s "
+                f"{result['peak_memory_bytes'] / 1e6:8.1f} MB peak"
+            )
+
+    seconds = import_time(repeat)
+    print(f"{'import':>22}: {seconds * 1000:9.1f} ms")
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "import_seconds": seconds,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang tokenize/parse benchmarks")
+    corpus_arguments(parser, size=500_000)
+    parser.add_argument("--phase", action="append", choices=list(PHASES), help="phases (default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--profile", help="write an instrumented profile as JSON instead of timing")
+    parser.add_argument("--profile-base", help="earlier profile to diff the new one against")
+    args = parser.parse_args()
+
+    if args.profile:
+        report = profile(args.size, args.mix or MIXES, args.seed)
+        write_json(args.profile, report)
+        if args.profile_base:
+            with open(args.profile_base, encoding="utf-8") as f:
+                print("\n".join(diff_reports(json.load(f), report)) or "no differences")
+        return
+
+    report = run(
+        args.size, args.mix or MIXES, args.phase or list(PHASES), args.repeat, args.seed
+    )
+    if args.output:
+        write_json(args.output, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Multi-core scaling of lexing and parsing on a thread pool.
+
+    python3.13t benchmarks/threads.py --files 64 --size 50000 --threads 1 2 4 8
+
+Generates --files texts of --size characters and parses each one with its
+own Cursor and CangjieParser on a ThreadPoolExecutor of each listed size.
+The best of --repeat runs is reported as throughput and as speedup over one
+thread. With the GIL enabled the speedup stays near 1x; on a free-threaded
+build (python3.13t with the GIL disabled) it should grow with the thread
+count up to the number of cores.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from common import best_time, corpus_arguments
+from corpus import generate
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+
+
+def parse(text: str) -> int:
+    parser = CangjieParser(Cursor(text))
+    parser.parse()
+    return len(parser.tokens)
+
+
+def gil_status() -> str:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return "GIL build"
+    return "free-threaded build, GIL " + ("enabled" if is_gil_enabled() else "disabled")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang thread scaling benchmark")
+    corpus_arguments(parser, size=50_000, size_help="characters per text", several_mixes=False)
+    parser.add_argument("--files", type=int, default=64, help="texts per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {gil_status()}, {os.cpu_count()} CPUs")
+    texts = [generate(args.size, args.mix, args.seed + index) for index in range(args.files)]
+    chars = sum(len(text) for text in texts)
+    tokens = sum(parse(text) for text in texts)
+
+    baseline = None
+    for threads in args.threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            # Start the workers outside the timed runs
+            list(pool.map(abs, range(threads)))
+            seconds = best_time(lambda: list(pool.map(parse, texts)), args.repeat)
+        baseline = seconds if baseline is None else baseline
+        print(
+            f"{threads:>3} threads: {chars / seconds / 1e6:6.2f} M chars/s, "
+            f"{tokens / seconds:10.0f} tokens/s, {baseline / seconds:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Vocabulary encoding throughput against the plain tokenize path.
+
+    python benchmarks/vocab.py --size 500000 --max-size 20000
+
+For each corpus mix a vocabulary is built from a corpus generated with a
+different seed, so that some tokens fall out of vocabulary as they would on
+unseen code. The best of --repeat runs is reported for Cursor.tokenize(),
+Vocabulary.encode() and Vocabulary.decode(), with the out-of-vocabulary rate.
+"""
+
+import argparse
+from collections import Counter
+
+from common import best_time, corpus_arguments
+from corpus import MIXES, generate
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.vocab import Vocabulary, count_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cjlang vocabulary encoding benchmark")
+    corpus_arguments(parser, size=500_000)
+    parser.add_argument("--max-size", type=int, default=20_000, help="vocabulary size")
+    args = parser.parse_args()
+
+    for mix in args.mix or MIXES:
+        counts: Counter = Counter()
+        count_text(generate(args.size, mix, args.seed + 1), counts)
+        vocabulary = Vocabulary.from_counts(counts, max_size=args.max_size)
+        text = generate(args.size, mix, args.seed)
+
+        tokenize = best_time(lambda: Cursor(text).tokenize(), args.repeat)
+        encode = best_time(lambda: vocabulary.encode(text), args.repeat)
+        ids = vocabulary.encode(text)
+        decode = best_time(lambda: vocabulary.decode(ids), args.repeat)
+        unknown = sum(vocabulary.is_unknown(token_id) for token_id in ids) / max(len(ids), 1)
+        print(
+            f"{mix:>12}: tokenize {len(ids) / tokenize:9.0f} tokens/s, "
+            f"encode {len(ids) / encode:9.0f} tokens/s ({encode / tokenize:.2f}x time), "
+            f"decode {len(ids) / decode / 1e6:6.1f} M tokens/s, "
+            f"{len(vocabulary)} ids, {unknown:.1%} out of vocabulary"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,6 @@ rm src/cjlang/*/*.c
 rm src/cjlang/*.pyd
 rm src/cjlang/*/*.pyd
 rm src/cjlang/*.html
-rm src/cjlang/*/*.html
\ No newline at end of file
+rm src/cjlang/*/*.html
+rm src/cjlang/*.so
+rm src/cjlang/*/*.so
@@ -128,7 +128,7 @@ def escape_char(c):
 
 def emit_bsearch_range_table(f):
     f.write("""
-def bsearch_range_table(c: str, r: list[tuple[str, str]]) -> bool:
+def bsearch_range_table(c: str, r: Tuple[Tuple[str, str], ...]) -> bool:
     low, high = 0, len(r) - 1
 
     while low <= high:
@@ -146,9 +146,10 @@ def bsearch_range_table(c: str, r: list[tuple[str, str]]) -> bool:
 \n
 """)
 
-def emit_table(f, name, t_data, t_type = "List[Tuple[str, str]]", is_pub=True,
+def emit_table(f, name, t_data, t_type = "Tuple[Tuple[str, str], ...]", is_pub=True,
         pfun=lambda x: "(%s,%s)" % (escape_char(x[0]), escape_char(x[1])), is_const=True):
-    f.write("%s : %s = [\n" % (name, t_type))
+    # Tuples, so that the tables shared by every lexer thread are immutable
+    f.write("%s : %s = (\n" % (name, t_type))
     data = ""
     first = True
     for dat in t_data:
@@ -157,7 +158,7 @@ def emit_table(f, name, t_data, t_type = "List[Tuple[str, str]]", is_pub=True,
         first = False
         data += pfun(dat)
     format_table_content(f, data, 8)
-    f.write("\n    ]\n\n")
+    f.write("\n    )\n\n")
 
 def emit_property_module(f, mod, tbl, emit):
     for cat in sorted(emit):
@@ -183,7 +184,7 @@ if __name__ == "__main__":
         rf.write("""
 # The version of [Unicode](http://www.unicode.org/)
 # that this version of unicode-xid is based on.
-from typing import Tuple, List
+from typing import Tuple
 
 UNICODE_VERSION: Tuple[int, int, int] = (%s, %s, %s)
 """ % unicode_version)
@@ -16,22 +16,29 @@ from Cython.Compiler import Options
 Options.docstrings = True
 Options.annotate = False
 
-# Modules to be compiled and include_dirs when necessary
+# Modules to be compiled and include_dirs when necessary.
+# Modules with a .pxd next to them are built as typed extension types.
+compiled_modules = [
+    "src/cjlang/ast/node.py",
+    "src/cjlang/ast/tree.py",
+    "src/cjlang/diagnostics/diagnostic.py",
+    "src/cjlang/diagnostics/engine.py",
+    "src/cjlang/lexer/byte_cursor.py",
+    "src/cjlang/lexer/cursor.py",
+    "src/cjlang/lexer/kinds.py",
+    "src/cjlang/lexer/pipeline.py",
+    "src/cjlang/lexer/symbols.py",
+    "src/cjlang/parser/parser.py",
+    "src/cjlang/utils/__init__.py",
+]
+
 extensions = [
     Extension(
-        "*",
-        [
-            "src/cjlang/ast/node.py",
-            "src/cjlang/ast/tree.py",
-            "src/cjlang/diagnostics/diagnostic.py",
-            "src/cjlang/diagnostics/engine.py",
-            "src/cjlang/lexer/cursor.py",
-            "src/cjlang/lexer/kinds.py",
-            "src/cjlang/parser/parser.py",
-            "src/cjlang/utils/__init__.py",
-        ],
+        path[len("src/"):-len(".py")].replace("/", "."),
+        [path],
         include_dirs=[],
-    ),
+    )
+    for path in compiled_modules
 ]
 
 
@@ -46,6 +53,12 @@ setup(
     ext_modules=cythonize(
         extensions,
         annotate=True,
-        compiler_directives={"language_level": 3, "profile": False},
+        # freethreading_compatible keeps the GIL disabled on free-threaded builds
+        # when these modules are imported; they share no mutable module state
+        compiler_directives={
+            "language_level": 3,
+            "profile": False,
+            "freethreading_compatible": True,
+        },
     ),
 )
@@ -0,0 +1,5 @@
+import sys
+
+from cjlang.cli import main
+
+sys.exit(main())
@@ -0,0 +1,125 @@
+"""asyncio front end to the batch driver.
+
+    async with AsyncDriver(ProcessPoolExecutor(4), concurrency=8) as driver:
+        async for result in driver.parse_files(paths):
+            ...
+
+    result = await atokenize_file("main.cj")
+
+Reading, lexing and parsing all happen in driver.process_file on an
+executor, so the event loop is never blocked. The default is the loop's
+default thread pool, which keeps the loop responsive. Lexing holds the GIL,
+though, so pass a ProcessPoolExecutor to analyze files in parallel.
+
+At most `concurrency` files are in flight per driver, across concurrent
+callers. The iterators submit a new file only when the consumer asks for the
+next result, so a slow consumer holds back reading and analysis instead of
+queueing results in memory. If the consumer stops early or is cancelled,
+files not yet started are cancelled. Files already running in a worker
+finish there and their results are dropped.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor
+from functools import partial
+from typing import AsyncIterator, Iterable, Optional, Set
+
+from cjlang.driver import PARSE, TOKENIZE, FileResult, process_file
+
+
+class AsyncDriver:
+    """Per-file analysis on an executor; leaving `async with` shuts the executor down."""
+
+    def __init__(self, executor: Optional[Executor] = None, concurrency: Optional[int] = None):
+        # None runs on the event loop's default executor
+        self.executor = executor
+        self.concurrency = 2 * (os.cpu_count() or 1) if concurrency is None else concurrency
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        # Created on first use, inside the running loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncDriver":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.executor is not None:
+            # Shutting down waits for running work, so do it off the loop
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def process_file(self, path: str, mode: str = PARSE, details: bool = False) -> FileResult:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(process_file, path, mode, False, details)
+            )
+
+    async def tokenize_file(self, path: str, details: bool = False) -> FileResult:
+        return await self.process_file(path, TOKENIZE, details)
+
+    async def parse_file(self, path: str, details: bool = False) -> FileResult:
+        return await self.process_file(path, PARSE, details)
+
+    async def process_files(
+        self, paths: Iterable[str], mode: str = PARSE, details: bool = False
+    ) -> AsyncIterator[FileResult]:
+        """Results in completion order, with at most `concurrency` files in flight."""
+        remaining = iter(paths)
+        pending: Set[asyncio.Future] = set()
+        try:
+            while True:
+                while len(pending) < self.concurrency:
+                    path = next(remaining, None)
+                    if path is None:
+                        break
+                    pending.add(asyncio.ensure_future(self.process_file(path, mode, details)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Hand out one result at a time; the rest wait in `done` without new submissions
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def tokenize_files(self, paths: Iterable[str], details: bool = False) -> AsyncIterator[FileResult]:
+        return self.process_files(paths, TOKENIZE, details)
+
+    def parse_files(self, paths: Iterable[str], details: bool = False) -> AsyncIterator[FileResult]:
+        return self.process_files(paths, PARSE, details)
+
+
+async def atokenize_file(
+    path: str, executor: Optional[Executor] = None, details: bool = False
+) -> FileResult:
+    return await AsyncDriver(executor, 1).tokenize_file(path, details)
+
+
+async def aparse_file(
+    path: str, executor: Optional[Executor] = None, details: bool = False
+) -> FileResult:
+    return await AsyncDriver(executor, 1).parse_file(path, details)
+
+
+def atokenize_files(
+    paths: Iterable[str],
+    executor: Optional[Executor] = None,
+    concurrency: Optional[int] = None,
+    details: bool = False,
+) -> AsyncIterator[FileResult]:
+    return AsyncDriver(executor, concurrency).tokenize_files(paths, details)
+
+
+def aparse_files(
+    paths: Iterable[str],
+    executor: Optional[Executor] = None,
+    concurrency: Optional[int] = None,
+    details: bool = False,
+) -> AsyncIterator[FileResult]:
+    return AsyncDriver(executor, concurrency).parse_files(paths, details)
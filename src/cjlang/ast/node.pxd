@@ -0,0 +1,15 @@
+# Augmenting declarations for the compiled build of node.py.
+
+cimport cython
+
+cdef class Node:
+    cdef object _kind
+    cdef list _children
+    cdef Py_ssize_t _token_start
+    cdef Py_ssize_t _token_end
+    cdef object _hash
+
+    cpdef add_child(self, Node child)
+
+    @cython.locals(child=Node, position=Py_ssize_t)
+    cpdef bytes structural_hash(self, tokens)
@@ -1,5 +1,6 @@
 
-from typing import List
+from hashlib import blake2b
+from typing import List, Sequence, Tuple
 
 from enum import Enum
 
@@ -14,6 +15,12 @@ class NodeKind(Enum):
     VariableDeclaration = 8
     EnumDefinition = 9
     StructDefinition = 10
+    InterfaceDefinition = 11
+    ExtendDefinition = 12
+    MainDefinition = 13
+    MacroDefinition = 14
+    TypeAliasDefinition = 15
+    ImportDirective = 16
 
 class Node(object):
     def __init__(self, kind: NodeKind, token_start: int, token_end: int):
@@ -21,6 +28,8 @@ class Node(object):
         self._children = []
         self._token_start: int = token_start
         self._token_end: int = token_end
+        # Digest of the subtree, computed by structural_hash on first use
+        self._hash = None
         
 
     def __iter__(self):
@@ -32,9 +41,84 @@ class Node(object):
                 (node == pattern)):
                 yield path, node
     @property
+    def kind(self) -> NodeKind:
+        return self._kind
+
+    @property
+    def token_start(self) -> int:
+        return self._token_start
+
+    @property
+    def token_end(self) -> int:
+        return self._token_end
+
+    @property
     def children(self) -> List["Node"]:
         return self._children
 
+    def add_child(self, child: "Node"):
+        self._children.append(child)
+
+    def structural_hash(self, tokens: Sequence) -> bytes:
+        """Digest of the kind, the token types and values and the child digests of this subtree.
+
+        tokens is the list token_start and token_end index, the parser's tokens.
+        Offsets do not go in, so a subtree hashes the same wherever it moves.
+        Each node keeps its digest once computed, so the tree and tokens must
+        not change afterwards.
+        """
+        if self._hash is None:
+            digest = blake2b(self._kind.name.encode(), digest_size=16)
+            position = self._token_start
+            for child in self._children:
+                _hash_tokens(digest, tokens, position, child._token_start)
+                digest.update(b"\x02")
+                digest.update(child.structural_hash(tokens))
+                position = child._token_end
+            _hash_tokens(digest, tokens, position, self._token_end)
+            self._hash = digest.digest()
+        return self._hash
+
+    def same_structure(self, tokens: Sequence, other: "Node", other_tokens: Sequence) -> bool:
+        """Whether other, over other_tokens, has the same kinds, tokens and shape as this subtree."""
+        return self.structural_hash(tokens) == other.structural_hash(other_tokens)
+
+    def __repr__(self):
+        return f"Node({self._kind.name}, {self._token_start}, {self._token_end})"
+
+def _hash_tokens(digest, tokens: Sequence, start: int, end: int):
+    for index in range(start, end):
+        token = tokens[index]
+        value = "" if token.value is None else token.value
+        digest.update(f"{token.type.name}\x00{value}\x01".encode("utf-8", "surrogatepass"))
+
+
+def changed_children(
+    old: Node, old_tokens: Sequence, new: Node, new_tokens: Sequence
+) -> Tuple[List[Node], List[Node]]:
+    """Children of old with no equal child in new, and children of new with none in old.
+
+    Children are matched by structural_hash, as many times as they occur, so
+    moving a declaration changes nothing and once the digests are known the
+    cost grows with the number of children, not with the size of the trees.
+    """
+    if old.structural_hash(old_tokens) == new.structural_hash(new_tokens):
+        return [], []
+    remaining = {}
+    for child in old.children:
+        remaining.setdefault(child.structural_hash(old_tokens), []).append(child)
+    added = []
+    for child in new.children:
+        matches = remaining.get(child.structural_hash(new_tokens))
+        if matches:
+            matches.pop(0)
+        else:
+            added.append(child)
+    unmatched = {child for children in remaining.values() for child in children}
+    removed = [child for child in old.children if child in unmatched]
+    return removed, added
+
+
 def walk_tree(root: Node):
     children = None
 
@@ -0,0 +1,200 @@
+"""Process-wide cache of lexed and parsed files.
+
+    cache = default_cache()
+    entry = cache.parse_file("main.cj")         # valid while mtime and size match
+    entry = cache.parse_text(text, "main.cj")   # keyed by a hash of the text
+    print(entry.tree, entry.diagnostics, cache.stats())
+
+Files are keyed by (absolute path, mtime_ns, size) and texts by their path
+and a BLAKE2 digest of their contents, separately for tokenize and parse
+results. The least recently used entries are evicted once the estimated
+memory, derived from the token and node counts, exceeds the byte budget;
+replacing a file's entry with one for newer contents drops the old one
+right away. refresh() re-analyzes cached files whose mtime or size changed
+since, for a polling thread keeping a workspace current. stats() reports
+entries, size, budget, hits, misses, evictions and analyses.
+
+Entries are shared by every caller that hits them, so their tokens and
+trees must be treated as read-only. The cache is safe to use from several
+threads; two threads missing on the same key may both lex the file, and
+the last one to finish is kept.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from cjlang.ast.node import Node
+from cjlang.diagnostics.emitter import diagnostic_record
+from cjlang.driver import MODES, PARSE, TOKENIZE
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.parser.parser import CangjieParser
+from cjlang.utils.lru import LRUCache
+
+# Measured retained memory per cached token, trivia included for TOKENIZE
+# entries (token, symbol, location data)
+TOKEN_BYTES = 180
+NODE_BYTES = 200
+
+
+class CachedFile:
+    """Tokens, and for PARSE the tree, of one text with its diagnostics."""
+
+    __slots__ = ("path", "mode", "cursor", "tokens", "tree", "diagnostics", "error", "memory")
+
+    def __init__(self, path: Optional[str], mode: str):
+        self.path = path
+        self.mode = mode
+        self.cursor: Optional[Cursor] = None
+        # All tokens for TOKENIZE, the significant ones the parser saw for PARSE
+        self.tokens: List[Token] = []
+        self.tree: Optional[Node] = None
+        self.diagnostics: List[Dict[str, Any]] = []
+        # Set when the lexer gave up
+        self.error: Optional[str] = None
+        self.memory = 0
+
+
+def analyze(text: str, path: Optional[str], mode: str) -> CachedFile:
+    entry = CachedFile(path, mode)
+    nodes = 0
+    try:
+        cursor = Cursor(text, path)
+        if mode == TOKENIZE:
+            entry.tokens = cursor.tokenize()
+        else:
+            parser = CangjieParser(cursor)
+            entry.tree = parser.parse()
+            entry.tokens = parser.tokens
+            nodes = sum(1 for _ in entry.tree)
+        entry.cursor = cursor
+        entry.diagnostics = [
+            diagnostic_record(diagnostic) for diagnostic in cursor.diagnostics.diagnostics
+        ]
+    except Exception as e:
+        # The lexer raises a bare Exception on characters it cannot handle
+        entry.error = f"{type(e).__name__}: {e}"
+    entry.memory = sys.getsizeof(text) + len(entry.tokens) * TOKEN_BYTES + nodes * NODE_BYTES
+    return entry
+
+
+class ParseCache:
+    """Tokenize and parse results bounded by an estimated memory budget."""
+
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024):
+        self._entries: LRUCache[CachedFile] = LRUCache(
+            budget_bytes, sizeof=lambda entry: entry.memory, on_evict=self._evicted
+        )
+        # (mode, path) -> key of the entry for the file's latest known contents
+        self._files: Dict[Tuple[str, str], Hashable] = {}
+        self._lock = threading.Lock()
+        # Texts lexed, as opposed to lookups answered from the cache
+        self.analyses = 0
+
+    def tokenize_file(self, path: str) -> CachedFile:
+        """All tokens of the file at path; raises OSError and UnicodeDecodeError."""
+        return self._file(path, TOKENIZE)
+
+    def parse_file(self, path: str) -> CachedFile:
+        """The tree and significant tokens of the file at path; raises like tokenize_file."""
+        return self._file(path, PARSE)
+
+    def tokenize_text(self, text: str, path: Optional[str] = None) -> CachedFile:
+        return self._text(text, path, TOKENIZE)
+
+    def parse_text(self, text: str, path: Optional[str] = None) -> CachedFile:
+        return self._text(text, path, PARSE)
+
+    def _file(self, path: str, mode: str) -> CachedFile:
+        path = os.path.abspath(path)
+        # Stat before reading: a write in between leaves a stale stamp, not stale tokens
+        stat = os.stat(path)
+        key = (mode, path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        entry = analyze(text, path, mode)
+        with self._lock:
+            self.analyses += 1
+            previous = self._files.pop((mode, path), None)
+            if previous is not None and previous != key:
+                self._entries.pop(previous)
+            if self._entries.put(key, entry):
+                self._files[(mode, path)] = key
+        return entry
+
+    def _text(self, text: str, path: Optional[str], mode: str) -> CachedFile:
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        key = (mode, path, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        entry = analyze(text, path, mode)
+        with self._lock:
+            self.analyses += 1
+            self._entries.put(key, entry)
+        return entry
+
+    def _evicted(self, key: Hashable, entry: CachedFile):
+        # Called under the lock from LRUCache.put; file keys have four fields, text keys three
+        if len(key) == 4 and self._files.get((key[0], key[1])) == key:
+            del self._files[(key[0], key[1])]
+
+    def invalidate(self, path: str):
+        """Drop the entries of the file at path, whichever contents they were for."""
+        path = os.path.abspath(path)
+        with self._lock:
+            for mode in MODES:
+                key = self._files.pop((mode, path), None)
+                if key is not None:
+                    self._entries.pop(key)
+
+    def refresh(self) -> List[str]:
+        """Re-analyze cached files that changed and drop deleted ones; returns their paths."""
+        with self._lock:
+            files = list(self._files.items())
+        changed = []
+        for (mode, path), key in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.invalidate(path)
+                changed.append(path)
+                continue
+            if key[2:] != (stat.st_mtime_ns, stat.st_size):
+                try:
+                    self._file(path, mode)
+                except (OSError, UnicodeDecodeError):
+                    self.invalidate(path)
+                changed.append(path)
+        return list(dict.fromkeys(changed))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._entries.stats()
+            stats["analyses"] = self.analyses
+        return stats
+
+
+_default: Optional[ParseCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> ParseCache:
+    """The cache shared by everything in this process, created on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ParseCache()
+        return _default
@@ -0,0 +1,293 @@
+"""The cjlang command line.
+
+    cjlang tokenize src/main.cj
+    cjlang parse --format json src/
+    cjlang check -j 4 --stats "src/**/*.cj"
+    cjlang check --format sarif src/ > cjlang.sarif
+    cjlang daemon --socket /tmp/cjlang.sock src/
+    cjlang lsp
+    cjlang export -j 8 dataset/ corpus/
+
+Inputs may be files, directories (searched recursively for *.cj) or glob
+patterns. The lexer and the parser are imported only once a command runs,
+so `cjlang --version` stays fast. The exit status is 1 when any file has
+errors and 2 when no input file was found.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Iterable, List, Optional
+
+from cjlang import __version__
+
+SOURCE_SUFFIX = ".cj"
+
+# Category of the diagnostic standing for a file that could not be processed
+# at all, in the jsonl and sarif formats
+FILE_ERROR_CATEGORY = "Fatal Issue"
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Files named by the inputs, in order and without duplicates."""
+    paths: List[str] = []
+    seen = set()
+
+    def add(path: str):
+        path = os.path.normpath(path)
+        if path not in seen:
+            seen.add(path)
+            paths.append(path)
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for directory, dirnames, filenames in os.walk(item):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(SOURCE_SUFFIX):
+                        add(os.path.join(directory, filename))
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    add(path)
+        else:
+            # Missing files are kept so that they are reported as errors
+            add(item)
+    return paths
+
+
+def format_diagnostic(record) -> str:
+    return (
+        f"{record['file']}:{record['line']}:{record['column']}: "
+        f"{record['severity']}: {record['message']} [{record['category']}]"
+    )
+
+
+def write_text(command: str, result, out, err):
+    if command == "tokenize":
+        for token in result.details:
+            out.write(
+                f"{result.path}:{token['line']}:{token['column']}\t"
+                f"{token['kind']}\t{token['value'] if token['value'] is not None else ''}\n"
+            )
+    elif command == "parse":
+        out.write(f"{result.path}\n")
+        for node in result.details:
+            out.write(
+                f"{'  ' * (node['depth'] + 1)}{node['kind']} "
+                f"{node['line']}:{node['column']}\n"
+            )
+    diagnostics_stream = out if command == "check" else err
+    if result.error is not None:
+        diagnostics_stream.write(f"{result.path}: error: {result.error}\n")
+    for record in result.diagnostics:
+        diagnostics_stream.write(format_diagnostic(record) + "\n")
+
+
+def write_json(command: str, result, out):
+    """One JSON object per file and line."""
+    import json
+
+    record = {
+        "file": result.path,
+        "chars": result.chars,
+        "tokens": result.tokens,
+        "error": result.error,
+        "diagnostics": result.diagnostics,
+    }
+    if command == "tokenize":
+        record["token_list"] = result.details
+    elif command == "parse":
+        record["nodes"] = result.details
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def emit_diagnostics(result, emitter):
+    """Feed the diagnostics of a file, and its error if any, to a JsonLinesEmitter or SarifEmitter."""
+    from cjlang.diagnostics.diagnostic import Diagnostic, Level, SourceLocation
+    from cjlang.diagnostics.emitter import diagnostic_from_record
+
+    if result.error is not None:
+        location = SourceLocation(result.path, 1, 0)
+        emitter.handle_diagnostic(
+            Diagnostic(Level.ERROR, result.error, location, FILE_ERROR_CATEGORY)
+        )
+    for record in result.diagnostics:
+        emitter.handle_diagnostic(diagnostic_from_record(record))
+
+
+def write_stats(results, seconds: float, err):
+    files = len(results)
+    chars = sum(result.chars for result in results)
+    tokens = sum(result.tokens for result in results)
+    errors = sum(result.has_errors() for result in results)
+    seconds = max(seconds, 1e-9)
+    err.write(
+        f"{files} files, {chars} chars, {tokens} tokens, {errors} with errors "
+        f"in {seconds * 1000:.1f} ms "
+        f"({chars / seconds / 1e6:.2f} Mchars/s, {tokens / seconds:.0f} tokens/s)\n"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cjlang", description="Cangjie lexer and parser tools")
+    parser.add_argument("--version", action="version", version=f"cjlang {__version__}")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    for name, help_text in (
+        ("tokenize", "print the tokens of each file"),
+        ("parse", "print the syntax tree outline of each file"),
+        ("check", "report diagnostics only"),
+    ):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("inputs", nargs="+", metavar="path", help="files, directories or globs")
+        command.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="worker processes, 0 for one per CPU (default: 1)",
+        )
+        command.add_argument(
+            "--threads",
+            action="store_true",
+            help="run the jobs as threads; parallel only on free-threaded Python",
+        )
+        command.add_argument(
+            "--format",
+            choices=["text", "json", "jsonl", "sarif"],
+            default="text",
+            help="jsonl streams one diagnostic per line as files finish, sarif writes a SARIF log "
+            "at the end; both report diagnostics only",
+        )
+        command.add_argument("--stats", action="store_true", help="print throughput to stderr")
+        command.add_argument("--trace", metavar="FILE", help="write a Chrome trace of the phases")
+
+    daemon = commands.add_parser(
+        "daemon",
+        help="serve JSON-RPC requests from memory",
+        description="keep documents in memory and answer line-delimited JSON-RPC requests",
+    )
+    daemon.add_argument("roots", nargs="*", metavar="path", help="files to load at startup")
+    daemon.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of stdio")
+    daemon.add_argument("--memory", type=int, default=256, metavar="MB", help="document memory budget")
+    daemon.add_argument(
+        "--poll", type=float, default=1.0, metavar="SECONDS", help="file change polling interval"
+    )
+
+    export = commands.add_parser(
+        "export",
+        help="write token arrays as NumPy shards",
+        description="write the token kinds, offsets and identifier IDs of the inputs as NumPy shards",
+    )
+    export.add_argument("output", metavar="DIR", help="directory for the shards and manifest.json")
+    export.add_argument("inputs", nargs="+", metavar="path", help="files, directories or globs")
+    export.add_argument("-j", "--jobs", type=int, default=1, help="worker processes, 0 for one per CPU")
+    export.add_argument("--files-per-shard", type=int, default=1000, metavar="N")
+    export.add_argument("--compressed", action="store_true", help="write .npz instead of .npy shards")
+    export.add_argument("--trivia", action="store_true", help="keep whitespace and comment tokens")
+
+    lsp = commands.add_parser(
+        "lsp", help="run a language server on stdio", description="run a language server on stdio"
+    )
+    lsp.add_argument(
+        "--debounce",
+        type=float,
+        default=50,
+        metavar="MS",
+        help="delay before publishing diagnostics after a change (default: 50)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out, err = sys.stdout, sys.stderr
+
+    if args.command == "daemon":
+        from cjlang.daemon import run
+
+        run(args.roots, args.socket, args.memory, args.poll)
+        return 0
+    if args.command == "lsp":
+        from cjlang.lsp.server import run
+
+        return run(args.debounce / 1000)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        err.write("cjlang: no input files\n")
+        return 2
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    if args.command == "export":
+        from cjlang.dataset import write_shards
+
+        manifest = write_shards(
+            paths,
+            args.output,
+            files_per_shard=args.files_per_shard,
+            jobs=jobs,
+            compressed=args.compressed,
+            trivia=args.trivia,
+        )
+        shards = manifest["shards"]
+        errors = [error for shard in shards for error in shard["errors"]]
+        for error in errors:
+            err.write(f"{error['path']}: error: {error['error']}\n")
+        err.write(
+            f"{sum(shard['files'] for shard in shards)} files, "
+            f"{sum(shard['tokens'] for shard in shards)} tokens in {len(shards)} shards\n"
+        )
+        return 1 if errors else 0
+
+    # Deferred so that argument errors and --version do not load the lexer
+    from cjlang.driver import PARSE, TOKENIZE, iter_files
+    from cjlang.trace import Tracer
+
+    emitter = None
+    if args.format == "jsonl":
+        from cjlang.diagnostics.emitter import JsonLinesEmitter
+
+        emitter = JsonLinesEmitter(out)
+    elif args.format == "sarif":
+        from cjlang.diagnostics.emitter import SarifEmitter
+
+        emitter = SarifEmitter(out, tool_version=__version__)
+
+    tracer = Tracer() if args.trace else None
+    start = time.perf_counter()
+    results = []
+    for result in iter_files(
+        paths,
+        mode=TOKENIZE if args.command == "tokenize" else PARSE,
+        jobs=jobs,
+        tracer=tracer,
+        details=args.command != "check" and emitter is None,
+        threads=args.threads,
+    ):
+        results.append(result)
+        if emitter is not None:
+            emit_diagnostics(result, emitter)
+            if args.format == "jsonl":
+                emitter.flush()
+        elif args.format == "json":
+            write_json(args.command, result, out)
+        else:
+            write_text(args.command, result, out, err)
+    seconds = time.perf_counter() - start
+
+    if emitter is not None:
+        emitter.finish()
+    if args.stats:
+        write_stats(results, seconds, err)
+    if tracer is not None:
+        tracer.write(args.trace)
+    return 1 if any(result.has_errors() for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Long-running analysis daemon keeping workspace documents in memory.
+
+    cjlang daemon --socket /tmp/cjlang.sock --memory 256 src/
+    echo '{"jsonrpc": "2.0", "id": 1, "method": "check", "params": {"paths": ["src"]}}' \\
+        | nc -U /tmp/cjlang.sock
+
+Requests are JSON-RPC 2.0 objects, one per line, read from stdin (answers
+on stdout) or from Unix socket clients. Methods:
+
+    check {"paths": [...]}   diagnostics of files, directories or globs
+    tokenize {"path": ...}   significant tokens of one file
+    parse {"path": ...}      syntax tree outline of one file
+    open {"paths": [...]}    load files ahead of the first request
+    stats {}                 cache counters
+    shutdown {}              stop serving
+
+Files are parsed through a ParseCache, so each keeps its tokens and tree
+until its mtime or size changes; a polling thread re-lexes changed files,
+and the least recently used ones are evicted once the estimated memory
+exceeds the budget. The daemon has a cache of its own rather than
+default_cache(), sized by --memory.
+"""
+
+import io
+import os
+import socketserver
+import sys
+import threading
+from typing import Any, Dict, List, Optional, TextIO
+
+from cjlang.cache import CachedFile, ParseCache
+from cjlang.cli import expand_inputs
+from cjlang.driver import node_details, token_details
+from cjlang.jsonrpc import (
+    INVALID_PARAMS,
+    Dispatcher,
+    RpcError,
+    read_line_message,
+    require,
+    write_line_message,
+)
+
+
+class Daemon:
+    def __init__(self, cache: Optional[ParseCache] = None, poll_interval: float = 1.0):
+        self.cache = cache if cache is not None else ParseCache(256 * 1024 * 1024)
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self.dispatcher = Dispatcher()
+        for name in ("check", "tokenize", "parse", "open", "stats", "shutdown"):
+            self.dispatcher.register(name, getattr(self, name))
+
+    def document(self, params: Dict[str, Any]) -> CachedFile:
+        try:
+            document = self.cache.parse_file(require(params, "path", str))
+        except (OSError, UnicodeDecodeError) as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        if document.error is not None:
+            raise RpcError(INVALID_PARAMS, document.error)
+        return document
+
+    def check(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        results = []
+        for path in expand_inputs(require(params, "paths", list)):
+            path = os.path.abspath(path)
+            try:
+                document = self.cache.parse_file(path)
+                error, diagnostics = document.error, document.diagnostics
+            except (OSError, UnicodeDecodeError) as e:
+                error, diagnostics = str(e), []
+            results.append({"file": path, "error": error, "diagnostics": diagnostics})
+        return results
+
+    def tokenize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        document = self.document(params)
+        return {"file": document.path, "tokens": token_details(document.cursor, document.tokens)}
+
+    def parse(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        document = self.document(params)
+        return {
+            "file": document.path,
+            "nodes": node_details(document.cursor, document.tokens, document.tree),
+        }
+
+    def open(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        paths = expand_inputs(require(params, "paths", list))
+        for path in paths:
+            try:
+                self.cache.parse_file(path)
+            except (OSError, UnicodeDecodeError):
+                pass
+        return {"files": len(paths)}
+
+    def stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def shutdown(self, params: Dict[str, Any]) -> None:
+        self.stopped.set()
+
+    def start_polling(self) -> threading.Thread:
+        def run():
+            while not self.stopped.wait(self.poll_interval):
+                self.cache.refresh()
+
+        thread = threading.Thread(target=run, name="cjlang-poll", daemon=True)
+        thread.start()
+        return thread
+
+    def serve_stream(self, reader: TextIO, writer: TextIO):
+        """Answer line-delimited requests until end of input or shutdown."""
+        while not self.stopped.is_set():
+            text = read_line_message(reader)
+            if text is None:
+                break
+            reply = self.dispatcher.dispatch_text(text)
+            if reply is not None:
+                write_line_message(writer, reply)
+
+    def serve_unix(self, path: str):
+        """Accept any number of concurrent clients on a Unix socket until shutdown."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+                writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+                daemon.serve_stream(reader, writer)
+
+        if os.path.exists(path):
+            os.unlink(path)
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+            server.daemon_threads = True
+            watcher = threading.Thread(
+                target=lambda: (self.stopped.wait(), server.shutdown()), daemon=True
+            )
+            watcher.start()
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(path)
+
+
+def run(
+    roots: List[str],
+    socket_path: Optional[str] = None,
+    memory_mb: int = 256,
+    poll_interval: float = 1.0,
+):
+    daemon = Daemon(ParseCache(memory_mb * 1024 * 1024), poll_interval)
+    if roots:
+        daemon.open({"paths": roots})
+    daemon.start_polling()
+    if socket_path is not None:
+        daemon.serve_unix(socket_path)
+    else:
+        daemon.serve_stream(sys.stdin, sys.stdout)
@@ -0,0 +1,230 @@
+"""Token streams as NumPy arrays, for building datasets from large corpora.
+
+    arrays = token_arrays(text)        # kinds, starts, ends, symbols
+    manifest = write_shards(paths, "out/", files_per_shard=1000, jobs=8)
+    for shard in load_shards("out/"):  # memory-mapped
+        kinds = shard.tokens(0).kinds
+
+NumPy is an optional dependency (pip install cjlang[numpy]); it is imported
+when one of these functions is first called.
+
+Token kinds are numbered in TokenKind definition order, listed as KINDS and
+in every manifest. Identifiers carry the ID of their name in a symbol table
+shared by all files of a shard, and NO_SYMBOL otherwise. Offsets are code
+points into the file text. The lexer fills compact array.array buffers that
+NumPy wraps without copying, so there is a single pass over the tokens.
+
+A shard is written as one .npy file per array, which np.load can memory-map,
+or with compressed=True as a single .npz that is loaded into memory.
+"""
+
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.symbols import SymbolTable
+
+KINDS: List[TokenKind] = list(TokenKind)
+KIND_IDS: Dict[TokenKind, int] = {kind: index for index, kind in enumerate(KINDS)}
+NO_SYMBOL = -1
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Array name -> array.array typecode; NumPy dtypes follow from these
+FIELDS = {"kinds": "B", "starts": "I", "ends": "I", "symbols": "i"}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("cjlang.dataset needs NumPy: pip install cjlang[numpy]") from e
+    return numpy
+
+
+class TokenArrays:
+    """Parallel arrays describing one token each."""
+
+    __slots__ = ("kinds", "starts", "ends", "symbols")
+
+    def __init__(self, kinds, starts, ends, symbols):
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.symbols = symbols
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+def _lex_into(
+    buffers: Dict[str, array], text: str, path: Optional[str], symbols: SymbolTable, trivia: bool
+):
+    """Append the tokens of text, EOF excluded, to the array.array buffers."""
+    kinds = buffers["kinds"].append
+    starts = buffers["starts"].append
+    ends = buffers["ends"].append
+    ids = buffers["symbols"].append
+    kind_ids = KIND_IDS
+    for token in Cursor(text, path, symbols=symbols).iter_tokens(skip_trivia=not trivia):
+        if token.type is TokenKind.EOF:
+            break
+        kinds(kind_ids[token.type])
+        starts(token.start_pos)
+        ends(token.end_pos)
+        ids(NO_SYMBOL if token.symbol is None else token.symbol)
+
+
+def _wrap(np, buffer: array):
+    """NumPy view of an array.array, sharing its memory."""
+    return np.frombuffer(buffer, dtype=buffer.typecode)
+
+
+def _empty_buffers() -> Dict[str, array]:
+    return {name: array(typecode) for name, typecode in FIELDS.items()}
+
+
+def token_arrays(
+    text: str, path: Optional[str] = None, symbols: Optional[SymbolTable] = None, trivia: bool = False
+) -> TokenArrays:
+    """Tokens of text as NumPy arrays; pass symbols to number identifiers across several texts."""
+    np = _numpy()
+    buffers = _empty_buffers()
+    _lex_into(buffers, text, path, SymbolTable() if symbols is None else symbols, trivia)
+    return TokenArrays(*(_wrap(np, buffers[field]) for field in FIELDS))
+
+
+def _write_shard(directory: str, compressed: bool, trivia: bool, task) -> Dict[str, Any]:
+    """Lex one group of files and write them as a shard; runs in a worker process."""
+    np = _numpy()
+    index, paths = task
+    name = f"shard-{index:05d}"
+    symbols = SymbolTable()
+    buffers = _empty_buffers()
+    files = array("q", [0])
+    written: List[str] = []
+    errors: List[Dict[str, str]] = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            # Lex into scratch buffers so that a file the lexer gives up on leaves nothing behind
+            scratch = _empty_buffers()
+            _lex_into(scratch, text, path, symbols, trivia)
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append({"path": path, "error": str(e)})
+            continue
+        except Exception as e:
+            errors.append({"path": path, "error": str(e) or type(e).__name__})
+            continue
+        for field in FIELDS:
+            buffers[field].extend(scratch[field])
+        files.append(len(buffers["kinds"]))
+        written.append(path)
+
+    arrays = {field: _wrap(np, buffers[field]) for field in FIELDS}
+    arrays["files"] = _wrap(np, files)
+    arrays["paths"] = np.array(written, dtype=str)
+    arrays["names"] = np.array([symbols.name(i) for i in range(len(symbols))], dtype=str)
+    base = os.path.join(directory, name)
+    if compressed:
+        np.savez_compressed(base + ".npz", **arrays)
+    else:
+        for field, values in arrays.items():
+            np.save(f"{base}.{field}.npy", values)
+    return {
+        "name": name,
+        "files": len(written),
+        "tokens": len(buffers["kinds"]),
+        "compressed": compressed,
+        "errors": errors,
+    }
+
+
+def write_shards(
+    paths: Sequence[str],
+    directory: str,
+    files_per_shard: int = 1000,
+    jobs: int = 1,
+    compressed: bool = False,
+    trivia: bool = False,
+) -> Dict[str, Any]:
+    """Write the tokens of paths as shards under directory, one worker task per shard.
+
+    Returns the manifest, also written to directory/manifest.json. Files that
+    cannot be read or lexed are listed under each shard's errors.
+    """
+    _numpy()
+    if files_per_shard < 1:
+        raise ValueError("files_per_shard must be at least 1")
+    os.makedirs(directory, exist_ok=True)
+    tasks = [
+        (index, list(paths[start : start + files_per_shard]))
+        for index, start in enumerate(range(0, len(paths), files_per_shard))
+    ]
+    worker = partial(_write_shard, directory, compressed, trivia)
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            shards = list(pool.map(worker, tasks))
+    else:
+        shards = [worker(task) for task in tasks]
+    manifest = {
+        "version": FORMAT_VERSION,
+        "kinds": [kind.name for kind in KINDS],
+        "trivia": trivia,
+        "shards": shards,
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+class TokenShard:
+    """The arrays of one shard; tokens of file i are rows files[i]:files[i + 1]."""
+
+    def __init__(self, arrays: Dict[str, Any]):
+        self.arrays = arrays
+        self.files = arrays["files"]
+        self.paths: List[str] = [str(path) for path in arrays["paths"]]
+        self.names = arrays["names"]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def tokens(self, index: int) -> TokenArrays:
+        """Token arrays of the index-th file, as views into the shard."""
+        start, end = int(self.files[index]), int(self.files[index + 1])
+        return TokenArrays(*(self.arrays[field][start:end] for field in FIELDS))
+
+    def name(self, symbol: int) -> str:
+        return str(self.names[symbol])
+
+
+def load_shard(directory: str, name: str, mmap: bool = True) -> TokenShard:
+    """Read one shard; .npy shards are memory-mapped unless mmap is False."""
+    np = _numpy()
+    base = os.path.join(directory, name)
+    if os.path.exists(base + ".npz"):
+        with np.load(base + ".npz") as data:
+            return TokenShard({field: data[field] for field in data.files})
+    mode = "r" if mmap else None
+    fields = list(FIELDS) + ["files", "paths", "names"]
+    return TokenShard({field: np.load(f"{base}.{field}.npy", mmap_mode=mode) for field in fields})
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported dataset version: {manifest.get('version')}")
+    return manifest
+
+
+def load_shards(directory: str, mmap: bool = True) -> Iterator[TokenShard]:
+    for shard in read_manifest(directory)["shards"]:
+        yield load_shard(directory, shard["name"], mmap)
@@ -1,5 +1,6 @@
+from bisect import bisect_right
 from enum import Enum
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 
 class Level(Enum):
@@ -24,14 +25,46 @@ def get_line_column(input_str, char_pos) -> Tuple[int, int]:
     return line_count, column
 
 
+class LineIndex:
+    """Line start offsets of a text, built once so lookups are O(log n)."""
+
+    def __init__(self, text: str):
+        self.text: str = text
+        starts: List[int] = [0]
+        pos = text.find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+        self.line_starts: List[int] = starts
+
+    def __len__(self):
+        return len(self.line_starts)
+
+    def line_column(self, char_pos: int) -> Tuple[int, int]:
+        """Same (1-based line, 0-based column) convention as get_line_column."""
+        line = bisect_right(self.line_starts, char_pos)
+        return line, char_pos - self.line_starts[line - 1]
+
+    def line_text(self, line: int) -> str:
+        """Text of a 1-based line without its line terminator."""
+        if line < 1 or line > len(self.line_starts):
+            return ""
+        start = self.line_starts[line - 1]
+        if line < len(self.line_starts):
+            end = self.line_starts[line] - 1
+        else:
+            end = len(self.text)
+        return self.text[start:end].rstrip("\r")
+
+
 class SourceLocation:
-    def __init__(self, file_name: str, line: int, column: int):
-        self.file_name: str = file_name
+    def __init__(self, file_name: Optional[str], line: int, column: int):
+        self.file_name: Optional[str] = file_name
         self.line: str = line
         self.column: str = column
 
     @staticmethod
-    def from_tuple(file_name: str, lc: Tuple[int, int]) -> "SourceLocation":
+    def from_tuple(file_name: Optional[str], lc: Tuple[int, int]) -> "SourceLocation":
         return SourceLocation(file_name=file_name, line=lc[0], column=lc[1])
 
     def __str__(self):
@@ -46,6 +79,9 @@ class SourceLocation:
             )
         return False
 
+    def __hash__(self):
+        return hash((self.file_name, self.line, self.column))
+
     def __lt__(self, other):
         if isinstance(other, SourceLocation):
             if self.file_name == other.file_name:
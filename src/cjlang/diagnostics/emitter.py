@@ -0,0 +1,177 @@
+import json
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, TextIO
+
+from cjlang.diagnostics.diagnostic import Diagnostic, Level, LineIndex, SourceLocation
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+SARIF_LEVELS = MappingProxyType(
+    {
+        Level.NOTE: "note",
+        Level.WARNING: "warning",
+        Level.EXTENSION: "note",
+        Level.EXTWARN: "warning",
+        Level.ERROR: "error",
+    }
+)
+
+
+class SourceManager:
+    """Source texts by file name, with a lazily built LineIndex per file."""
+
+    def __init__(self):
+        self._texts: Dict[Optional[str], str] = {}
+        self._indexes: Dict[Optional[str], LineIndex] = {}
+
+    def add(self, file_name: Optional[str], text: str):
+        self._texts[file_name] = text
+        self._indexes.pop(file_name, None)
+
+    def remove(self, file_name: Optional[str]):
+        self._texts.pop(file_name, None)
+        self._indexes.pop(file_name, None)
+
+    def line_index(self, file_name: Optional[str]) -> Optional[LineIndex]:
+        index = self._indexes.get(file_name)
+        if index is None:
+            text = self._texts.get(file_name)
+            if text is None:
+                return None
+            index = LineIndex(text)
+            self._indexes[file_name] = index
+        return index
+
+    def snippet(self, file_name: Optional[str], line: int) -> Optional[str]:
+        index = self.line_index(file_name)
+        if index is None:
+            return None
+        return index.line_text(line)
+
+
+def diagnostic_record(
+    diagnostic: Diagnostic, sources: Optional[SourceManager] = None
+) -> Dict[str, Any]:
+    pos = diagnostic.position
+    record = {
+        "file": pos.file_name,
+        "line": pos.line,
+        "column": pos.column,
+        "severity": diagnostic.severity.name.lower(),
+        "category": diagnostic.category,
+        "message": diagnostic.message,
+    }
+    if sources is not None:
+        record["snippet"] = sources.snippet(pos.file_name, pos.line)
+    return record
+
+
+def diagnostic_from_record(record: Dict[str, Any]) -> Diagnostic:
+    """The diagnostic a diagnostic_record came from, e.g. one sent back by a worker process."""
+    return Diagnostic(
+        Level[record["severity"].upper()],
+        record["message"],
+        SourceLocation(record["file"], record["line"], record["column"]),
+        record["category"],
+    )
+
+
+class JsonLinesEmitter:
+    """Diagnostic consumer writing one JSON object per line as diagnostics are reported.
+
+    Records are buffered and written in batches of buffer_size; call finish() at the end.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        sources: Optional[SourceManager] = None,
+        buffer_size: int = 256,
+    ):
+        self.stream = stream
+        self.sources = sources
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+
+    def handle_diagnostic(self, diagnostic: Diagnostic):
+        self._buffer.append(
+            json.dumps(diagnostic_record(diagnostic, self.sources), ensure_ascii=False)
+        )
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._buffer.append("")
+            self.stream.write("\n".join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+
+    def finish(self):
+        self.flush()
+
+
+class SarifEmitter:
+    """Diagnostic consumer aggregating every report into a single SARIF log."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        sources: Optional[SourceManager] = None,
+        tool_name: str = "cjlang",
+        tool_version: Optional[str] = None,
+    ):
+        self.stream = stream
+        self.sources = sources
+        self.tool_name = tool_name
+        self.tool_version = tool_version
+        self._results: List[Dict[str, Any]] = []
+        self._rules: Dict[str, int] = {}
+
+    def handle_diagnostic(self, diagnostic: Diagnostic):
+        pos = diagnostic.position
+        rule_index = self._rules.setdefault(diagnostic.category, len(self._rules))
+        region: Dict[str, Any] = {
+            "startLine": pos.line,
+            "startColumn": pos.column + 1,
+        }
+        if self.sources is not None:
+            snippet = self.sources.snippet(pos.file_name, pos.line)
+            if snippet is not None:
+                region["snippet"] = {"text": snippet}
+        self._results.append(
+            {
+                "ruleId": diagnostic.category,
+                "ruleIndex": rule_index,
+                "level": SARIF_LEVELS[diagnostic.severity],
+                "message": {"text": diagnostic.message},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": pos.file_name or "<input>"},
+                            "region": region,
+                        }
+                    }
+                ],
+            }
+        )
+
+    def to_sarif(self) -> Dict[str, Any]:
+        driver: Dict[str, Any] = {
+            "name": self.tool_name,
+            "rules": [{"id": rule} for rule in self._rules],
+        }
+        if self.tool_version is not None:
+            driver["version"] = self.tool_version
+        return {
+            "version": SARIF_VERSION,
+            "$schema": SARIF_SCHEMA,
+            "runs": [{"tool": {"driver": driver}, "results": self._results}],
+        }
+
+    def finish(self):
+        if self.stream is not None:
+            json.dump(self.to_sarif(), self.stream, ensure_ascii=False)
+            self.stream.write("\n")
+            self.stream.flush()
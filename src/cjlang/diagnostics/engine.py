@@ -1,12 +1,33 @@
-from typing import List
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
 
 from cjlang.diagnostics.diagnostic import Diagnostic, Level, SourceLocation
 
 
 class DiagnosticEngine:
+    """Collects diagnostics, deduplicated, with running statistics.
 
-    def __init__(self):
+    Reports from several threads are safe, but they interleave in whatever
+    order the threads run. For reproducible output give each thread or task
+    a buffer of its own with fork() and merge() the buffers in task order.
+    """
+
+    def __init__(self, deduplicate: bool = True):
         self.diagnostics: List[Diagnostic] = []
+        self.deduplicate: bool = deduplicate
+        # Running statistics, updated on every report so queries never rescan
+        self.level_counts: Dict[Level, int] = {level: 0 for level in Level}
+        self.category_counts: Dict[str, int] = {}
+        self.suppressed: int = 0
+        self._seen: Set[Tuple[Level, str, SourceLocation, str]] = set()
+        self._groups: Dict[Tuple[Level, str, str], int] = {}
+        # Objects with a handle_diagnostic(diagnostic) method, notified as reports arrive
+        self.consumers: List = []
+        # Guards the list and the statistics; consumers are called outside it
+        self._lock = threading.Lock()
+
+    def add_consumer(self, consumer):
+        self.consumers.append(consumer)
 
     def report(
         self,
@@ -15,24 +36,45 @@ class DiagnosticEngine:
         position: SourceLocation,
         category: str,
     ):
-        self.diagnostics.append(
-            Diagnostic(
-                severity=severity, message=message, position=position, category=category
-            )
+        diagnostic = Diagnostic(
+            severity=severity, message=message, position=position, category=category
         )
-    
+        with self._lock:
+            if self.deduplicate:
+                key = (severity, message, position, category)
+                if key in self._seen:
+                    self.suppressed += 1
+                    return
+                self._seen.add(key)
+            self.diagnostics.append(diagnostic)
+            self.level_counts[severity] += 1
+            self.category_counts[category] = self.category_counts.get(category, 0) + 1
+            group = (severity, message, category)
+            self._groups[group] = self._groups.get(group, 0) + 1
+        for consumer in self.consumers:
+            consumer.handle_diagnostic(diagnostic)
+
+    def fork(self) -> "DiagnosticEngine":
+        """An empty engine with the same settings, to buffer one thread's reports."""
+        return DiagnosticEngine(self.deduplicate)
+
+    def merge(self, engines: Iterable["DiagnosticEngine"]):
+        """Report the diagnostics of engines, one engine after the other in the order given."""
+        for engine in engines:
+            for diagnostic in engine.diagnostics:
+                self.report(
+                    diagnostic.severity, diagnostic.message, diagnostic.position, diagnostic.category
+                )
+            with self._lock:
+                self.suppressed += engine.suppressed
+
     def note(
         self,
         message: str,
         position: SourceLocation,
         category: str,
     ):
-        self.diagnostics.append(
-            Diagnostic(
-                severity=Level.NOTE, message=message, position=position, category=category
-            )
-        )
-
+        self.report(Level.NOTE, message, position, category)
 
     def warning(
         self,
@@ -40,11 +82,7 @@ class DiagnosticEngine:
         position: SourceLocation,
         category: str,
     ):
-        self.diagnostics.append(
-            Diagnostic(
-                severity=Level.WARNING, message=message, position=position, category=category
-            )
-        )
+        self.report(Level.WARNING, message, position, category)
 
     def error(
         self,
@@ -52,20 +90,43 @@ class DiagnosticEngine:
         position: SourceLocation,
         category: str,
     ):
-        self.diagnostics.append(
-            Diagnostic(
-                severity=Level.ERROR, message=message, position=position, category=category
-            )
-        )
+        self.report(Level.ERROR, message, position, category)
 
     def has_errors(self) -> bool:
-        return any(
-            diagnostic.severity == Level.ERROR
-            for diagnostic in self.diagnostics
-        )
+        return self.level_counts[Level.ERROR] > 0
+
+    def count(self, severity: Level) -> int:
+        return self.level_counts[severity]
+
+    def count_category(self, category: str) -> int:
+        return self.category_counts.get(category, 0)
+
+    def summary(self) -> List[Tuple[int, Level, str, str]]:
+        """Groups identical messages, most frequent first, as (count, severity, message, category)."""
+        groups = [
+            (count, severity, message, category)
+            for (severity, message, category), count in self._groups.items()
+        ]
+        groups.sort(key=lambda group: (-group[0], -group[1].value))
+        return groups
+
+    def clear(self):
+        with self._lock:
+            self.diagnostics.clear()
+            self.level_counts = {level: 0 for level in Level}
+            self.category_counts.clear()
+            self.suppressed = 0
+            self._seen.clear()
+            self._groups.clear()
 
     def show_diagnostics(self):
         for diagnostic in self.diagnostics:
             pos = diagnostic.position
             print(f"{diagnostic.severity.name.upper()}: {diagnostic.message}")
             print(f"  ==> {pos.file_name}:{pos.line}:{pos.column}:")
+
+    def show_summary(self):
+        for count, severity, message, category in self.summary():
+            print(f"{severity.name.upper()}: {count} × {message} in {category}")
+        if self.suppressed:
+            print(f"({self.suppressed} duplicate diagnostics suppressed)")
@@ -0,0 +1,191 @@
+"""Batch processing of source files, optionally in worker processes.
+
+    tracer = Tracer()
+    results = process_files(paths, mode=PARSE, jobs=4, tracer=tracer)
+    tracer.write("trace.json")
+
+    for result in iter_files(paths, mode=PARSE, jobs=4):
+        ...                                  # in order, as soon as each is done
+
+Every file goes through the read, lex, parse (PARSE mode only) and
+diagnostics phases; with a tracer each phase becomes a span carrying the
+file name and the pid of the process that ran it. With details=True the
+result also lists the significant tokens (TOKENIZE) or the syntax tree
+nodes (PARSE) as plain dicts.
+
+With threads=True the files are spread over a thread pool instead of worker
+processes. Each file is lexed and parsed with its own cursor, diagnostics
+engine and symbol table, and the tables the lexer and parser share are
+read-only, so nothing is written by two threads. Results and spans come back
+in the order of paths whatever order the threads finish in. Lexing holds
+the GIL, so threads only run in parallel on a free-threaded build (3.13t).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from cjlang.ast.node import Node
+from cjlang.diagnostics.emitter import diagnostic_record
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.pipeline import TRIVIA_KINDS
+from cjlang.parser.parser import CangjieParser
+from cjlang.trace import Span, Tracer
+
+TOKENIZE = "tokenize"
+PARSE = "parse"
+MODES = (TOKENIZE, PARSE)
+
+
+class FileResult:
+    """Outcome of processing one file; picklable so workers can return it."""
+
+    __slots__ = ("path", "chars", "tokens", "diagnostics", "error", "spans", "details")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chars = 0
+        self.tokens = 0
+        self.diagnostics: List[Dict[str, Any]] = []
+        # Set when the file could not be read or the lexer gave up
+        self.error: Optional[str] = None
+        self.spans: List[Span] = []
+        self.details: List[Dict[str, Any]] = []
+
+    def has_errors(self) -> bool:
+        return self.error is not None or any(
+            record["severity"] == "error" for record in self.diagnostics
+        )
+
+
+def token_details(cursor: Cursor, tokens) -> List[Dict[str, Any]]:
+    details = []
+    for token in tokens:
+        if token.type in TRIVIA_KINDS:
+            continue
+        pos = token.start_pos
+        location = cursor.location(len(cursor.text) if pos is None else pos)
+        details.append(
+            {
+                "kind": token.type.name,
+                "value": token.value,
+                "line": location.line,
+                "column": location.column,
+            }
+        )
+    return details
+
+
+def node_details(cursor: Cursor, tokens, root: Node) -> List[Dict[str, Any]]:
+    details = []
+    for path, node in root:
+        index = min(node.token_start, len(tokens) - 1)
+        pos = tokens[index].start_pos
+        location = cursor.location(len(cursor.text) if pos is None else pos)
+        details.append(
+            {
+                "kind": node.kind.name,
+                "depth": len(path),
+                "line": location.line,
+                "column": location.column,
+                "token_start": node.token_start,
+                "token_end": node.token_end,
+            }
+        )
+    return details
+
+
+def process_file(
+    path: str, mode: str = PARSE, trace: bool = False, details: bool = False
+) -> FileResult:
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}, expected one of {MODES}")
+    result = FileResult(path)
+    tracer = Tracer() if trace else None
+
+    def span(name: str):
+        return tracer.span(name, file=path) if tracer is not None else nullcontext()
+
+    try:
+        with span("read"):
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        result.chars = len(text)
+
+        cursor = Cursor(text, path)
+        if mode == TOKENIZE:
+            with span("lex"):
+                tokens = cursor.tokenize()
+            result.tokens = len(tokens)
+            if details:
+                result.details = token_details(cursor, tokens)
+        else:
+            with span("lex"):
+                parser = CangjieParser(cursor)
+            result.tokens = len(parser.tokens)
+            with span("parse"):
+                root = parser.parse()
+            if details:
+                result.details = node_details(cursor, parser.tokens, root)
+
+        with span("diagnostics"):
+            result.diagnostics = [
+                diagnostic_record(diagnostic) for diagnostic in cursor.diagnostics.diagnostics
+            ]
+    except (OSError, UnicodeDecodeError) as e:
+        result.error = str(e)
+    except Exception as e:
+        # The lexer raises a bare Exception on characters it cannot handle
+        result.error = f"{type(e).__name__}: {e}"
+
+    if tracer is not None:
+        result.spans = tracer.spans
+    return result
+
+
+def iter_files(
+    paths: Sequence[str],
+    mode: str = PARSE,
+    jobs: int = 1,
+    tracer: Optional[Tracer] = None,
+    details: bool = False,
+    threads: bool = False,
+) -> Iterator[FileResult]:
+    """Results in the order of paths, each as soon as it and those before it are done.
+
+    jobs > 1 spreads files over worker processes or threads.
+    """
+    trace = tracer is not None
+    work = partial(process_file, mode=mode, trace=trace, details=details)
+    # File spans go after the batch span, which is recorded once the batch ends
+    spans: List[Span] = []
+    with tracer.span("batch", files=len(paths), jobs=jobs, threads=threads) if trace else nullcontext():
+        if jobs > 1 and len(paths) > 1 and threads:
+            executor = ThreadPoolExecutor(max_workers=jobs)
+            results = executor.map(work, paths)
+        elif jobs > 1 and len(paths) > 1:
+            chunksize = max(1, len(paths) // (jobs * 4))
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = executor.map(work, paths, chunksize=chunksize)
+        else:
+            executor = nullcontext()
+            results = map(work, paths)
+        with executor:
+            for result in results:
+                spans.extend(result.spans)
+                yield result
+    if trace:
+        tracer.extend(spans)
+
+
+def process_files(
+    paths: Sequence[str],
+    mode: str = PARSE,
+    jobs: int = 1,
+    tracer: Optional[Tracer] = None,
+    details: bool = False,
+    threads: bool = False,
+) -> List[FileResult]:
+    """Results in the order of paths; jobs > 1 spreads files over worker processes or threads."""
+    return list(iter_files(paths, mode, jobs, tracer, details, threads))
@@ -0,0 +1,128 @@
+"""Minimal JSON-RPC 2.0 dispatch and message framing.
+
+Messages are framed either one per line (the daemon) or, as in the
+Language Server Protocol, behind a Content-Length header on a binary stream.
+"""
+
+import json
+from typing import Any, BinaryIO, Callable, Dict, Optional, TextIO
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_json(self) -> Dict[str, Any]:
+        error: Dict[str, Any] = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def response(request_id: Any, result: Any) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def error_response(request_id: Any, error: RpcError) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": error.to_json()}
+
+
+class Dispatcher:
+    """Routes requests and notifications to handlers taking the params object."""
+
+    def __init__(self):
+        self.methods: Dict[str, Handler] = {}
+
+    def register(self, name: str, handler: Handler):
+        self.methods[name] = handler
+
+    def dispatch(self, message: Any) -> Optional[Dict[str, Any]]:
+        """The response to a request, or None for a notification."""
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            return error_response(request_id, RpcError(INVALID_REQUEST, "Invalid request"))
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        handler = self.methods.get(message["method"])
+        try:
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            params = message.get("params")
+            if params is None:
+                params = {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            result = handler(params)
+        except RpcError as e:
+            return None if is_notification else error_response(request_id, e)
+        except Exception as e:
+            error = RpcError(INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            return None if is_notification else error_response(request_id, error)
+        return None if is_notification else response(request_id, result)
+
+    def dispatch_text(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            message = json.loads(text)
+        except ValueError as e:
+            return error_response(None, RpcError(PARSE_ERROR, f"Parse error: {e}"))
+        return self.dispatch(message)
+
+
+def read_line_message(stream: TextIO) -> Optional[str]:
+    """Next non-blank line without its terminator, or None at end of stream."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            return line
+    return None
+
+
+def write_line_message(stream: TextIO, message: Dict[str, Any]):
+    stream.write(json.dumps(message, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def read_framed_message(stream: BinaryIO) -> Optional[bytes]:
+    """Body of the next Content-Length framed message, or None at end of stream."""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is None:
+                continue
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value.strip())
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return body
+
+
+def write_framed_message(stream: BinaryIO, message: Dict[str, Any]):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def require(params: Dict[str, Any], name: str, kind: type) -> Any:
+    """params[name], raising INVALID_PARAMS when it is missing or of the wrong type."""
+    value = params.get(name)
+    if not isinstance(value, kind):
+        raise RpcError(INVALID_PARAMS, f"missing or invalid parameter {name!r}")
+    return value
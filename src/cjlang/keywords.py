@@ -1,6 +1,7 @@
 
 
-KEYWORDS = [
+# Tuples, like every table the lexer and parser share between threads
+KEYWORDS = (
     "as",
     "break",
     "Bool",
@@ -68,9 +69,9 @@ KEYWORDS = [
     "VArray",
     "where",
     "while",
-]
+)
 
-CONTEXTUAL_KEYWORDS = [
+CONTEXTUAL_KEYWORDS = (
     "abstract",
     "open",
     "override",
@@ -81,7 +82,7 @@ CONTEXTUAL_KEYWORDS = [
     "get",
     "set",
     "sealed",
-]
+)
 
 OPERATOR_CHARACTERS = "`@.[]()+-?!-*/%<>=&|^$~,;"
 ESCAPED_IDENTIFIER = ('t', 'b', 'r', 'n', '\'', '"', '\\', 'f', 'v', '0', '$')
@@ -0,0 +1,357 @@
+"""Lexing straight from UTF-8 bytes, without decoding the whole text first.
+
+    tokens = ByteCursor(data).tokenize()            # offsets in bytes
+    tokens = ByteCursor(data, code_points=True).tokenize()
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        tokens = ByteCursor(data, path).tokenize()
+
+data is anything the re module can scan: bytes, bytearray, memoryview or an
+mmap. Whitespace, comments, ASCII identifiers and keywords, the common
+number forms, strings and operators are matched on the bytes directly. Only
+spans that need a str are decoded: identifier names and literal values, with
+the UTF-8 decoder running only on identifiers and strings that contain
+non-ASCII bytes. Comments and whitespace are never decoded, so invalid UTF-8
+there goes unnoticed.
+
+Anything else (malformed numbers, rune literals, raw identifiers,
+unexpected characters) is handed to a regular Cursor over the decoded text,
+one token at a time, so tokens, diagnostics and errors are the same as
+Cursor's. The text is decoded once, on the first such token.
+
+Token offsets are byte offsets, or code point offsets like Cursor's with
+code_points=True. Diagnostics report lines and columns in code points.
+"""
+
+import re
+import string
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.keywords import OPERATOR_CHARACTERS
+from cjlang.lexer.cursor import Cursor, Token, is_id_continue, is_id_start
+from cjlang.lexer.kinds import CONTEXTUAL_KEYWORD_KINDS, KEYWORD_KINDS, TokenKind
+from cjlang.lexer.symbols import SymbolTable
+from cjlang.utils.offsets import UTF8, OffsetMap
+
+
+def _operator_table() -> Dict[bytes, TokenKind]:
+    """Operator spellings that Cursor lexes as one token, and fallback triggers for the others.
+
+    Built by lexing each punctuation spelling of TokenKind with Cursor, so the
+    fast path cannot disagree with it. A spelling Cursor splits, such as <:,
+    is left out so that its first token matches on its own. A spelling Cursor
+    rejects maps to None and sends the token to the fallback.
+    """
+    punctuation = set(string.punctuation) - set("\"'_")
+    table: Dict[bytes, Optional[TokenKind]] = {}
+    for spelling in {kind.value for kind in TokenKind}:
+        if not all(c in punctuation for c in spelling):
+            continue
+        cursor = Cursor(spelling + " ")
+        try:
+            token = cursor.advance_token()
+        except Exception:
+            token = None
+        if token is None or cursor.diagnostics.diagnostics:
+            table[spelling.encode("ascii")] = None
+        elif token.end_pos == len(spelling):
+            table[spelling.encode("ascii")] = token.type
+    return table
+
+
+OPERATORS = _operator_table()
+
+# Bytes Cursor.is_whitespace accepts, as UTF-8
+_WHITESPACE = rb"[\t\n\x0b\x0c\r ]|\xc2\x85|\xe2\x80[\x8e\x8f\xa8\xa9]"
+_DECIMAL = rb"(?:0[0-9]*|[1-9][0-9_]*)"
+_FRAGMENT = rb"[0-9][0-9_]*"
+_STRING_BODY = rb"(?:[^%s\\]|\\[\"'\\nt])*"
+_INTEGER_SUFFIX = rb"[iu](?:8|16|32|64)"
+
+_TOKEN = re.compile(
+    b"|".join(
+        [
+            rb"(?P<nl>\r?\n)",
+            rb"(?P<ws>(?:" + _WHITESPACE + rb")+)",
+            rb"(?P<line_comment>//[^\r\n]*)",
+            rb"(?P<delimited_comment>/\*[\s\S]*?(?:\*/|\Z))",
+            rb'(?P<string>"' + _STRING_BODY % b'"' + rb'")',
+            rb'(?P<byte_string>b"' + _STRING_BODY % b'"' + rb'")',
+            rb"(?P<byte>b'" + _STRING_BODY % b"'" + rb"')",
+            rb"(?P<binary>0[bB][01_]*)(?P<binary_suffix>" + _INTEGER_SUFFIX + rb")?",
+            rb"(?P<octal>0[oO][0-7_]*)(?P<octal_suffix>" + _INTEGER_SUFFIX + rb")?",
+            rb"(?P<hexadecimal>0[xX][0-9a-fA-F][0-9a-fA-F_]*)"
+            + rb"(?P<hexadecimal_suffix>"
+            + _INTEGER_SUFFIX
+            + rb")?",
+            rb"(?P<float>(?:"
+            + _DECIMAL
+            + rb"?\."
+            + _FRAGMENT
+            + rb"(?P<fraction_exponent>[eE]-?"
+            + _FRAGMENT
+            + rb")?|"
+            + _DECIMAL
+            + rb"(?P<exponent>[eE]-?"
+            + _FRAGMENT
+            + rb")))(?P<float_suffix>f(?:16|32|64))?",
+            rb"(?P<decimal>" + _DECIMAL + rb")(?P<decimal_suffix>" + _INTEGER_SUFFIX + rb")?",
+            rb"(?P<word>[A-Za-z_\x80-\xff][A-Za-z0-9_\x80-\xff]*)",
+            # Longest spellings first, so that the alternation finds the longest match
+            rb"(?P<operator>"
+            + b"|".join(map(re.escape, sorted(OPERATORS, key=len, reverse=True)))
+            + rb")",
+        ]
+    )
+)
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+# UTF-8 continuation bytes; what is left of a span without them is one byte per code point
+_CONTINUATION = bytes(range(0x80, 0xC0))
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPED = {'"': '"', "'": "'", "\\": "\\", "n": "\n", "t": "\t"}
+
+# Bytes after which Cursor ends a number without a diagnostic, by number form
+_ENDS = frozenset(b"\t\n\x0b\x0c\r " + OPERATOR_CHARACTERS.encode("ascii"))
+_INTEGER_ENDS = _ENDS
+_DECIMAL_ENDS = (_ENDS - {ord(".")}) | {ord("f")}
+_HEXADECIMAL_ENDS = (_ENDS - {ord(".")}) | {ord("p"), ord("P")}
+_FLOAT_ENDS = _ENDS | {ord("i"), ord("u")}
+_EXPONENT_ENDS = _FLOAT_ENDS | {ord("e"), ord("E")}
+_DIGITS = frozenset(b"0123456789")
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+
+_LITERALS = {
+    "binary": TokenKind.BINARY_LITERAL,
+    "octal": TokenKind.OCTAL_LITERAL,
+    "hexadecimal": TokenKind.HEXADECIMAL_LITERAL,
+    "decimal": TokenKind.DECIMAL_LITERAL,
+    "float": TokenKind.FLOAT_LITERAL,
+}
+_STRINGS = {
+    "string": (TokenKind.LINE_STRING_LITERAL, 1),
+    "byte_string": (TokenKind.BYTE_STRING_ARRAY_LITERAL, 2),
+    "byte": (TokenKind.BYTE_LITERAL, 2),
+}
+# Identifiers Cursor reads as the start of a literal when a quote follows
+_PREFIXES = {b"r": frozenset(b"'"), b"b": frozenset(b"'\"")}
+_TRIVIA = {
+    "ws": TokenKind.WS,
+    "line_comment": TokenKind.LINE_COMMENT,
+    "delimited_comment": TokenKind.DELIMITED_COMMENT,
+}
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return _ESCAPE.sub(lambda match: _ESCAPED[match.group(1)], value)
+
+
+class ByteCursor:
+    """Tokens of UTF-8 data, with the interface of Cursor's tokenize and iter_tokens."""
+
+    def __init__(
+        self,
+        data,
+        filepath: Optional[str] = None,
+        diagnostics: Optional[DiagnosticEngine] = None,
+        symbols: Optional[SymbolTable] = None,
+        code_points: bool = False,
+    ):
+        self.data = data
+        self.filepath = filepath
+        self.pos = 0  # In bytes
+        self.diagnostics = DiagnosticEngine() if diagnostics is None else diagnostics
+        self.symbols = SymbolTable() if symbols is None else symbols
+        self.code_points = code_points
+        self._length = len(data)
+        # Offsets below the first non-ASCII byte are the same in bytes and code points
+        match = _NON_ASCII.search(data)
+        self._ascii_end = self._length if match is None else match.start()
+        # Running byte -> code point conversion past _ascii_end
+        self._counted = (self._ascii_end, self._ascii_end)
+        # Candidate identifier bytes -> (keyword kind, text, length in bytes),
+        # decoded once per spelling
+        self._words: Dict[bytes, Tuple[Optional[TokenKind], str, int]] = {}
+        # Created for the first token the byte patterns do not handle
+        self._cursor: Optional[Cursor] = None
+        self._offsets: Optional[OffsetMap] = None
+
+    def _slice(self, start: int, end: int) -> bytes:
+        chunk = self.data[start:end]
+        return chunk if isinstance(chunk, bytes) else bytes(chunk)
+
+    def code_point(self, offset: int) -> int:
+        """Code point offset of a byte offset at a character boundary."""
+        if offset <= self._ascii_end:
+            return offset
+        if self._offsets is not None:
+            return self._offsets.from_units(offset, UTF8)
+        counted, code_point = self._counted
+        if offset == counted:
+            # Tokens are converted in order, each starting where the last one ended
+            return code_point
+        if offset < counted:
+            counted = code_point = self._ascii_end
+        code_point += len(self._slice(counted, offset).translate(None, _CONTINUATION))
+        self._counted = (offset, code_point)
+        return code_point
+
+    def _token(self, kind: TokenKind, value: Optional[str], start: int, end: int) -> Token:
+        if self.code_points and end > self._ascii_end:
+            counted, start_point = self._counted
+            if start != counted:
+                start_point = self.code_point(start)
+            end_point = start_point + len(self._slice(start, end).translate(None, _CONTINUATION))
+            self._counted = (end, end_point)
+            return Token(kind, value, start_point, end_point)
+        return Token(kind, value, start, end)
+
+    def _fallback(self) -> Token:
+        """Lex the token at pos with Cursor over the decoded text."""
+        if self._cursor is None:
+            text = str(self.data, "utf-8")
+            self._offsets = OffsetMap(text)
+            self._cursor = Cursor(text, self.filepath, self.diagnostics, self.symbols)
+        cursor = self._cursor
+        offsets = self._offsets
+        cursor.pos = offsets.from_units(self.pos, UTF8)
+        cursor.current_char = cursor.text[cursor.pos] if cursor.pos < len(cursor.text) else None
+        token = cursor.advance_token()
+        self.pos = offsets.to_units(token.end_pos, UTF8)
+        if not self.code_points:
+            token.start_pos = offsets.to_units(token.start_pos, UTF8)
+            token.end_pos = self.pos
+        return token
+
+    def _word(self, span: bytes, start: int) -> Optional[Token]:
+        """The identifier or keyword starting with the candidate bytes, None to fall back."""
+        end = start + len(span)
+        word = self._words.get(span)
+        if word is None:
+            if end > self._ascii_end and not span.isascii():
+                text = span.decode("utf-8")
+                first = text[0]
+                if not (first == "_" or (first.isalpha() and is_id_start(first))):
+                    # Cursor reads a number or stops at an unexpected character
+                    return None
+                length = 1
+                while length < len(text) and is_id_continue(text[length]):
+                    length += 1
+                if length < len(text):
+                    # The identifier stops at a character it cannot contain
+                    text = text[:length]
+                    end = start + len(text.encode("utf-8"))
+                    span = self._slice(start, end)
+            else:
+                text = span.decode("ascii")
+            word = (KEYWORD_KINDS.get(text), text, end - start)
+            self._words[span] = word
+        kind, text, length = word
+        end = start + length
+        self.pos = end
+        if kind is not None:
+            return self._token(kind, text, start, end)
+        symbol = self.symbols.intern(text)
+        token = self._token(TokenKind.IDENT, self.symbols.name(symbol), start, end)
+        token.symbol = symbol
+        token.contextual = CONTEXTUAL_KEYWORD_KINDS.get(text)
+        return token
+
+    def _number_ends(self, match) -> bool:
+        """Whether Cursor would end this number where the pattern did, without a diagnostic."""
+        end = match.end()
+        if end >= self._length:
+            # Some of Cursor's checks fail on a number at the very end; leave those to it
+            return False
+        group = match.lastgroup
+        if group.endswith("suffix"):
+            return True
+        following = self.data[end]
+        if group == "float":
+            if match.group("fraction_exponent") or match.group("exponent"):
+                return following in _EXPONENT_ENDS
+            return following in _FLOAT_ENDS
+        if group in ("binary", "octal"):
+            return following in _INTEGER_ENDS
+        if following == ord("."):
+            # Cursor reads a fraction when a digit follows the dot
+            if end + 1 >= self._length:
+                return False
+            after = self.data[end + 1]
+            digits = _HEX_DIGITS if group == "hexadecimal" else _DIGITS
+            return after < 0x80 and after not in digits
+        return following in (_HEXADECIMAL_ENDS if group == "hexadecimal" else _DECIMAL_ENDS)
+
+    def advance_token(self, skip_trivia: bool = False) -> Token:
+        data = self.data
+        while True:
+            pos = self.pos
+            if pos >= self._length:
+                return Token(TokenKind.EOF)
+            match = _TOKEN.match(data, pos)
+            if match is None:
+                return self._fallback()
+            group = match.lastgroup
+            end = match.end()
+            if group == "nl":
+                self.pos = end
+                return self._token(TokenKind.NL, None, pos, end)
+            if group in _TRIVIA:
+                self.pos = end
+                if skip_trivia:
+                    continue
+                return self._token(_TRIVIA[group], None, pos, end)
+            if group == "word":
+                span = match.group()
+                if span in _PREFIXES and end < self._length and data[end] in _PREFIXES[span]:
+                    # A rune literal, or a byte literal the string patterns rejected
+                    return self._fallback()
+                token = self._word(span, pos)
+                if token is None:
+                    return self._fallback()
+                return token
+            if group == "operator":
+                kind = OPERATORS[match.group()]
+                if kind is None:
+                    return self._fallback()
+                if kind is TokenKind.DOT and (end >= self._length or data[end] >= 0x80):
+                    # Cursor checks whether a dot starts a number, possibly with a non-ASCII digit
+                    return self._fallback()
+                self.pos = end
+                return self._token(kind, None, pos, end)
+            if group in _STRINGS:
+                kind, prefix = _STRINGS[group]
+                body = self._slice(pos + prefix, end - 1)
+                self.pos = end
+                return self._token(kind, _unescape(body.decode("utf-8")), pos, end)
+            # A number, or the number group's suffix
+            if not self._number_ends(match):
+                return self._fallback()
+            literal = group[: -len("_suffix")] if group.endswith("_suffix") else group
+            self.pos = end
+            return self._token(_LITERALS[literal], self._slice(pos, end).decode("ascii"), pos, end)
+
+    def tokenize(self) -> List[Token]:
+        tokens = []
+        while True:
+            token = self.advance_token()
+            tokens.append(token)
+            if token.type == TokenKind.EOF:
+                break
+        return tokens
+
+    def iter_tokens(self, skip_trivia: bool = False) -> Iterator[Token]:
+        """Lazily yield tokens up to and including EOF, optionally never creating trivia."""
+        while True:
+            token = self.advance_token(skip_trivia)
+            yield token
+            if token.type == TokenKind.EOF:
+                break
+
+
+def tokenize_bytes(
+    data, filepath: Optional[str] = None, code_points: bool = False
+) -> List[Token]:
+    return ByteCursor(data, filepath, code_points=code_points).tokenize()
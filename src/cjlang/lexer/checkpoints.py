@@ -0,0 +1,134 @@
+"""Lexer checkpoints for resuming tokenization part way through a text.
+
+    cursor = Cursor(text)
+    tokens = cursor.tokenize()
+    checkpoints = Checkpoints.from_tokens(tokens, every=256)
+
+    # Tokens from around offset onwards, without lexing what comes before
+    index = checkpoints.resume(cursor, offset)
+
+    # After replacing old[start:old_end] with new[start:new_end]
+    tokens, checkpoints = relex(Cursor(new, symbols=cursor.symbols), tokens,
+                                checkpoints, start, old_end, new_end)
+
+Cursor lexes every comment and string literal as a single token and has no
+other mode, so between two tokens its whole state is the offset: lexing
+from the start of any token gives the same tokens as reaching it from the
+start of the text. A checkpoint is therefore the offset and index of a
+token, kept for every `every`-th token in two arrays of 64-bit integers.
+
+relex re-lexes an edited text from the last checkpoint safely before the
+edit and stops as soon as it reaches a token boundary after the edit that
+was also a boundary before it; the tokens from there on are the old ones,
+shifted in place by the change in length. Only the re-lexed range reports
+diagnostics.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.kinds import TokenKind
+
+DEFAULT_EVERY = 256
+
+# Cursor decides where a token ends by looking at most this many characters past it
+LOOKAHEAD = 2
+
+
+class Checkpoints:
+    """Offsets and token indices of every `every`-th token of a lexed text."""
+
+    __slots__ = ("every", "offsets", "indices")
+
+    def __init__(self, every: int = DEFAULT_EVERY):
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}")
+        self.every = every
+        self.offsets = array("q")
+        self.indices = array("q")
+
+    @classmethod
+    def from_tokens(cls, tokens: List[Token], every: int = DEFAULT_EVERY) -> "Checkpoints":
+        """Checkpoints of tokens lexed from offset 0, as Cursor.tokenize() returns them."""
+        checkpoints = cls(every)
+        checkpoints.extend(tokens, 0, len(tokens))
+        return checkpoints
+
+    def extend(self, tokens: List[Token], first: int, last: int, base: int = 0):
+        """Adds every `every`-th token of tokens[first:last] as index base + position in tokens."""
+        for index in range(first, last, self.every):
+            token = tokens[index]
+            if token.type is TokenKind.EOF:
+                break
+            self.offsets.append(token.start_pos)
+            self.indices.append(base + index)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def before(self, offset: int) -> Tuple[int, int]:
+        """(offset, token index) of the last checkpoint at or before offset, (0, 0) if none."""
+        position = bisect_right(self.offsets, offset) - 1
+        if position < 0:
+            return 0, 0
+        return self.offsets[position], self.indices[position]
+
+    def resume(self, cursor: Cursor, offset: int) -> int:
+        """Moves cursor to the last checkpoint at or before offset; the index of its next token."""
+        start, index = self.before(offset)
+        cursor.seek(start)
+        return index
+
+
+def relex(
+    cursor: Cursor,
+    tokens: List[Token],
+    checkpoints: Checkpoints,
+    start: int,
+    old_end: int,
+    new_end: int,
+) -> Tuple[List[Token], Checkpoints]:
+    """Tokens and checkpoints of cursor's text, where [start, new_end) replaced [start, old_end).
+
+    tokens and checkpoints are those of the text before the edit. Tokens
+    after the re-lexed range are reused with their offsets updated in place.
+    """
+    resume_offset, index = checkpoints.before(max(0, start - LOOKAHEAD))
+    cursor.seek(resume_offset)
+    delta = new_end - old_end
+    # Old tokens before EOF, whose start offsets are the old boundaries
+    boundaries = len(tokens) - 1
+    old = index
+    relexed: List[Token] = []
+    while True:
+        pos = cursor.pos
+        if pos >= new_end:
+            while old < boundaries and tokens[old].start_pos < pos - delta:
+                old += 1
+            if old < boundaries and tokens[old].start_pos == pos - delta:
+                break
+        token = cursor.advance_token()
+        relexed.append(token)
+        if token.type is TokenKind.EOF:
+            old = len(tokens)
+            break
+
+    tail = tokens[old:]
+    if delta:
+        for token in tail:
+            if token.start_pos is not None:
+                token.start_pos += delta
+                token.end_pos += delta
+
+    updated = Checkpoints(checkpoints.every)
+    kept = bisect_right(checkpoints.indices, index)
+    updated.offsets = checkpoints.offsets[:kept]
+    updated.indices = checkpoints.indices[:kept]
+    updated.extend(relexed, checkpoints.every, len(relexed), index)
+    shift = index + len(relexed) - old
+    for position in range(bisect_left(checkpoints.indices, old), len(checkpoints)):
+        updated.offsets.append(checkpoints.offsets[position] + delta)
+        updated.indices.append(checkpoints.indices[position] + shift)
+    return tokens[:index] + relexed + tail, updated
@@ -0,0 +1,54 @@
+# Augmenting declarations for the compiled build of cursor.py.
+# cursor.py stays importable as plain Python when it is not cythonized.
+
+cimport cython
+
+cpdef bint is_whitespace(Py_UCS4 c)
+cpdef bint is_id_start(Py_UCS4 c)
+cpdef bint is_id_continue(Py_UCS4 c)
+
+
+cdef class Token:
+    cdef public object type
+    cdef public object value
+    cdef public object start_pos
+    cdef public object end_pos
+    cdef public object symbol
+    cdef public object contextual
+    cdef public object leading_trivia
+
+
+cdef class Cursor:
+    cdef public str text
+    cdef public object filepath
+    cdef public Py_ssize_t pos
+    cdef public object current_char
+    cdef public object diagnostics
+    cdef public object symbols
+    cdef public object line_index
+    cdef public bint is_ascii
+
+    cpdef advance(self)
+    cpdef seek(self, Py_ssize_t pos)
+    @cython.locals(text=str, classes=bytes, end=Py_ssize_t)
+    cpdef Py_ssize_t ascii_scan(self, Py_ssize_t pos, int mask)
+    cpdef object peek(self)
+    cpdef object first_n(self, Py_ssize_t n)
+    cpdef bint is_eof(self)
+
+    cpdef list tokenize(self)
+    @cython.locals(char_class=int)
+    cpdef Token advance_token(self)
+    cpdef Token create_token(self, token_type, value=*, start_pos=*, end_pos=*)
+
+    @cython.locals(start_pos=Py_ssize_t)
+    cpdef Token whitespace(self)
+    cpdef Token line_comment(self)
+    cpdef Token delimited_comment(self)
+    @cython.locals(pos=Py_ssize_t)
+    cpdef Token identifier(self, is_raw=*)
+
+    cpdef eat_whitespace(self)
+    cpdef eat_line_comment(self)
+    cpdef eat_delimited_comment(self)
+    cpdef skip_trivia(self)
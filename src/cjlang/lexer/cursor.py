@@ -1,10 +1,11 @@
 import string
-from typing import List, Literal, Optional
+from typing import Iterator, List, Literal, Optional
 
-from cjlang.diagnostics.diagnostic import SourceLocation, get_line_column
+from cjlang.diagnostics.diagnostic import LineIndex, SourceLocation
 from cjlang.diagnostics.engine import DiagnosticEngine
 from cjlang.keywords import ESCAPED_IDENTIFIER, OPERATOR_CHARACTERS
-from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.kinds import CONTEXTUAL_KEYWORD_KINDS, KEYWORD_KINDS, TokenKind
+from cjlang.lexer.symbols import SymbolTable
 from cjlang.utils.unicode_xid import is_xid_continue, is_xid_start
 
 LEXICAL_CATEGORY = "Lexical Issue"
@@ -43,6 +44,19 @@ def is_id_continue(c):
     return is_xid_continue(c)
 
 
+# Character classes of the 128 ASCII code points as bit flags, looked up in
+# place of the predicates above while lexing a text that is all ASCII
+ASCII_WHITESPACE = 1
+ASCII_ID_START = 2
+ASCII_ID_CONTINUE = 4
+ASCII_CLASSES = bytes(
+    (ASCII_WHITESPACE if is_whitespace(c) else 0)
+    | (ASCII_ID_START if is_id_start(c) else 0)
+    | (ASCII_ID_CONTINUE if is_id_continue(c) else 0)
+    for c in map(chr, range(128))
+)
+
+
 def is_hex_char(char: str) -> bool:
     char = char.upper()
     return char.isdigit() or ("A" <= char <= "F")
@@ -52,7 +66,22 @@ def is_oct_char(char: str) -> bool:
     return "0" <= char <= "7"
 
 
+def is_integer_literal_end(char: str) -> bool:
+    # A separator, an operator or the start of an integer type suffix
+    return is_whitespace(char) or char in OPERATOR_CHARACTERS or char in ("i", "u")
+
+
 class Token:
+    __slots__ = (
+        "type",
+        "value",
+        "start_pos",
+        "end_pos",
+        "symbol",
+        "contextual",
+        "leading_trivia",
+    )
+
     def __init__(
         self,
         type: TokenKind,
@@ -64,6 +93,12 @@ class Token:
         self.value: Optional[str] = value
         self.start_pos: Optional[int] = start_pos  # Start position of the token
         self.end_pos: Optional[int] = end_pos  # End position of the token
+        # SymbolTable ID of an identifier's name
+        self.symbol: Optional[int] = None
+        # Keyword kind of an IDENT that is a contextual keyword, such as TokenKind.OPEN
+        self.contextual: Optional[TokenKind] = None
+        # Whitespace and comments preceding the token, when a pipeline attaches them
+        self.leading_trivia: Optional[List["Token"]] = None
 
     def __eq__(self, other):
         if not isinstance(other, Token):
@@ -89,6 +124,7 @@ class Cursor:
         text: str,
         filepath: Optional[str] = None,
         diagnostics: Optional[DiagnosticEngine] = None,
+        symbols: Optional[SymbolTable] = None,
     ):
         self.text: str = text
         self.filepath: Optional[str] = filepath
@@ -98,6 +134,14 @@ class Cursor:
             self.diagnostics = DiagnosticEngine()
         else:
             self.diagnostics = diagnostics
+        if symbols is None:
+            self.symbols = SymbolTable()
+        else:
+            self.symbols = symbols
+        # Built on the first reported location and shared with clones
+        self.line_index: Optional[LineIndex] = None
+        # Whitespace and identifiers are scanned with ASCII_CLASSES when set
+        self.is_ascii: bool = text.isascii()
 
     def advance(self) -> None:
         self.pos += 1
@@ -127,9 +171,7 @@ class Cursor:
                     msg = "Expected '{c}', found {s}".replace("{c}", c).replace("{s}", current_c)
                 self.diagnostics.error(
                     msg,
-                    SourceLocation.from_tuple(
-                        self.filepath, get_line_column(self.text, self.pos)
-                    ),
+                    self.location(self.pos),
                     LEXICAL_CATEGORY,
                 )
         else:
@@ -137,6 +179,22 @@ class Cursor:
                 has_error |= self.match(ch)
         return has_error
 
+    def seek(self, pos) -> None:
+        self.pos = pos
+        if pos < len(self.text):
+            self.current_char = self.text[pos]
+        else:
+            self.current_char = None
+
+    def ascii_scan(self, pos, mask):
+        """The first position from pos whose ASCII class has none of the mask bits."""
+        text = self.text
+        classes = ASCII_CLASSES
+        end = len(text)
+        while pos < end and classes[ord(text[pos])] & mask:
+            pos += 1
+        return pos
+
     def eat_while(self, condition) -> None:
         while self.current_char is not None and condition(self.current_char):
             self.advance()
@@ -144,12 +202,26 @@ class Cursor:
     def is_eof(self) -> bool:
         return self.pos >= len(self.text)
 
-    def clone(self) -> "Cursor":
-        new_cursor = Cursor(self.text, self.filepath, self.diagnostics)
+    def clone(self, diagnostics: Optional[DiagnosticEngine] = None) -> "Cursor":
+        """A cursor at the same position, sharing the symbol table and line index.
+
+        Diagnostics go to this cursor's engine unless another is given. A
+        clone that lexes on another thread can report into a buffer of its
+        own, diagnostics.fork(), merged back once the thread is done.
+        """
+        if diagnostics is None:
+            diagnostics = self.diagnostics
+        new_cursor = Cursor(self.text, self.filepath, diagnostics, self.symbols)
         new_cursor.pos = self.pos
         new_cursor.current_char = self.current_char
+        new_cursor.line_index = self.line_index
         return new_cursor
 
+    def location(self, pos: int) -> SourceLocation:
+        if self.line_index is None:
+            self.line_index = LineIndex(self.text)
+        return SourceLocation.from_tuple(self.filepath, self.line_index.line_column(pos))
+
     def tokenize(self) -> List[Token]:
         tokens = []
         while True:
@@ -159,6 +231,16 @@ class Cursor:
                 break
         return tokens
 
+    def iter_tokens(self, skip_trivia: bool = False) -> Iterator[Token]:
+        """Lazily yield tokens up to and including EOF, optionally never creating trivia."""
+        while True:
+            if skip_trivia:
+                self.skip_trivia()
+            token = self.advance_token()
+            yield token
+            if token.type == TokenKind.EOF:
+                break
+
     def advance_token(self) -> Token:
         # EOF
         if self.current_char is None:
@@ -184,6 +266,17 @@ class Cursor:
                 end_pos=self.pos,
             )
 
+        if self.is_ascii:
+            char_class = ASCII_CLASSES[ord(self.current_char)]
+            if char_class & ASCII_WHITESPACE:
+                return self.whitespace()
+            # Except the prefixes of rune, byte and byte string literals
+            if char_class & ASCII_ID_START and not (
+                (self.current_char == "r" and self.peek() == "'")
+                or (self.current_char == "b" and self.peek() in ("'", '"'))
+            ):
+                return self.identifier()
+
         # White Space
         if is_whitespace(self.current_char):
             return self.whitespace()
@@ -254,7 +347,7 @@ class Cursor:
         if self.current_char == ";":
             self.advance()
             return self.create_token(
-                TokenKind.COLON,
+                TokenKind.SEMI,
                 value=None,
                 start_pos=self.pos - 1,
                 end_pos=self.pos,
@@ -761,7 +854,7 @@ class Cursor:
             return self.text[self.pos + 1]
         return None
 
-    def first_n(self, n: int):
+    def first_n(self, n):
         """Peek at the top-n character without advancing the position."""
         if self.pos + n < len(self.text):
             return self.text[self.pos + n]
@@ -777,12 +870,27 @@ class Cursor:
 
     def whitespace(self) -> Token:
         start_pos = self.pos
-        while self.current_char is not None and is_whitespace(self.current_char):
-            self.advance()
+        self.eat_whitespace()
         return self.create_token(TokenKind.WS, None, start_pos, self.pos)
 
     def line_comment(self) -> Token:
         start_pos = self.pos
+        self.eat_line_comment()
+        return self.create_token(TokenKind.LINE_COMMENT, None, start_pos, self.pos)
+
+    def delimited_comment(self) -> Token:
+        start_pos = self.pos
+        self.eat_delimited_comment()
+        return self.create_token(TokenKind.DELIMITED_COMMENT, None, start_pos, self.pos)
+
+    def eat_whitespace(self) -> None:
+        if self.is_ascii:
+            self.seek(self.ascii_scan(self.pos, ASCII_WHITESPACE))
+            return
+        while self.current_char is not None and is_whitespace(self.current_char):
+            self.advance()
+
+    def eat_line_comment(self) -> None:
         self.advance()
         self.advance()
 
@@ -790,10 +898,8 @@ class Cursor:
             if self.current_char in ["\n", "\r"]:
                 break
             self.advance()
-        return self.create_token(TokenKind.LINE_COMMENT, None, start_pos, self.pos)
 
-    def delimited_comment(self) -> Token:
-        start_pos = self.pos
+    def eat_delimited_comment(self) -> None:
         self.advance()
         self.advance()
         while self.current_char is not None:
@@ -802,7 +908,25 @@ class Cursor:
                 self.advance()
                 break
             self.advance()
-        return self.create_token(TokenKind.DELIMITED_COMMENT, None, start_pos, self.pos)
+
+    def skip_trivia(self) -> None:
+        """Move past whitespace and comments without creating tokens for them.
+
+        Consumes exactly the spans advance_token would return as WS and comment tokens.
+        """
+        while self.current_char is not None:
+            if self.current_char == "\n" or (
+                self.current_char == "\r" and self.peek() == "\n"
+            ):
+                break
+            if is_whitespace(self.current_char):
+                self.eat_whitespace()
+            elif self.current_char == "/" and self.peek() == "/":
+                self.eat_line_comment()
+            elif self.current_char == "/" and self.peek() == "*":
+                self.eat_delimited_comment()
+            else:
+                break
 
     def consume_decimal_fragment(self):
         if self.current_char.isdigit():
@@ -824,9 +948,7 @@ class Cursor:
             else:
                 self.diagnostics.error(
                     f"illegal digit in decimal literal '{self.text[self.pos:self.pos + 1]}'",
-                    SourceLocation.from_tuple(
-                        self.filepath, get_line_column(self.text, self.pos)
-                    ),
+                    self.location(self.pos),
                     LEXICAL_CATEGORY,
                 )
                 self.eat_while(lambda x: x.isdigit() or x.isalpha() or x == "_")
@@ -885,9 +1007,7 @@ class Cursor:
             else:
                 self.diagnostics.error(
                     f"illegal digit in hexadecimal literal '{self.text[self.pos:self.pos + 1]}'",
-                    SourceLocation.from_tuple(
-                        self.filepath, get_line_column(self.text, self.pos)
-                    ),
+                    self.location(self.pos),
                     LEXICAL_CATEGORY,
                 )
                 self.eat_while(lambda x: x.isdigit() or x.isalpha() or x == "_")
@@ -913,9 +1033,7 @@ class Cursor:
             else:
                 self.diagnostics.error(
                     f"illegal digit in decimal literal '{self.text[self.pos:self.pos + 1]}'",
-                    SourceLocation.from_tuple(
-                        self.filepath, get_line_column(self.text, self.pos)
-                    ),
+                    self.location(self.pos),
                     LEXICAL_CATEGORY,
                 )
                 self.eat_while(lambda x: x.isdigit() or x == "_")
@@ -931,12 +1049,12 @@ class Cursor:
             while self.current_char is not None:
                 if self.current_char in ("0", "1", "_"):
                     self.advance()
+                elif is_integer_literal_end(self.current_char):
+                    break
                 else:
                     self.diagnostics.error(
                         f"illegal digit in binary literal '{self.text[self.pos:self.pos + 1]}'",
-                        SourceLocation.from_tuple(
-                            self.filepath, get_line_column(self.text, self.pos)
-                        ),
+                        self.location(self.pos),
                         LEXICAL_CATEGORY,
                     )
                     self.eat_while(lambda x: x.isdigit() or x == "_")
@@ -945,14 +1063,14 @@ class Cursor:
             if is_oct_char(self.current_char):
                 self.advance()
             while self.current_char is not None:
-                if is_oct_char(self.current_char):
+                if is_oct_char(self.current_char) or self.current_char == "_":
                     self.advance()
+                elif is_integer_literal_end(self.current_char):
+                    break
                 else:
                     self.diagnostics.error(
                         f"illegal digit in octal literal '{self.text[self.pos:self.pos + 1]}'",
-                        SourceLocation.from_tuple(
-                            self.filepath, get_line_column(self.text, self.pos)
-                        ),
+                        self.location(self.pos),
                         LEXICAL_CATEGORY,
                     )
                     self.eat_while(lambda x: x.isdigit() or x == "_")
@@ -961,14 +1079,14 @@ class Cursor:
             if is_hex_char(self.current_char):
                 self.advance()
             while self.current_char is not None:
-                if is_hex_char(self.current_char):
+                if is_hex_char(self.current_char) or self.current_char == "_":
                     self.advance()
+                elif is_integer_literal_end(self.current_char):
+                    break
                 else:
                     self.diagnostics.error(
                         f"illegal digit in hexadecimal literal '{self.text[self.pos:self.pos + 1]}'",
-                        SourceLocation.from_tuple(
-                            self.filepath, get_line_column(self.text, self.pos)
-                        ),
+                        self.location(self.pos),
                         LEXICAL_CATEGORY,
                     )
                     self.eat_while(lambda x: x.isdigit() or x == "_")
@@ -976,7 +1094,7 @@ class Cursor:
         else:
             raise Exception("Invalid integer literal type.")
 
-    def consume_decimal_number(self) -> str:
+    def consume_decimal_number(self) -> TokenKind:
         if self.current_char == ".":
             self.consume_decimal_fraction()
             if self.current_char in ("e", "E"):
@@ -995,7 +1113,7 @@ class Cursor:
             raise Exception("Invalid literal.")
         return TokenKind.FLOAT_LITERAL
 
-    def consume_hexadecimal_number(self) -> str:
+    def consume_hexadecimal_number(self) -> TokenKind:
         if self.current_char == ".":
             self.consume_hexadecimal_fraction()
         elif is_hex_char(self.current_char):
@@ -1064,9 +1182,7 @@ class Cursor:
                     self.eat_while(lambda x: x.isdigit())
                     self.diagnostics.error(
                         f"illegal integer literal suffix '{self.text[suffix_pos:self.pos]}'",
-                        SourceLocation.from_tuple(
-                            self.filepath, get_line_column(self.text, self.pos)
-                        ),
+                        self.location(self.pos),
                         LEXICAL_CATEGORY,
                     )
 
@@ -1088,9 +1204,7 @@ class Cursor:
                     self.eat_while(lambda x: x.isdigit())
                     self.diagnostics.error(
                         f"illegal float literal suffix '{self.text[suffix_pos:self.pos]}'",
-                        SourceLocation.from_tuple(
-                            self.filepath, get_line_column(self.text, self.pos)
-                        ),
+                        self.location(self.pos),
                         LEXICAL_CATEGORY,
                     )
 
@@ -1099,43 +1213,59 @@ class Cursor:
         )
 
     def identifier(self, is_raw=False) -> Token:
-        """Return an identifier (which may also include numbers after the first character)."""
+        """Return an identifier (which may also include numbers after the first character).
+
+        Reserved words come back with their keyword kind; contextual keywords stay
+        IDENT and carry their keyword kind in Token.contextual.
+        """
         start_pos = self.pos
-        id_str = ""
 
         if is_raw:
             if self.current_char == "`":
-                id_str += self.current_char
                 self.advance()
             else:
                 raise Exception("expect '`' in the raw identifier")
 
-        if self.current_char is not None and is_id_start(self.current_char):
-            id_str += self.current_char
-            self.advance()
+        if self.is_ascii:
+            pos = self.pos
+            if pos < len(self.text) and ASCII_CLASSES[ord(self.text[pos])] & ASCII_ID_START:
+                pos += 1
+            self.seek(self.ascii_scan(pos, ASCII_ID_CONTINUE))
+        else:
+            if self.current_char is not None and is_id_start(self.current_char):
+                self.advance()
 
-        while self.current_char is not None and is_id_continue(self.current_char):
-            id_str += self.current_char
-            self.advance()
+            while self.current_char is not None and is_id_continue(self.current_char):
+                self.advance()
 
         if is_raw:
             if self.current_char == "`":
-                id_str += self.current_char
                 self.advance()
             else:
                 self.diagnostics.error(
                     f"expected character '`', but character '{self.text[self.pos:self.pos + 1]}' found",
-                    SourceLocation.from_tuple(
-                        self.filepath, get_line_column(self.text, self.pos)
-                    ),
+                    self.location(self.pos),
                     LEXICAL_CATEGORY,
                 )
+            token = self.create_token(
+                TokenKind.RAW_IDENT, self.text[start_pos : self.pos], start_pos, self.pos
+            )
+            # `name` and name denote the same identifier
+            token.symbol = self.symbols.intern(token.value.strip("`"))
+            return token
 
-        if is_raw:
-            token_name = TokenKind.RAW_IDENT
-        else:
-            token_name = TokenKind.IDENT
-        return self.create_token(token_name, id_str, start_pos, self.pos)
+        id_str = self.text[start_pos : self.pos]
+        token_name = KEYWORD_KINDS.get(id_str)
+        if token_name is not None:
+            return self.create_token(token_name, id_str, start_pos, self.pos)
+
+        symbol = self.symbols.intern(id_str)
+        token = self.create_token(
+            TokenKind.IDENT, self.symbols.name(symbol), start_pos, self.pos
+        )
+        token.symbol = symbol
+        token.contextual = CONTEXTUAL_KEYWORD_KINDS.get(id_str)
+        return token
 
     def rune_literal(self) -> Token:
         start_pos = self.pos
@@ -1157,7 +1287,17 @@ class Cursor:
         else:
             # SingleChar: any character except \, ', ", and newlines
             if self.current_char in ("'", '"', "\\", "\r", "\n"):
-                return
+                # Report instead of returning None, which crashes the compiled lexer
+                self.diagnostics.error(
+                    "RuneLiteral must contain one character.",
+                    self.location(self.pos),
+                    LEXICAL_CATEGORY,
+                )
+                if self.current_char == quote_type:
+                    self.advance()
+                return self.create_token(
+                    TokenKind.RUNE_LITERAL, value="", start_pos=start_pos, end_pos=self.pos
+                )
             else:
                 self.advance()  # Consume the valid single character
 
@@ -1203,9 +1343,7 @@ class Cursor:
         if len(hex_digits) == 0:
             self.diagnostics.error(
                 "Expected at least one hexadecimal digit in Unicode escape sequence",
-                SourceLocation.from_tuple(
-                    self.filepath, get_line_column(self.text, self.pos)
-                ),
+                self.location(self.pos),
                 LEXICAL_CATEGORY,
             )
 
@@ -1238,7 +1376,7 @@ class Cursor:
     def string(self, quote_char, single_char=False, byte_string=False) -> Token:
         """Consume a string literal, handling escape sequences and matching quotes."""
         start_pos = self.pos
-        string_value = ""
+        parts = []
         if single_char:
             if byte_string:
                 self.advance()  # Move past 'b'
@@ -1258,21 +1396,19 @@ class Cursor:
             if self.current_char == "\\":  # Handle escape sequences
                 self.advance()
                 if self.current_char in {'"', "'", "\\"}:
-                    string_value += self.current_char
+                    parts.append(self.current_char)
                 elif self.current_char == "n":
-                    string_value += "\n"
+                    parts.append("\n")
                 elif self.current_char == "t":
-                    string_value += "\t"
+                    parts.append("\t")
                 else:
                     raise Exception(f"Invalid escape sequence: \\{self.current_char}")
             else:
-                string_value += self.current_char
+                parts.append(self.current_char)
             self.advance()
 
         if self.current_char != quote_char:
-            raise Exception(
-                f"Unterminated string literal starting at position {start_pos}"
-            )
+            raise Exception("Unterminated string literal")
 
         self.advance()  # Skip the closing quote
-        return self.create_token(token_type, string_value, start_pos, self.pos)
+        return self.create_token(token_type, "".join(parts), start_pos, self.pos)
@@ -1,5 +1,9 @@
 
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
+
+from cjlang.keywords import CONTEXTUAL_KEYWORDS, KEYWORDS
 
 class TokenKind(Enum):
     EOF = "EOF"
@@ -27,6 +31,87 @@ class TokenKind(Enum):
 
     BYTE_STRING = "BYTE_STRING"
 
+    # Keywords, valued by their spelling
+    AS = "as"
+    BREAK = "break"
+    BOOL = "Bool"
+    CASE = "case"
+    CATCH = "catch"
+    CLASS = "class"
+    CONST = "const"
+    CONTINUE = "continue"
+    RUNE = "Rune"
+    DO = "do"
+    ELSE = "else"
+    ENUM = "enum"
+    EXTEND = "extend"
+    FOR = "for"
+    FROM = "from"
+    FUNC = "func"
+    FALSE = "false"
+    FINALLY = "finally"
+    FOREIGN = "foreign"
+    FLOAT16 = "Float16"
+    FLOAT32 = "Float32"
+    FLOAT64 = "Float64"
+    IF = "if"
+    IN = "in"
+    IS = "is"
+    INIT = "init"
+    INOUT = "inout"
+    IMPORT = "import"
+    INTERFACE = "interface"
+    INT8 = "Int8"
+    INT16 = "Int16"
+    INT32 = "Int32"
+    INT64 = "Int64"
+    INTNATIVE = "IntNative"
+    LET = "let"
+    MUT = "mut"
+    MAIN = "main"
+    MACRO = "macro"
+    MATCH = "match"
+    NOTHING = "Nothing"
+    OPERATOR = "operator"
+    PROP = "prop"
+    PACKAGE = "package"
+    QUOTE = "quote"
+    RETURN = "return"
+    SPAWN = "spawn"
+    SUPER = "super"
+    STATIC = "static"
+    STRUCT = "struct"
+    SYNCHRONIZED = "synchronized"
+    TRY = "try"
+    THIS = "this"
+    TRUE = "true"
+    TYPE = "type"
+    THROW = "throw"
+    THIS_TYPE = "This"
+    UNSAFE = "unsafe"
+    UNIT = "Unit"
+    UINT8 = "UInt8"
+    UINT16 = "UInt16"
+    UINT32 = "UInt32"
+    UINT64 = "UInt64"
+    UINTNATIVE = "UIntNative"
+    VAR = "var"
+    VARRAY = "VArray"
+    WHERE = "where"
+    WHILE = "while"
+
+    # Contextual keywords, lexed as IDENT and flagged through Token.contextual
+    ABSTRACT = "abstract"
+    OPEN = "open"
+    OVERRIDE = "override"
+    PRIVATE = "private"
+    PROTECTED = "protected"
+    PUBLIC = "public"
+    REDEF = "redef"
+    GET = "get"
+    SET = "set"
+    SEALED = "sealed"
+
     COALESCING = '??'
     
     DOT = '.'
@@ -97,3 +182,13 @@ class TokenKind(Enum):
     TRIPLE_QUOTE_CLOSE = '"""'
     LineStrExprStart = '${'
     MultiLineStrExprStart = '${'
+
+
+# Read-only views over dicts nothing else refers to, so the tables every
+# thread shares, the lexers' included, cannot change under it
+KEYWORD_KINDS: Mapping[str, TokenKind] = MappingProxyType(
+    {keyword: TokenKind(keyword) for keyword in KEYWORDS}
+)
+CONTEXTUAL_KEYWORD_KINDS: Mapping[str, TokenKind] = MappingProxyType(
+    {keyword: TokenKind(keyword) for keyword in CONTEXTUAL_KEYWORDS}
+)
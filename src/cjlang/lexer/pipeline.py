@@ -0,0 +1,89 @@
+"""Lazy, composable stages over the token stream produced by Cursor.
+
+A stage is any callable taking an iterator of tokens and returning one, so
+stages chain like generators::
+
+    tokens = pipeline(Cursor(text), drop_trivia, fold_newlines)
+
+When drop_trivia is the first stage the cursor skips whitespace and comments
+itself, so trivia tokens are never allocated.
+"""
+
+from typing import Callable, Iterable, Iterator, List
+
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.kinds import KEYWORD_KINDS, TokenKind
+
+Stage = Callable[[Iterable[Token]], Iterator[Token]]
+
+TRIVIA_KINDS = frozenset(
+    {TokenKind.WS, TokenKind.LINE_COMMENT, TokenKind.DELIMITED_COMMENT}
+)
+
+
+def drop_trivia(tokens: Iterable[Token], attach: bool = False) -> Iterator[Token]:
+    """Remove WS and comment tokens; with attach=True they become the next token's leading_trivia."""
+    trivia: List[Token] = []
+    for token in tokens:
+        if token.type in TRIVIA_KINDS:
+            if attach:
+                trivia.append(token)
+            continue
+        if trivia:
+            token.leading_trivia = trivia
+            trivia = []
+        yield token
+
+
+def keep_trivia(tokens: Iterable[Token]) -> Iterator[Token]:
+    """drop_trivia variant attaching the removed tokens to the following token."""
+    return drop_trivia(tokens, attach=True)
+
+
+def fold_newlines(tokens: Iterable[Token]) -> Iterator[Token]:
+    """Collapse runs of adjacent NL tokens into one NL spanning the whole run."""
+    pending = None
+    for token in tokens:
+        if token.type == TokenKind.NL:
+            if pending is None:
+                pending = token
+            else:
+                trivia = (pending.leading_trivia or []) + (token.leading_trivia or [])
+                pending = Token(TokenKind.NL, None, pending.start_pos, token.end_pos)
+                pending.leading_trivia = trivia or None
+            continue
+        if pending is not None:
+            yield pending
+            pending = None
+        yield token
+    if pending is not None:
+        yield pending
+
+
+def classify_keywords(tokens: Iterable[Token]) -> Iterator[Token]:
+    """Promote IDENT tokens spelling a keyword to the keyword's TokenKind.
+
+    Cursor already lexes keywords with their own kinds; this stage is for token
+    streams built elsewhere, e.g. by hand or from serialized IDENT tokens.
+    """
+    for token in tokens:
+        if token.type == TokenKind.IDENT:
+            kind = KEYWORD_KINDS.get(token.value)
+            if kind is not None:
+                token.type = kind
+        yield token
+
+
+def pipeline(cursor: Cursor, *stages: Stage) -> Iterator[Token]:
+    """Chain stages over the cursor's token stream; nothing is lexed until iterated."""
+    tokens: Iterator[Token] = cursor.iter_tokens(
+        skip_trivia=bool(stages) and stages[0] is drop_trivia
+    )
+    for stage in stages:
+        tokens = stage(tokens)
+    return tokens
+
+
+def significant_tokens(cursor: Cursor) -> List[Token]:
+    """The token list a parser consumes: no trivia and folded newlines."""
+    return list(pipeline(cursor, drop_trivia, fold_newlines))
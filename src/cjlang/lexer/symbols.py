@@ -0,0 +1,65 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class SymbolTable:
+    """Interns identifier text to small integer IDs for one lexing session.
+
+    Every occurrence of a name shares the table's canonical string, and
+    later stages can compare or hash the integer ID instead of the text.
+
+    A table shared between threads hands out one ID per name, though which
+    thread's name gets the lower ID depends on scheduling, and total may
+    miss concurrent occurrences. Give each thread its own table when IDs
+    must be reproducible.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self.total: int = 0  # Number of intern() calls, i.e. identifier occurrences
+        # Taken only to add a name; lookups of known names never wait
+        self._lock = threading.Lock()
+
+    def intern(self, name: str) -> int:
+        self.total += 1
+        symbol = self._ids.get(name)
+        if symbol is None:
+            with self._lock:
+                symbol = self._ids.get(name)
+                if symbol is None:
+                    symbol = len(self._names)
+                    # Named before it is published, so name() works for any ID in _ids
+                    self._names.append(name)
+                    self._ids[name] = symbol
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        return self._names[symbol]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """ID of an already interned name, without counting an occurrence."""
+        return self._ids.get(name)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name: str):
+        return name in self._ids
+
+    @property
+    def unique(self) -> int:
+        return len(self._names)
+
+    @property
+    def unique_ratio(self) -> float:
+        if self.total == 0:
+            return 0.0
+        return self.unique / self.total
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "unique": self.unique,
+            "total": self.total,
+            "unique_ratio": self.unique_ratio,
+        }
@@ -0,0 +1,106 @@
+"""Tokens of a range of lines, for editors showing part of a large file.
+
+    tokens = tokenize_range(text, start_line=1200, end_line=1260)
+
+Lines are 1-based and inclusive, as in LineIndex. The result is exactly the
+tokens of Cursor(text).tokenize() that overlap those lines, including the
+comment or string a range starts inside of and, when the range reaches the
+end of the text, EOF. Identifier symbols match the full tokenization too.
+
+A text is never lexed past the last line asked for so far. What comes
+before a range has to be lexed once, since any point could be inside a
+comment or string opened earlier, but the line index, Checkpoints and
+symbol table of each text are cached (least recently used texts are
+dropped beyond CACHE_CHARS), so a later range of the same text resumes from
+the nearest checkpoint instead of the top of the file.
+"""
+
+import threading
+from typing import List
+
+from cjlang.diagnostics.diagnostic import LineIndex
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.lexer.checkpoints import DEFAULT_EVERY, Checkpoints
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.symbols import SymbolTable
+from cjlang.utils.lru import LRUCache
+
+CACHE_CHARS = 64 * 1024 * 1024
+
+
+class LexedPrefix:
+    """Line index, checkpoints and symbols of a text lexed from its start up to frontier."""
+
+    __slots__ = ("text", "line_index", "checkpoints", "symbols", "frontier", "count", "lock")
+
+    def __init__(self, text: str, every: int = DEFAULT_EVERY):
+        self.text = text
+        self.line_index = LineIndex(text)
+        self.checkpoints = Checkpoints(every)
+        self.symbols = SymbolTable()
+        # Offset and index of the first token not lexed yet
+        self.frontier = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def tokens(self, start: int, end: int) -> List[Token]:
+        """Tokens overlapping [start, end), and EOF if end is the end of the text."""
+        text = self.text
+        # Diagnostics of the range are not reported; tokenize the whole text for those
+        cursor = Cursor(text, diagnostics=DiagnosticEngine(), symbols=self.symbols)
+        with self.lock:
+            if self.frontier <= start:
+                cursor.seek(self.frontier)
+                index = self.count
+            else:
+                index = self.checkpoints.resume(cursor, start)
+            every = self.checkpoints.every
+            tokens = []
+            while True:
+                if index == self.count:
+                    if index % every == 0 and cursor.pos < len(text):
+                        self.checkpoints.offsets.append(cursor.pos)
+                        self.checkpoints.indices.append(index)
+                    token = cursor.advance_token()
+                    self.frontier = cursor.pos
+                    self.count = index = index + 1
+                else:
+                    token = cursor.advance_token()
+                    index += 1
+                if token.type is TokenKind.EOF:
+                    if end >= len(text):
+                        tokens.append(token)
+                    return tokens
+                if token.start_pos >= end:
+                    return tokens
+                if token.end_pos > start:
+                    tokens.append(token)
+
+
+_prefixes: LRUCache[LexedPrefix] = LRUCache(CACHE_CHARS, sizeof=lambda prefix: len(prefix.text))
+_prefixes_lock = threading.Lock()
+
+
+def lexed_prefix(text: str) -> LexedPrefix:
+    """The cached LexedPrefix of text, created on first use."""
+    # Keyed by the text itself: str caches its hash, so repeated lookups are O(1)
+    with _prefixes_lock:
+        prefix = _prefixes.get(text)
+        if prefix is None:
+            prefix = LexedPrefix(text)
+            _prefixes.put(text, prefix)
+    return prefix
+
+
+def tokenize_range(text: str, start_line: int, end_line: int) -> List[Token]:
+    """Tokens of Cursor(text).tokenize() overlapping the 1-based lines start_line to end_line."""
+    prefix = lexed_prefix(text)
+    starts = prefix.line_index.line_starts
+    if start_line < 1 or end_line < start_line:
+        raise ValueError(f"invalid line range {start_line}-{end_line}")
+    if start_line > len(starts):
+        return []
+    start = starts[start_line - 1]
+    end = starts[end_line] if end_line < len(starts) else len(text)
+    return prefix.tokens(start, end)
@@ -0,0 +1,350 @@
+"""Incrementally analyzed text documents.
+
+The text is held as a list of segments, each starting at a line where the
+parser begins a top-level declaration at column 0. Lexing and parsing from
+such a position gives the same result as reaching it from the start of the
+file, so an edit only re-analyzes the segments it touches, plus the one
+before (the parser looks one token ahead across a boundary) and the one
+after (to confirm the boundary after the edit still holds; if it does not,
+the region grows by one segment and is analyzed again).
+
+Diagnostics and semantic tokens are kept with the segment whose parse
+produced them, positioned relative to its first line, so unchanged segments
+keep theirs as they are. Lines are 0-based and columns are counted in the
+code units of the negotiated position encoding (UTF-16 by default), as in LSP.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Set, Tuple
+
+from cjlang.ast.node import NodeKind
+from cjlang.diagnostics.diagnostic import Diagnostic, Level, LineIndex
+from cjlang.lexer.cursor import LEXICAL_CATEGORY, Cursor, Token
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.pipeline import drop_trivia, fold_newlines, pipeline
+from cjlang.lsp.semantic import EMPTY, Chunk, Classified, EncodedTokens, classify
+from cjlang.parser.parser import CangjieParser
+from cjlang.utils.offsets import UTF16, UTF32, OffsetMap
+
+# (line, character, severity, message, category)
+DiagnosticEntry = Tuple[int, int, Level, str, str]
+
+
+class Segment:
+    __slots__ = ("text", "lines", "diagnostics", "semantic", "_offsets")
+
+    def __init__(
+        self,
+        text: str,
+        diagnostics: Optional[List[DiagnosticEntry]] = None,
+        semantic: EncodedTokens = EMPTY,
+    ):
+        self.text = text
+        # Number of line breaks; every segment but the last ends with one
+        self.lines = text.count("\n")
+        self.diagnostics: List[DiagnosticEntry] = diagnostics or []
+        self.semantic = semantic
+        self._offsets: Optional[OffsetMap] = None
+
+    @property
+    def offsets(self) -> OffsetMap:
+        """Offset map of text, built on first use."""
+        if self._offsets is None:
+            self._offsets = OffsetMap(self.text)
+        return self._offsets
+
+
+class _SegmentParser(CangjieParser):
+    """Parser remembering where the top-level object being parsed starts."""
+
+    def __init__(self, cursor: Cursor, tokens: List[Token]):
+        self.object_start = 0
+        super().__init__(cursor, tokens)
+
+    def parse_top_level_object(self):
+        self.object_start = self.position
+        return super().parse_top_level_object()
+
+
+class _Attribution:
+    """Diagnostic consumer pairing each report with the line of the code that produced it."""
+
+    def __init__(self):
+        self.parser: Optional[_SegmentParser] = None
+        self.records: List[Tuple[Diagnostic, Optional[int]]] = []
+
+    def handle_diagnostic(self, diagnostic: Diagnostic):
+        # While lexing (parser not set yet) a diagnostic is produced where it points
+        self.records.append(
+            (diagnostic, None if self.parser is None else self.parser.object_start)
+        )
+
+
+class Analysis:
+    """Lexer and parser results for a text starting at a segment boundary."""
+
+    def __init__(self, text: str):
+        cursor = Cursor(text)
+        attribution = _Attribution()
+        cursor.diagnostics.add_consumer(attribution)
+        self.line_index = LineIndex(text)
+        self.offsets = OffsetMap(text)
+        # Offsets where a top-level declaration starts at column 0
+        self.boundaries: Set[int] = set()
+        # Where the lexer gave up by raising, if it did
+        self.failed_at: Optional[int] = None
+        self.diagnostics: List[Tuple[int, Diagnostic]] = []
+        # Significant tokens, up to the lexer failure if there is one
+        self.tokens: List[Token] = []
+
+        tokens = self.tokens
+        try:
+            for token in pipeline(cursor, drop_trivia, fold_newlines):
+                tokens.append(token)
+        except Exception as e:
+            # Nothing after this point can be lexed; report it instead of failing
+            self.failed_at = cursor.pos
+            cursor.diagnostics.error(
+                str(e) or "Invalid token", cursor.location(cursor.pos), LEXICAL_CATEGORY
+            )
+            for diagnostic, _ in attribution.records:
+                self.diagnostics.append((diagnostic.position.line, diagnostic))
+            return
+        parser = _SegmentParser(cursor, tokens)
+        attribution.parser = parser
+        unit = parser.parse()
+
+        for child in unit.children:
+            if child.kind is NodeKind.Preamble:
+                continue
+            token = tokens[child.token_start]
+            pos = token.start_pos
+            if pos is None or pos == 0 or text[pos - 1] != "\n":
+                continue
+            if token.type is TokenKind.MACRO and tokens[child.token_start + 1].type is TokenKind.PACKAGE:
+                # Analyzed alone this would parse as a package header
+                continue
+            self.boundaries.add(pos)
+
+        # (producer line, diagnostic), lines 1-based
+        for diagnostic, object_start in attribution.records:
+            if object_start is None:
+                producer = diagnostic.position.line
+            else:
+                pos = tokens[object_start].start_pos
+                producer = self.line_index.line_column(len(text) if pos is None else pos)[0]
+            self.diagnostics.append((producer, diagnostic))
+
+
+class Document:
+    def __init__(self, text: str = "", encoding: str = UTF16):
+        # Unit of the character in LSP positions: "utf-8", "utf-16" or "utf-32"
+        self.encoding = encoding
+        self.segments: List[Segment] = [Segment(text)]
+        self._reanalyze(0, 0)
+
+    @property
+    def text(self) -> str:
+        return "".join(segment.text for segment in self.segments)
+
+    def set_text(self, text: str):
+        self.segments = [Segment(text)]
+        self._reanalyze(0, 0)
+
+    def segment_lines(self) -> List[int]:
+        """First line of every segment."""
+        lines = []
+        line = 0
+        for segment in self.segments:
+            lines.append(line)
+            line += segment.lines
+        return lines
+
+    def _offset(self, segment: Segment, line: int, character: int) -> int:
+        """Offset in segment.text of a segment-relative line and character, clamped to the line."""
+        text = segment.text
+        start = 0
+        for _ in range(line):
+            end = text.find("\n", start)
+            if end == -1:
+                return len(text)
+            start = end + 1
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        elif end > start and text[end - 1] == "\r":
+            end -= 1
+        offsets = segment.offsets
+        units = offsets.to_units(start, self.encoding) + character
+        return min(offsets.from_units(units, self.encoding), end)
+
+    def _locate(self, starts: List[int], line: int, character: int) -> Tuple[int, int]:
+        """(segment index, offset in its text) of an LSP position."""
+        index = max(bisect_right(starts, line) - 1, 0)
+        return index, self._offset(self.segments[index], line - starts[index], character)
+
+    def apply_change(self, start: Tuple[int, int], end: Tuple[int, int], text: str):
+        """Replace the range between two (line, character) positions by text."""
+        starts = self.segment_lines()
+        first, start_offset = self._locate(starts, *start)
+        last, end_offset = self._locate(starts, *end)
+        if (last, end_offset) < (first, start_offset):
+            last, end_offset = first, start_offset
+        merged = (
+            self.segments[first].text[:start_offset]
+            + text
+            + self.segments[last].text[end_offset:]
+        )
+        self.segments[first : last + 1] = [Segment(merged)]
+        self._reanalyze(first, first)
+
+    def _reanalyze(self, first: int, last: int):
+        start = max(first - 1, 0)
+        region = "".join(segment.text for segment in self.segments[start : last + 1])
+        if not region and last + 1 < len(self.segments):
+            # Only possible at the start of the document, where any offset is a boundary
+            del self.segments[start : last + 1]
+            return
+
+        # Analyze the region followed by a growing number of unchanged segments
+        # until one of them still starts a top-level declaration; from there on
+        # the old results hold. Doubling the lookahead keeps a long run of
+        # invalidated segments (an unclosed brace, say) linear in its length.
+        lookahead = 1
+        while True:
+            stop = min(last + lookahead, len(self.segments) - 1)
+            text = region + "".join(segment.text for segment in self.segments[last + 1 : stop + 1])
+            analysis = Analysis(text)
+            resync: Optional[Tuple[int, int]] = None
+            offset = len(region)
+            for index in range(last + 1, stop + 1):
+                if offset in analysis.boundaries or (
+                    # Nothing after a lexer failure is analyzed, so keep the error
+                    # local and the following segments as they were
+                    analysis.failed_at is not None
+                    and analysis.failed_at < offset
+                ):
+                    resync = (index, offset)
+                    break
+                offset += len(self.segments[index].text)
+            if resync is not None or stop == len(self.segments) - 1:
+                break
+            lookahead *= 2
+
+        end, end_offset = resync if resync is not None else (len(self.segments), len(text))
+        splits = [0] + sorted(b for b in analysis.boundaries if b < end_offset)
+        line_index = analysis.line_index
+        offsets = analysis.offsets
+        split_lines = [line_index.line_column(pos)[0] for pos in splits]
+        limit_line = line_index.line_column(end_offset)[0] if resync is not None else None
+        diagnostics: List[List[DiagnosticEntry]] = [[] for _ in splits]
+        for producer, diagnostic in analysis.diagnostics:
+            if limit_line is not None and producer >= limit_line:
+                # Produced by the following segment, which keeps its own
+                continue
+            index = bisect_right(split_lines, producer) - 1
+            pos = diagnostic.position
+            line_start = line_index.line_starts[pos.line - 1]
+            character = offsets.to_units(line_start + pos.column, self.encoding) - offsets.to_units(
+                line_start, self.encoding
+            )
+            diagnostics[index].append(
+                (
+                    pos.line - split_lines[index],
+                    character,
+                    diagnostic.severity,
+                    diagnostic.message,
+                    diagnostic.category,
+                )
+            )
+
+        bounds = splits + [end_offset]
+        entries = list(classify(analysis.tokens))
+        entry_starts = [entry[0] for entry in entries]
+        segments = []
+        for k in range(len(splits)):
+            low = bisect_left(entry_starts, bounds[k])
+            high = bisect_left(entry_starts, bounds[k + 1])
+            semantic = _encode(
+                line_index, offsets, self.encoding, entries[low:high], split_lines[k] - 1
+            )
+            segments.append(Segment(text[bounds[k] : bounds[k + 1]], diagnostics[k], semantic))
+        self.segments[start:end] = segments
+
+    def semantic_chunks(self, start_line: int = 0, end_line: Optional[int] = None) -> List[Chunk]:
+        """Semantic tokens of the segments overlapping the given lines, for semantic.join."""
+        chunks = []
+        line = 0
+        previous = 0
+        for segment in self.segments:
+            if end_line is not None and line > end_line:
+                break
+            encoded = segment.semantic
+            if encoded.data and line + encoded.last_line >= start_line:
+                chunks.append((encoded, line + encoded.first_line - previous))
+                previous = line + encoded.last_line
+            line += segment.lines
+        return chunks
+
+    def diagnostics(self) -> List[DiagnosticEntry]:
+        result = []
+        line = 0
+        for segment in self.segments:
+            for relative_line, character, severity, message, category in segment.diagnostics:
+                result.append((line + relative_line, character, severity, message, category))
+            line += segment.lines
+        return result
+
+
+def _encode(
+    line_index: LineIndex,
+    offsets: OffsetMap,
+    encoding: str,
+    entries: List[Classified],
+    base_line: int,
+) -> EncodedTokens:
+    """Delta-encode classified tokens, splitting those spanning lines, relative to base_line (0-based)."""
+    if not entries:
+        return EMPTY
+    text = offsets.text
+    starts = line_index.line_starts
+    count = len(starts)
+    direct = offsets.is_ascii or encoding == UTF32
+    data = array("I")
+    line = bisect_right(starts, entries[0][0]) - 1
+    first_line = previous_line = -1
+    previous_char = 0
+    for start, end, kind, modifiers in entries:
+        while line + 1 < count and starts[line + 1] <= start:
+            line += 1
+        while start < end:
+            piece_end = end
+            if line + 1 < count and starts[line + 1] <= end:
+                # Stop at the line terminator; the rest goes on the next line
+                piece_end = starts[line + 1] - 1
+                if piece_end > start and text[piece_end - 1] == "\r":
+                    piece_end -= 1
+            if piece_end > start:
+                line_start = starts[line]
+                if direct:
+                    char, length = start - line_start, piece_end - start
+                else:
+                    units = offsets.to_units(start, encoding)
+                    char = units - offsets.to_units(line_start, encoding)
+                    length = offsets.to_units(piece_end, encoding) - units
+                if first_line < 0:
+                    first_line = line
+                    data.extend((0, char, length, kind, modifiers))
+                elif line == previous_line:
+                    data.extend((0, char - previous_char, length, kind, modifiers))
+                else:
+                    data.extend((line - previous_line, char, length, kind, modifiers))
+                previous_line, previous_char = line, char
+            if piece_end == end:
+                break
+            line += 1
+            start = starts[line]
+    if first_line < 0:
+        return EMPTY
+    return EncodedTokens(data, first_line - base_line, previous_line - base_line)
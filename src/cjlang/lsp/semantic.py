@@ -0,0 +1,228 @@
+"""Semantic tokens for syntax highlighting.
+
+Tokens are classified from their TokenKind and the tokens around them (the
+name after `func` is a function declaration, a contextual keyword followed
+by a declaration is a modifier, and so on), without resolving names.
+
+Each document segment keeps its tokens already delta-encoded as in LSP, in
+an array of five unsigned ints per token. Only the first token of a segment
+is encoded relative to something outside it, so a full result is the
+segments' arrays joined with one patched integer each, and a delta result
+is the run of segments that differ from the previous result.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from cjlang.lexer.cursor import Token
+from cjlang.lexer.kinds import KEYWORD_KINDS, TokenKind
+from cjlang.parser.parser import CONTEXTUAL_MODIFIER_KINDS
+
+TOKEN_TYPES = [
+    "namespace",
+    "type",
+    "class",
+    "enum",
+    "interface",
+    "struct",
+    "variable",
+    "function",
+    "macro",
+    "keyword",
+    "modifier",
+    "string",
+    "number",
+    "operator",
+]
+TOKEN_MODIFIERS = ["declaration", "readonly", "defaultLibrary"]
+LEGEND = {"tokenTypes": TOKEN_TYPES, "tokenModifiers": TOKEN_MODIFIERS}
+
+(
+    NAMESPACE,
+    TYPE,
+    CLASS,
+    ENUM,
+    INTERFACE,
+    STRUCT,
+    VARIABLE,
+    FUNCTION,
+    MACRO,
+    KEYWORD,
+    MODIFIER,
+    STRING,
+    NUMBER,
+    OPERATOR,
+) = range(len(TOKEN_TYPES))
+DECLARATION = 1
+READONLY = 2
+DEFAULT_LIBRARY = 4
+
+PRIMITIVE_TYPE_KINDS = frozenset(
+    {
+        TokenKind.BOOL,
+        TokenKind.RUNE,
+        TokenKind.FLOAT16,
+        TokenKind.FLOAT32,
+        TokenKind.FLOAT64,
+        TokenKind.INT8,
+        TokenKind.INT16,
+        TokenKind.INT32,
+        TokenKind.INT64,
+        TokenKind.INTNATIVE,
+        TokenKind.UINT8,
+        TokenKind.UINT16,
+        TokenKind.UINT32,
+        TokenKind.UINT64,
+        TokenKind.UINTNATIVE,
+        TokenKind.UNIT,
+        TokenKind.NOTHING,
+        TokenKind.THIS_TYPE,
+        TokenKind.VARRAY,
+    }
+)
+NUMBER_KINDS = frozenset(
+    {
+        TokenKind.BINARY_LITERAL,
+        TokenKind.OCTAL_LITERAL,
+        TokenKind.DECIMAL_LITERAL,
+        TokenKind.HEXADECIMAL_LITERAL,
+        TokenKind.FLOAT_LITERAL,
+    }
+)
+STRING_KINDS = frozenset(
+    {
+        TokenKind.RUNE_LITERAL,
+        TokenKind.BYTE_LITERAL,
+        TokenKind.LINE_STRING_LITERAL,
+        TokenKind.MULTI_LINE_STRING_LITERAL,
+        TokenKind.BYTE_STRING_ARRAY_LITERAL,
+        TokenKind.BYTE_STRING,
+    }
+)
+# Brackets and separators are left to the editor's own highlighting
+PUNCTUATION_KINDS = frozenset(
+    {
+        TokenKind.DOT,
+        TokenKind.COMMA,
+        TokenKind.LPAREN,
+        TokenKind.RPAREN,
+        TokenKind.LSQUARE,
+        TokenKind.RSQUARE,
+        TokenKind.LCURL,
+        TokenKind.RCURL,
+        TokenKind.COLON,
+        TokenKind.SEMI,
+        TokenKind.QUOTESYMBOL,
+        TokenKind.NL,
+        TokenKind.EOF,
+    }
+)
+IDENTIFIER_KINDS = frozenset({TokenKind.IDENT, TokenKind.RAW_IDENT})
+KEYWORD_TOKEN_KINDS = frozenset(KEYWORD_KINDS.values()) | {TokenKind.BOOLEAN_LITERAL}
+
+# (token type, modifiers) of the name following a keyword
+DECLARED_NAMES = {
+    TokenKind.FUNC: (FUNCTION, DECLARATION),
+    TokenKind.MACRO: (MACRO, DECLARATION),
+    TokenKind.CLASS: (CLASS, DECLARATION),
+    TokenKind.STRUCT: (STRUCT, DECLARATION),
+    TokenKind.ENUM: (ENUM, DECLARATION),
+    TokenKind.INTERFACE: (INTERFACE, DECLARATION),
+    TokenKind.TYPE: (TYPE, DECLARATION),
+    TokenKind.LET: (VARIABLE, DECLARATION | READONLY),
+    TokenKind.CONST: (VARIABLE, DECLARATION | READONLY),
+    TokenKind.VAR: (VARIABLE, DECLARATION),
+    TokenKind.AT: (MACRO, 0),
+}
+
+# (start offset, end offset, token type, modifiers)
+Classified = Tuple[int, int, int, int]
+
+
+def classify(tokens: Sequence[Token]) -> Iterator[Classified]:
+    """Highlight classes of significant tokens, in order; unclassified tokens are skipped."""
+    previous = TokenKind.NL
+    # Inside a package or import directive, names are package names
+    in_directive = False
+    count = len(tokens)
+    for i, token in enumerate(tokens):
+        kind = token.type
+        start, end = token.start_pos, token.end_pos
+        if kind is TokenKind.NL:
+            in_directive = False
+        if start is None or kind in PUNCTUATION_KINDS:
+            previous = kind
+            continue
+        following = tokens[i + 1].type if i + 1 < count else TokenKind.EOF
+        if kind in IDENTIFIER_KINDS:
+            if token.contextual in CONTEXTUAL_MODIFIER_KINDS and (
+                following in IDENTIFIER_KINDS or following in KEYWORD_TOKEN_KINDS
+            ):
+                yield start, end, MODIFIER, 0
+            elif in_directive:
+                yield start, end, NAMESPACE, 0
+            elif previous in DECLARED_NAMES:
+                yield (start, end) + DECLARED_NAMES[previous]
+            elif following is TokenKind.LPAREN:
+                yield start, end, FUNCTION, 0
+            else:
+                yield start, end, VARIABLE, 0
+        elif kind in PRIMITIVE_TYPE_KINDS:
+            yield start, end, TYPE, DEFAULT_LIBRARY
+        elif kind in NUMBER_KINDS:
+            yield start, end, NUMBER, 0
+        elif kind in STRING_KINDS:
+            yield start, end, STRING, 0
+        elif kind is TokenKind.AT:
+            yield start, end, MACRO, 0
+        elif kind in KEYWORD_TOKEN_KINDS:
+            in_directive = kind is TokenKind.PACKAGE or kind is TokenKind.IMPORT
+            yield start, end, KEYWORD, 0
+        else:
+            yield start, end, OPERATOR, 0
+        previous = kind
+
+
+class EncodedTokens:
+    """A segment's tokens as LSP integers, the first one's deltaLine left at 0."""
+
+    __slots__ = ("data", "first_line", "last_line")
+
+    def __init__(self, data: array, first_line: int, last_line: int):
+        self.data = data
+        # Segment-relative lines of the first and last token
+        self.first_line = first_line
+        self.last_line = last_line
+
+
+EMPTY = EncodedTokens(array("I"), 0, 0)
+
+# (segment tokens, deltaLine of its first token within the result)
+Chunk = Tuple[EncodedTokens, int]
+
+
+def join(chunks: List[Chunk]) -> List[int]:
+    data = array("I")
+    for encoded, head in chunks:
+        offset = len(data)
+        data.extend(encoded.data)
+        data[offset] = head
+    return data.tolist()
+
+
+def delta(old: List[Chunk], new: List[Chunk]) -> Dict[str, Any]:
+    """The single SemanticTokensEdit turning the joined old chunks into the new ones."""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix][0] is new[prefix][0] and old[prefix][1] == new[prefix][1]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old[-1 - suffix][0] is new[-1 - suffix][0]
+        and old[-1 - suffix][1] == new[-1 - suffix][1]
+    ):
+        suffix += 1
+    start = sum(len(encoded.data) for encoded, _ in old[:prefix])
+    deleted = sum(len(encoded.data) for encoded, _ in old[prefix : len(old) - suffix])
+    return {"start": start, "deleteCount": deleted, "data": join(new[prefix : len(new) - suffix])}
@@ -0,0 +1,241 @@
+"""Language Server Protocol server over stdio, built on the standard library.
+
+    cjlang lsp [--debounce MS]
+
+Documents are synchronized incrementally (TextDocumentSyncKind.Incremental):
+each didChange edit is applied to a Document, which re-analyzes only the
+segments around it. Diagnostics are published once no further change has
+arrived for the debounce delay. Semantic tokens are served in full, by range
+and as deltas against the last full result.
+"""
+
+import itertools
+import sys
+import threading
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+from cjlang import __version__
+from cjlang.diagnostics.diagnostic import Level
+from cjlang.jsonrpc import (
+    Dispatcher,
+    INVALID_REQUEST,
+    RpcError,
+    read_framed_message,
+    require,
+    write_framed_message,
+)
+from cjlang.lsp import semantic
+from cjlang.lsp.document import Document
+from cjlang.utils.offsets import UTF8, UTF16, UTF32
+
+# LSP DiagnosticSeverity
+SEVERITIES = {
+    Level.ERROR: 1,
+    Level.WARNING: 2,
+    Level.EXTWARN: 2,
+    Level.NOTE: 3,
+    Level.EXTENSION: 3,
+}
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+# Position encodings in order of preference; code points need no conversion at all
+POSITION_ENCODINGS = (UTF32, UTF8, UTF16)
+
+
+class LanguageServer:
+    def __init__(self, reader: BinaryIO, writer: BinaryIO, debounce: float = 0.05):
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        self.position_encoding = UTF16
+        # Guards documents and writer, shared with the debounce timers
+        self.lock = threading.RLock()
+        self.timers: Dict[str, threading.Timer] = {}
+        # uri -> (resultId, chunks) of the last full or delta semantic tokens result
+        self.semantic_results: Dict[str, Tuple[str, List[semantic.Chunk]]] = {}
+        self.result_ids = itertools.count(1)
+        self.shutdown_requested = False
+        self.exited = False
+        self.dispatcher = Dispatcher()
+        for name, handler in (
+            ("initialize", self.initialize),
+            ("initialized", lambda params: None),
+            ("shutdown", self.shutdown),
+            ("exit", self.exit),
+            ("textDocument/didOpen", self.did_open),
+            ("textDocument/didChange", self.did_change),
+            ("textDocument/didClose", self.did_close),
+            ("textDocument/didSave", lambda params: None),
+            ("textDocument/semanticTokens/full", self.semantic_tokens_full),
+            ("textDocument/semanticTokens/full/delta", self.semantic_tokens_delta),
+            ("textDocument/semanticTokens/range", self.semantic_tokens_range),
+            ("$/cancelRequest", lambda params: None),
+            ("$/setTrace", lambda params: None),
+        ):
+            self.dispatcher.register(name, handler)
+
+    def serve(self) -> int:
+        """Handle messages until exit; the exit code follows the LSP shutdown rules."""
+        while not self.exited:
+            body = read_framed_message(self.reader)
+            if body is None:
+                break
+            reply = self.dispatcher.dispatch_text(body.decode("utf-8"))
+            if reply is not None:
+                self.send(reply)
+        for timer in list(self.timers.values()):
+            timer.cancel()
+        return 0 if self.shutdown_requested else 1
+
+    def send(self, message: Dict[str, Any]):
+        with self.lock:
+            write_framed_message(self.writer, message)
+
+    def notify(self, method: str, params: Dict[str, Any]):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        general = params.get("capabilities", {}).get("general", {})
+        offered = general.get("positionEncodings") or [UTF16]
+        for encoding in POSITION_ENCODINGS:
+            if encoding in offered:
+                self.position_encoding = encoding
+                break
+        return {
+            "capabilities": {
+                "positionEncoding": self.position_encoding,
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                    "save": False,
+                },
+                "semanticTokensProvider": {
+                    "legend": semantic.LEGEND,
+                    "range": True,
+                    "full": {"delta": True},
+                },
+            },
+            "serverInfo": {"name": "cjlang", "version": __version__},
+        }
+
+    def shutdown(self, params: Dict[str, Any]) -> None:
+        self.shutdown_requested = True
+
+    def exit(self, params: Dict[str, Any]) -> None:
+        self.exited = True
+
+    def document(self, params: Dict[str, Any]) -> Document:
+        uri = require(require(params, "textDocument", dict), "uri", str)
+        document = self.documents.get(uri)
+        if document is None:
+            raise RpcError(INVALID_REQUEST, f"document not open: {uri}")
+        return document
+
+    def did_open(self, params: Dict[str, Any]) -> None:
+        item = require(params, "textDocument", dict)
+        uri = require(item, "uri", str)
+        with self.lock:
+            self.documents[uri] = Document(require(item, "text", str), self.position_encoding)
+        self.schedule(uri)
+
+    def did_change(self, params: Dict[str, Any]) -> None:
+        uri = require(require(params, "textDocument", dict), "uri", str)
+        with self.lock:
+            document = self.document(params)
+            for change in require(params, "contentChanges", list):
+                text = require(change, "text", str)
+                edit_range = change.get("range")
+                if edit_range is None:
+                    document.set_text(text)
+                else:
+                    start, end = edit_range["start"], edit_range["end"]
+                    document.apply_change(
+                        (start["line"], start["character"]),
+                        (end["line"], end["character"]),
+                        text,
+                    )
+        self.schedule(uri)
+
+    def did_close(self, params: Dict[str, Any]) -> None:
+        uri = require(require(params, "textDocument", dict), "uri", str)
+        with self.lock:
+            self.documents.pop(uri, None)
+            self.semantic_results.pop(uri, None)
+            timer = self.timers.pop(uri, None)
+            if timer is not None:
+                timer.cancel()
+        self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def remember(self, params: Dict[str, Any], chunks: List[semantic.Chunk]) -> str:
+        uri = require(require(params, "textDocument", dict), "uri", str)
+        result_id = str(next(self.result_ids))
+        self.semantic_results[uri] = (result_id, chunks)
+        return result_id
+
+    def semantic_tokens_full(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            chunks = self.document(params).semantic_chunks()
+            return {"resultId": self.remember(params, chunks), "data": semantic.join(chunks)}
+
+    def semantic_tokens_delta(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            chunks = self.document(params).semantic_chunks()
+            uri = params["textDocument"]["uri"]
+            previous = self.semantic_results.get(uri)
+            if previous is None or previous[0] != params.get("previousResultId"):
+                return {"resultId": self.remember(params, chunks), "data": semantic.join(chunks)}
+            edit = semantic.delta(previous[1], chunks)
+            edits = [edit] if edit["deleteCount"] or edit["data"] else []
+            return {"resultId": self.remember(params, chunks), "edits": edits}
+
+    def semantic_tokens_range(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        requested = require(params, "range", dict)
+        with self.lock:
+            # Whole segments are returned, which the protocol allows
+            chunks = self.document(params).semantic_chunks(
+                requested["start"]["line"], requested["end"]["line"]
+            )
+            return {"data": semantic.join(chunks)}
+
+    def schedule(self, uri: str):
+        """Publish diagnostics for uri after the debounce delay, restarting it on every change."""
+        if self.debounce <= 0:
+            self.publish(uri)
+            return
+        with self.lock:
+            timer = self.timers.pop(uri, None)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(self.debounce, self.publish, args=(uri,))
+            timer.daemon = True
+            self.timers[uri] = timer
+            timer.start()
+
+    def publish(self, uri: str):
+        with self.lock:
+            document = self.documents.get(uri)
+            self.timers.pop(uri, None)
+            if document is None:
+                return
+            diagnostics = lsp_diagnostics(document)
+            self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+
+def lsp_diagnostics(document: Document) -> List[Dict[str, Any]]:
+    diagnostics = []
+    for line, character, severity, message, category in document.diagnostics():
+        position = {"line": line, "character": character}
+        diagnostics.append(
+            {
+                "range": {"start": position, "end": position},
+                "severity": SEVERITIES[severity],
+                "source": "cjlang",
+                "code": category,
+                "message": message,
+            }
+        )
+    return diagnostics
+
+
+def run(debounce: float = 0.05) -> int:
+    return LanguageServer(sys.stdin.buffer, sys.stdout.buffer, debounce).serve()
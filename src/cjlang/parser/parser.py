@@ -1,92 +1,297 @@
+from types import MappingProxyType
 from typing import List, Optional
 
 from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.pipeline import significant_tokens
 from cjlang.ast.node import Node, NodeKind
 
+PARSE_CATEGORY = "Parse Issue"
+
+# Modifiers that may precede a top-level declaration
+MODIFIER_KINDS = frozenset(
+    {
+        TokenKind.STATIC,
+        TokenKind.UNSAFE,
+        TokenKind.FOREIGN,
+        TokenKind.MUT,
+        TokenKind.OPERATOR,
+    }
+)
+CONTEXTUAL_MODIFIER_KINDS = frozenset(
+    {
+        TokenKind.ABSTRACT,
+        TokenKind.OPEN,
+        TokenKind.OVERRIDE,
+        TokenKind.PRIVATE,
+        TokenKind.PROTECTED,
+        TokenKind.PUBLIC,
+        TokenKind.REDEF,
+        TokenKind.SEALED,
+    }
+)
+
+# Declarations made of a header followed by a brace-delimited body
+DEFINITION_KINDS = MappingProxyType(
+    {
+        TokenKind.CLASS: NodeKind.ClassDefinition,
+        TokenKind.INTERFACE: NodeKind.InterfaceDefinition,
+        TokenKind.STRUCT: NodeKind.StructDefinition,
+        TokenKind.ENUM: NodeKind.EnumDefinition,
+        TokenKind.FUNC: NodeKind.FunctionDefinition,
+        TokenKind.MAIN: NodeKind.MainDefinition,
+        TokenKind.EXTEND: NodeKind.ExtendDefinition,
+        TokenKind.MACRO: NodeKind.MacroDefinition,
+    }
+)
+
+# Declarations running to the end of the line
+LINE_DECLARATION_KINDS = MappingProxyType(
+    {
+        TokenKind.LET: NodeKind.VariableDeclaration,
+        TokenKind.VAR: NodeKind.VariableDeclaration,
+        TokenKind.CONST: NodeKind.VariableDeclaration,
+        TokenKind.TYPE: NodeKind.TypeAliasDefinition,
+    }
+)
+
+OPENING_KINDS = frozenset({TokenKind.LPAREN, TokenKind.LSQUARE, TokenKind.LCURL})
+CLOSING_KINDS = frozenset({TokenKind.RPAREN, TokenKind.RSQUARE, TokenKind.RCURL})
+
+
 class CangjieParser:
-    def __init__(self, cursor: Cursor):
+    def __init__(self, cursor: Cursor, tokens: Optional[List[Token]] = None):
         self._cursor = cursor
+        self.diagnostics = cursor.diagnostics
+        # Callers that lexed already pass significant_tokens(cursor) themselves
+        self.tokens: List[Token] = significant_tokens(cursor) if tokens is None else tokens
+        self.position: int = 0
+
+    def parse(self) -> Node:
+        return self.parse_translation_unit()
 
-    def lookahead(self) -> Token:
-        """Returns the current token without consuming it."""
-        c = self._cursor.clone()
-        return c.advance_token()
+    def lookahead(self, n: int = 0) -> Token:
+        """Returns the token n positions ahead without consuming it."""
+        index = self.position + n
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return self.tokens[-1]
 
-    def match_token(self, expected_token: str) -> Token:
-        """Matches and consumes the expected token."""
-        if self.position < len(self.tokens) and self.tokens[self.position] == expected_token:
+    def advance(self) -> Token:
+        """Consumes and returns the current token."""
+        token = self.lookahead()
+        if token.type is not TokenKind.EOF:
             self.position += 1
-            return expected_token
-        raise SyntaxError(f"Expected {expected_token}, but found {self.tokens[self.position]}")
+        return token
+
+    def current_position(self) -> int:
+        return self.position
+
+    def match_token(self, expected_token: TokenKind) -> Optional[Token]:
+        """Matches and consumes the expected token, reporting an error otherwise."""
+        token = self.lookahead()
+        if token.type is expected_token:
+            return self.advance()
+        self.error(f"Expected {expected_token.value}, but found {token.type.value}", token)
+        return None
 
     def end_of_tokens(self) -> bool:
         """Checks if all tokens have been consumed."""
-        return self._cursor.is_eof()
+        return self.lookahead().type is TokenKind.EOF
+
+    def error(self, message: str, token: Token):
+        pos = token.start_pos
+        if pos is None:
+            pos = len(self._cursor.text)
+        self.diagnostics.error(message, self._cursor.location(pos), PARSE_CATEGORY)
+
+    def skip_newlines(self):
+        while self.lookahead().type is TokenKind.NL:
+            self.advance()
+
+    def skip_to_line_end(self):
+        """Consumes tokens up to the next newline outside of brackets."""
+        depth = 0
+        while not self.end_of_tokens():
+            kind = self.lookahead().type
+            if kind is TokenKind.NL and depth == 0:
+                break
+            if kind in OPENING_KINDS:
+                depth += 1
+            elif kind in CLOSING_KINDS and depth > 0:
+                depth -= 1
+            self.advance()
+
+    def skip_block(self):
+        """Consumes a brace-delimited block, the current token being its '{'."""
+        opening = self.advance()
+        depth = 1
+        while depth > 0:
+            token = self.advance()
+            if token.type is TokenKind.EOF:
+                self.error("Expected '}'", opening)
+                return
+            if token.type is TokenKind.LCURL:
+                depth += 1
+            elif token.type is TokenKind.RCURL:
+                depth -= 1
 
     def parse_translation_unit(self) -> Node:
         """Parses a translation unit."""
         token_start = self.current_position()
-        token_end = len(self.tokens)  # Final position after parsing
 
-        unit = Node(NodeKind.TranslationUnit, token_start, token_end)
+        unit = Node(NodeKind.TranslationUnit, token_start, len(self.tokens))
 
+        self.skip_newlines()
         # Parse preamble
         preamble_node = self.parse_preamble()
         if preamble_node:
             unit.add_child(preamble_node)
 
         # Parse top-level objects
+        self.skip_newlines()
         while not self.end_of_tokens():
             top_level_object_node = self.parse_top_level_object()
             if top_level_object_node:
                 unit.add_child(top_level_object_node)
+            self.skip_newlines()
 
         return unit
 
     def parse_preamble(self) -> Optional[Node]:
-        """Parses the preamble section."""
+        """Parses the package header and import list."""
         token_start = self.current_position()
-        if self.lookahead() == 'PACKAGE':
-            package_header_node = self.parse_package_header()
-            if package_header_node:
-                preamble_node = Node(NodeKind.Preamble, token_start, self.current_position())
-                preamble_node.add_child(package_header_node)
-                return preamble_node
-        return None
+        children = []
+
+        if self.lookahead().type is TokenKind.PACKAGE or (
+            self.lookahead().type is TokenKind.MACRO
+            and self.lookahead(1).type is TokenKind.PACKAGE
+        ):
+            children.append(self.parse_package_header())
+            self.skip_newlines()
+
+        import_list_node = self.parse_import_list()
+        if import_list_node:
+            children.append(import_list_node)
 
-    def parse_package_header(self) -> Optional[Node]:
+        if not children:
+            return None
+        preamble_node = Node(NodeKind.Preamble, token_start, self.current_position())
+        for child in children:
+            preamble_node.add_child(child)
+        return preamble_node
+
+    def parse_package_header(self) -> Node:
         """Parses the package header."""
         token_start = self.current_position()
-        self.match_token('PACKAGE')
+        if self.lookahead().type is TokenKind.MACRO:
+            self.advance()
+        self.match_token(TokenKind.PACKAGE)
 
         package_name_node = self.parse_package_name_identifier()
-        if package_name_node:
-            package_header_node = Node(NodeKind.PackageHeader, token_start, self.current_position())
-            package_header_node.add_child(package_name_node)
-            return package_header_node
-        return None
+        package_header_node = Node(NodeKind.PackageHeader, token_start, self.current_position())
+        package_header_node.add_child(package_name_node)
+        return package_header_node
 
     def parse_package_name_identifier(self) -> Node:
-        """Parses the package name identifier."""
+        """Parses a dotted package name."""
         token_start = self.current_position()
-        self.match_token('IDENTIFIER')  # Parse the package identifier (simple case)
+        self.match_token(TokenKind.IDENT)
+        while self.lookahead().type is TokenKind.DOT:
+            self.advance()
+            self.match_token(TokenKind.IDENT)
         return Node(NodeKind.PackageHeader, token_start, self.current_position())
 
+    def is_import_start(self) -> bool:
+        n = 0
+        while self.lookahead(n).contextual in CONTEXTUAL_MODIFIER_KINDS:
+            n += 1
+        return self.lookahead(n).type is TokenKind.IMPORT
+
+    def parse_import_list(self) -> Optional[Node]:
+        """Parses consecutive import directives."""
+        token_start = self.current_position()
+        directives = []
+        while self.is_import_start():
+            directive_start = self.current_position()
+            self.skip_to_line_end()
+            directives.append(
+                Node(NodeKind.ImportDirective, directive_start, self.current_position())
+            )
+            self.skip_newlines()
+        if not directives:
+            return None
+        import_list_node = Node(NodeKind.ImportList, token_start, self.current_position())
+        for directive in directives:
+            import_list_node.add_child(directive)
+        return import_list_node
+
+    def skip_modifiers(self):
+        while True:
+            token = self.lookahead()
+            if token.type is TokenKind.AT:
+                # Annotation: '@' name, optionally followed by bracketed arguments
+                self.advance()
+                self.match_token(TokenKind.IDENT)
+                if self.lookahead().type is TokenKind.LSQUARE:
+                    self.skip_bracketed()
+                self.skip_newlines()
+            elif (
+                token.type in MODIFIER_KINDS
+                or token.contextual in CONTEXTUAL_MODIFIER_KINDS
+            ):
+                self.advance()
+            else:
+                break
+
+    def skip_bracketed(self):
+        depth = 0
+        while not self.end_of_tokens():
+            kind = self.advance().type
+            if kind in OPENING_KINDS:
+                depth += 1
+            elif kind in CLOSING_KINDS:
+                depth -= 1
+                if depth == 0:
+                    break
+
     def parse_top_level_object(self) -> Optional[Node]:
         """Parses a top-level object."""
         token_start = self.current_position()
-        kind = None
+        self.skip_modifiers()
+        token = self.lookahead()
 
-        if self.lookahead() == 'CLASS':
-            kind = NodeKind.ClassDefinition
-            self.match_token('CLASS')
-            # Parsing of class definition body (omitted)
-        elif self.lookahead() == 'FUNCTION':
-            kind = NodeKind.FunctionDefinition
-            self.match_token('FUNCTION')
-            # Parsing of function definition body (omitted)
+        if token.type in DEFINITION_KINDS:
+            kind = DEFINITION_KINDS[token.type]
+            self.parse_definition_body()
+        elif token.type in LINE_DECLARATION_KINDS:
+            kind = LINE_DECLARATION_KINDS[token.type]
+            self.skip_to_line_end()
+        else:
+            self.error(f"Expected a declaration, but found {token.type.value}", token)
+            self.skip_to_line_end()
+            return None
 
-        if kind:
-            return Node(kind, token_start, self.current_position())
+        return Node(kind, token_start, self.current_position())
 
-        return None
+    def parse_definition_body(self):
+        """Consumes a definition header and its body, if any."""
+        depth = 0
+        self.advance()
+        while not self.end_of_tokens():
+            kind = self.lookahead().type
+            if depth == 0:
+                if kind is TokenKind.LCURL:
+                    self.skip_block()
+                    return
+                if kind is TokenKind.NL:
+                    # The body may start on the next line; otherwise there is none
+                    if self.lookahead(1).type is TokenKind.LCURL:
+                        self.advance()
+                        continue
+                    return
+            if kind in OPENING_KINDS:
+                depth += 1
+            elif kind in CLOSING_KINDS and depth > 0:
+                depth -= 1
+            self.advance()
@@ -0,0 +1,202 @@
+"""Opt-in hot-path instrumentation for the lexer and the parser.
+
+Profiling is enabled by constructing the instrumented subclasses instead of
+Cursor and CangjieParser, so the regular classes carry no extra checks::
+
+    profile = Profile()
+    parser = ProfilingParser(ProfilingCursor(text, profile=profile), profile=profile)
+    parser.parse()
+    print(profile.format_report())
+
+Reports are plain dicts with stable keys; diff_reports() compares two of
+them, e.g. loaded from JSON files written by different versions.
+"""
+
+from time import perf_counter_ns
+from typing import Dict, List, Optional
+
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.symbols import SymbolTable
+from cjlang.parser.parser import CangjieParser
+
+TOKENS = "tokens"
+SCANNERS = "scanners"
+PRODUCTIONS = "productions"
+
+# Cursor methods each scanning one kind of token
+SCANNER_METHODS = (
+    "consume_number",
+    "identifier",
+    "string",
+    "rune_literal",
+)
+
+# Cursor methods consuming trivia, by scanner name. The token methods call
+# them too, but skip_trivia calls them directly when no tokens are made for
+# whitespace and comments, as under the parser.
+TRIVIA_METHODS = {
+    "eat_whitespace": "whitespace",
+    "eat_line_comment": "line_comment",
+    "eat_delimited_comment": "delimited_comment",
+}
+
+
+class Profile:
+    """Call counts, characters consumed and cumulative nanoseconds per entry."""
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[str, List[int]]] = {
+            TOKENS: {},
+            SCANNERS: {},
+            PRODUCTIONS: {},
+        }
+
+    def record(self, section: str, name: str, chars: int, elapsed_ns: int):
+        entries = self.sections[section]
+        entry = entries.get(name)
+        if entry is None:
+            entries[name] = [1, chars, elapsed_ns]
+        else:
+            entry[0] += 1
+            entry[1] += chars
+            entry[2] += elapsed_ns
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        return {
+            section: {
+                name: {"calls": calls, "chars": chars, "ns": elapsed_ns}
+                for name, (calls, chars, elapsed_ns) in sorted(entries.items())
+            }
+            for section, entries in self.sections.items()
+        }
+
+    def format_report(self) -> str:
+        lines = []
+        for section, entries in self.report().items():
+            if not entries:
+                continue
+            lines.append(f"{section}:")
+            ranked = sorted(entries.items(), key=lambda item: -item[1]["ns"])
+            for name, entry in ranked:
+                lines.append(
+                    f"  {name:<28} {entry['calls']:>9} calls {entry['chars']:>10} chars "
+                    f"{entry['ns'] / 1e6:>10.3f} ms"
+                )
+        return "\n".join(lines)
+
+
+def diff_reports(old: Dict, new: Dict) -> List[str]:
+    """One line per entry whose calls or characters changed, or whose time moved by 10% or more."""
+    lines = []
+    for section in (TOKENS, SCANNERS, PRODUCTIONS):
+        old_entries = old.get(section, {})
+        new_entries = new.get(section, {})
+        for name in sorted(old_entries.keys() | new_entries.keys()):
+            before = old_entries.get(name, {"calls": 0, "chars": 0, "ns": 0})
+            after = new_entries.get(name, {"calls": 0, "chars": 0, "ns": 0})
+            changes = []
+            for field in ("calls", "chars"):
+                if before[field] != after[field]:
+                    changes.append(f"{field} {before[field]} -> {after[field]}")
+            if before["ns"] and after["ns"]:
+                ratio = after["ns"] / before["ns"]
+                if abs(ratio - 1) >= 0.1:
+                    changes.append(f"time {ratio:.2f}x")
+            elif before["ns"] != after["ns"]:
+                changes.append("time added" if after["ns"] else "time removed")
+            if changes:
+                lines.append(f"{section}.{name}: " + ", ".join(changes))
+    return lines
+
+
+def _instrument_scanner(method_name: str, name: str):
+    scan = getattr(Cursor, method_name)
+
+    def method(self, *args, **kwargs):
+        start_pos = self.pos
+        start = perf_counter_ns()
+        result = scan(self, *args, **kwargs)
+        self.profile.record(SCANNERS, name, self.pos - start_pos, perf_counter_ns() - start)
+        return result
+
+    method.__name__ = method_name
+    method.__doc__ = scan.__doc__
+    return method
+
+
+class ProfilingCursor(Cursor):
+    """Cursor recording every produced token and every scanning method call."""
+
+    def __init__(
+        self,
+        text: str,
+        filepath: Optional[str] = None,
+        diagnostics: Optional[DiagnosticEngine] = None,
+        symbols: Optional[SymbolTable] = None,
+        profile: Optional[Profile] = None,
+    ):
+        super().__init__(text, filepath, diagnostics, symbols)
+        self.profile = profile if profile is not None else Profile()
+
+    def clone(self, diagnostics: Optional[DiagnosticEngine] = None) -> "ProfilingCursor":
+        if diagnostics is None:
+            diagnostics = self.diagnostics
+        new_cursor = ProfilingCursor(
+            self.text, self.filepath, diagnostics, self.symbols, self.profile
+        )
+        new_cursor.pos = self.pos
+        new_cursor.current_char = self.current_char
+        new_cursor.line_index = self.line_index
+        return new_cursor
+
+    def advance_token(self) -> Token:
+        start_pos = self.pos
+        start = perf_counter_ns()
+        token = super().advance_token()
+        self.profile.record(TOKENS, token.type.name, self.pos - start_pos, perf_counter_ns() - start)
+        return token
+
+
+for _name in SCANNER_METHODS:
+    setattr(ProfilingCursor, _name, _instrument_scanner(_name, _name))
+for _method_name, _name in TRIVIA_METHODS.items():
+    setattr(ProfilingCursor, _method_name, _instrument_scanner(_method_name, _name))
+
+
+def _instrument_production(name: str):
+    production = getattr(CangjieParser, name)
+
+    def method(self, *args, **kwargs):
+        start_position = self.position
+        start = perf_counter_ns()
+        result = production(self, *args, **kwargs)
+        self.profile.record(
+            PRODUCTIONS, name, self.position - start_position, perf_counter_ns() - start
+        )
+        return result
+
+    method.__name__ = name
+    method.__doc__ = production.__doc__
+    return method
+
+
+class ProfilingParser(CangjieParser):
+    """Parser recording calls, tokens consumed and time per production.
+
+    For productions the "chars" column counts consumed tokens.
+    """
+
+    def __init__(self, cursor: Cursor, profile: Optional[Profile] = None):
+        if profile is None:
+            profile = getattr(cursor, "profile", None) or Profile()
+        self.profile = profile
+        super().__init__(cursor)
+
+
+PRODUCTION_METHODS = tuple(
+    name for name in vars(CangjieParser) if name.startswith(("parse_", "skip_"))
+)
+
+for _name in PRODUCTION_METHODS:
+    setattr(ProfilingParser, _name, _instrument_production(_name))
@@ -0,0 +1,92 @@
+"""Phase timing spans exported as Chrome Trace Event JSON.
+
+    tracer = Tracer()
+    with tracer.span("lex", file=path):
+        tokens = cursor.tokenize()
+    tracer.write("trace.json")
+
+The file opens in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+Spans are plain tuples so they can be recorded in worker processes, sent
+back with the results and merged into the parent tracer with extend().
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (name, category, start_ns, duration_ns, pid, tid, args)
+Span = Tuple[str, str, int, int, int, int, Dict[str, Any]]
+
+
+class Tracer:
+    """Collects complete spans timed with perf_counter_ns."""
+
+    def __init__(self, category: str = "cjlang"):
+        self.category = category
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append(
+                (
+                    name,
+                    self.category,
+                    start,
+                    perf_counter_ns() - start,
+                    os.getpid(),
+                    threading.get_native_id(),
+                    args,
+                )
+            )
+
+    def extend(self, spans: Iterable[Span]):
+        self.spans.extend(spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Complete ("X") events in microseconds, relative to the earliest span."""
+        origin = min((span[2] for span in self.spans), default=0)
+        events: List[Dict[str, Any]] = []
+        main_pid = os.getpid()
+        for pid in sorted({span[4] for span in self.spans}):
+            events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"name": "cjlang" if pid == main_pid else f"cjlang worker {pid}"},
+                }
+            )
+        for name, category, start, duration, pid, tid, args in self.spans:
+            events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+    def totals(self, key: Optional[str] = None) -> Dict[str, int]:
+        """Summed nanoseconds per span name, or per value of the argument key."""
+        totals: Dict[str, int] = {}
+        for name, _, _, duration, _, _, args in self.spans:
+            group = name if key is None else args.get(key)
+            if group is not None:
+                totals[group] = totals.get(group, 0) + duration
+        return totals
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Mapping bounded by the summed size of its values, evicting the least recently used.
+
+    sizeof gives the size of a value in whatever unit budget is expressed in
+    (bytes, entries, ...). Not thread-safe; callers sharing a cache lock around it.
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        sizeof: Callable[[V], int] = lambda value: 1,
+        on_evict: Optional[Callable[[Hashable, V], None]] = None,
+    ):
+        self.budget = budget
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[V, int]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Like get() but without touching recency or the counters."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: V) -> bool:
+        """Stores value as the most recent entry; False if it alone exceeds the budget."""
+        self.pop(key)
+        size = self.sizeof(value)
+        if size > self.budget:
+            return False
+        self._entries[key] = (value, size)
+        self.size += size
+        while self.size > self.budget:
+            old_key, (old_value, old_size) = self._entries.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
+        return True
+
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> Iterator[Hashable]:
+        """Keys from least to most recently used."""
+        return iter(list(self._entries))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,117 @@
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+UTF8 = "utf-8"
+UTF16 = "utf-16"
+UTF32 = "utf-32"
+# Names as used by LSP's positionEncoding; UTF-32 units are code points
+ENCODINGS = (UTF8, UTF16, UTF32)
+
+
+def encoded_length(text: str, encoding: str) -> int:
+    """Length of text in code units of encoding."""
+    if encoding == UTF32 or text.isascii():
+        return len(text)
+    if encoding == UTF16:
+        return len(text.encode("utf-16-le", "surrogatepass")) // 2
+    return len(text.encode("utf-8", "surrogatepass"))
+
+
+def _width(char: str, encoding: str) -> int:
+    code = ord(char)
+    if encoding == UTF16:
+        return 2 if code > 0xFFFF else 1
+    if code < 0x80:
+        return 1
+    if code < 0x800:
+        return 2
+    return 3 if code <= 0xFFFF else 4
+
+
+class OffsetMap:
+    """Converts offsets in a text between code points, UTF-16 code units and UTF-8 bytes.
+
+    Built once per text. ASCII text needs no table. Otherwise the UTF-16 and
+    UTF-8 offsets of every block of code points are recorded, so a conversion
+    is a lookup or bisection followed by at most one block's worth of work,
+    and none at all in blocks with one unit per code point.
+    """
+
+    __slots__ = ("text", "block", "is_ascii", "utf16", "utf8")
+
+    def __init__(self, text: str, block: int = 64):
+        self.text = text
+        self.block = block
+        self.is_ascii = text.isascii()
+        self.utf16: Optional[array] = None
+        self.utf8: Optional[array] = None
+        if self.is_ascii:
+            return
+        # Unit offsets where each block starts, plus the total length
+        utf16 = array("q", [0])
+        utf8 = array("q", [0])
+        for start in range(0, len(text), block):
+            chunk = text[start : start + block]
+            utf16.append(utf16[-1] + encoded_length(chunk, UTF16))
+            utf8.append(utf8[-1] + encoded_length(chunk, UTF8))
+        self.utf16 = utf16
+        self.utf8 = utf8
+
+    def __len__(self):
+        return len(self.text)
+
+    def _table(self, encoding: str) -> array:
+        if encoding == UTF16:
+            return self.utf16
+        if encoding == UTF8:
+            return self.utf8
+        raise ValueError(f"unknown encoding: {encoding}")
+
+    def length(self, encoding: str = UTF16) -> int:
+        """Length of the whole text in code units."""
+        if self.is_ascii or encoding == UTF32:
+            return len(self.text)
+        return self._table(encoding)[-1]
+
+    def to_units(self, offset: int, encoding: str = UTF16) -> int:
+        """Code unit offset of a code point offset, clamped to the text."""
+        offset = min(max(offset, 0), len(self.text))
+        if self.is_ascii or encoding == UTF32:
+            return offset
+        table = self._table(encoding)
+        index = offset // self.block
+        start = index * self.block
+        base = table[index]
+        if offset == start:
+            return base
+        if table[index + 1] - base == min(self.block, len(self.text) - start):
+            # One unit per code point throughout the block
+            return base + offset - start
+        return base + encoded_length(self.text[start:offset], encoding)
+
+    def from_units(self, units: int, encoding: str = UTF16) -> int:
+        """Code point offset of a code unit offset; a unit inside a character maps to its start."""
+        if self.is_ascii or encoding == UTF32:
+            return min(max(units, 0), len(self.text))
+        table = self._table(encoding)
+        if units <= 0:
+            return 0
+        if units >= table[-1]:
+            return len(self.text)
+        index = bisect_right(table, units) - 1
+        offset = index * self.block
+        remaining = units - table[index]
+        size = min(self.block, len(self.text) - offset)
+        if table[index + 1] - table[index] == size:
+            return offset + remaining
+        for char in self.text[offset : offset + size]:
+            remaining -= _width(char, encoding)
+            if remaining < 0:
+                break
+            offset += 1
+        return offset
+
+    def convert(self, units: int, source: str, target: str) -> int:
+        """Offset in target units of an offset in source units."""
+        return self.to_units(self.from_units(units, source), target)
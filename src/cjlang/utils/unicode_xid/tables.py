@@ -12,11 +12,11 @@
 
 # The version of [Unicode](http://www.unicode.org/)
 # that this version of unicode-xid is based on.
-from typing import Tuple, List
+from typing import Tuple
 
 UNICODE_VERSION: Tuple[int, int, int] = (16, 0, 0)
 
-def bsearch_range_table(c: str, r: list[tuple[str, str]]) -> bool:
+def bsearch_range_table(c: str, r: Tuple[Tuple[str, str], ...]) -> bool:
     low, high = 0, len(r) - 1
 
     while low <= high:
@@ -32,7 +32,7 @@ def bsearch_range_table(c: str, r: list[tuple[str, str]]) -> bool:
 
     return False  # Character not found in any range
 
-XID_Continue_table : List[Tuple[str, str]] = [
+XID_Continue_table : Tuple[Tuple[str, str], ...] = (
         ('\U00000030', '\U00000039'), ('\U00000041', '\U0000005a'), ('\U0000005f', '\U0000005f'),
         ('\U00000061', '\U0000007a'), ('\U000000aa', '\U000000aa'), ('\U000000b5', '\U000000b5'),
         ('\U000000b7', '\U000000b7'), ('\U000000ba', '\U000000ba'), ('\U000000c0', '\U000000d6'),
@@ -300,13 +300,13 @@ XID_Continue_table : List[Tuple[str, str]] = [
         ('\U0002b740', '\U0002b81d'), ('\U0002b820', '\U0002cea1'), ('\U0002ceb0', '\U0002ebe0'),
         ('\U0002ebf0', '\U0002ee5d'), ('\U0002f800', '\U0002fa1d'), ('\U00030000', '\U0003134a'),
         ('\U00031350', '\U000323af'), ('\U000e0100', '\U000e01ef')
-    ]
+    )
 
 def XID_Continue(c: str) -> bool:
     return bsearch_range_table(c, XID_Continue_table)
 
 
-XID_Start_table : List[Tuple[str, str]] = [
+XID_Start_table : Tuple[Tuple[str, str], ...] = (
         ('\U00000041', '\U0000005a'), ('\U00000061', '\U0000007a'), ('\U000000aa', '\U000000aa'),
         ('\U000000b5', '\U000000b5'), ('\U000000ba', '\U000000ba'), ('\U000000c0', '\U000000d6'),
         ('\U000000d8', '\U000000f6'), ('\U000000f8', '\U000002c1'), ('\U000002c6', '\U000002d1'),
@@ -535,7 +535,7 @@ XID_Start_table : List[Tuple[str, str]] = [
         ('\U00020000', '\U0002a6df'), ('\U0002a700', '\U0002b739'), ('\U0002b740', '\U0002b81d'),
         ('\U0002b820', '\U0002cea1'), ('\U0002ceb0', '\U0002ebe0'), ('\U0002ebf0', '\U0002ee5d'),
         ('\U0002f800', '\U0002fa1d'), ('\U00030000', '\U0003134a'), ('\U00031350', '\U000323af')
-    ]
+    )
 
 def XID_Start(c: str) -> bool:
     return bsearch_range_table(c, XID_Start_table)
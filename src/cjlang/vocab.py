@@ -0,0 +1,225 @@
+"""A deterministic token vocabulary mapping source text to integer IDs.
+
+    vocabulary = build_vocabulary(paths, max_size=50_000, min_count=2, jobs=8)
+    vocabulary.save("vocab.json.gz")
+    ids = vocabulary.encode(text)        # array('I')
+    text == vocabulary.decode(ids)       # when no token was out of vocabulary
+
+The first IDs are the token kinds, in TokenKind order. Keywords and operators
+are always spelled the same way, so their kind ID is all they need. Tokens
+whose spelling varies (identifiers, literals, whitespace, comments) get an
+ID of their own when their exact source text is in the vocabulary. Otherwise
+they get their kind's ID, which is then the out-of-vocabulary bucket for
+that kind and decodes to a placeholder such as <IDENT>.
+
+Entries are ordered by descending corpus frequency, then kind and text, so
+the same counts always give the same IDs. A saved vocabulary lists its kinds
+by name, which keeps the IDs stable when TokenKind gains members.
+"""
+
+import gzip
+import json
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+
+FORMAT = "cjlang-vocab"
+FORMAT_VERSION = 1
+
+# Kinds whose source text varies from token to token
+VALUE_KINDS = frozenset(
+    {
+        TokenKind.WS,
+        TokenKind.NL,
+        TokenKind.IDENT,
+        TokenKind.RAW_IDENT,
+        TokenKind.LINE_COMMENT,
+        TokenKind.DELIMITED_COMMENT,
+        TokenKind.BINARY_LITERAL,
+        TokenKind.OCTAL_LITERAL,
+        TokenKind.DECIMAL_LITERAL,
+        TokenKind.HEXADECIMAL_LITERAL,
+        TokenKind.FLOAT_LITERAL,
+        TokenKind.RUNE_LITERAL,
+        TokenKind.BYTE_LITERAL,
+        TokenKind.BOOLEAN_LITERAL,
+        TokenKind.LINE_STRING_LITERAL,
+        TokenKind.MULTI_LINE_STRING_LITERAL,
+        TokenKind.BYTE_STRING_ARRAY_LITERAL,
+        TokenKind.UNIT_LITERAL,
+        TokenKind.BYTE_STRING,
+    }
+)
+
+Entry = Tuple[TokenKind, str]
+
+
+def count_text(text: str, counts: Counter, trivia: bool = True):
+    """Add the (kind, source text) occurrences of the varying tokens of text to counts."""
+    for token in Cursor(text).iter_tokens(skip_trivia=not trivia):
+        if token.type in VALUE_KINDS:
+            counts[token.type, text[token.start_pos : token.end_pos]] += 1
+
+
+def _count_files(trivia: bool, paths: Sequence[str]) -> Counter:
+    counts: Counter = Counter()
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            file_counts: Counter = Counter()
+            count_text(text, file_counts, trivia)
+        except Exception:
+            # Unreadable files and files the lexer gives up on do not count
+            continue
+        counts.update(file_counts)
+    return counts
+
+
+def count_files(
+    paths: Sequence[str], jobs: int = 1, trivia: bool = True, files_per_task: int = 64
+) -> Counter:
+    """Token counts of the readable, lexable files among paths, over jobs worker processes."""
+    tasks = [paths[start : start + files_per_task] for start in range(0, len(paths), files_per_task)]
+    worker = partial(_count_files, trivia)
+    counts: Counter = Counter()
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for task_counts in pool.map(worker, tasks):
+                counts.update(task_counts)
+    else:
+        for task in tasks:
+            counts.update(worker(task))
+    return counts
+
+
+class Vocabulary:
+    def __init__(self, entries: Iterable[Entry] = (), kinds: Optional[Sequence[TokenKind]] = None):
+        self.kinds: List[TokenKind] = list(TokenKind) if kinds is None else list(kinds)
+        self.entries: List[Entry] = list(entries)
+        self.kind_ids: Dict[TokenKind, int] = {kind: index for index, kind in enumerate(self.kinds)}
+        # Per kind ID: text -> ID for the kinds with entries, None for the others
+        self._values: List[Optional[Dict[str, int]]] = [None] * len(self.kinds)
+        self._spellings: List[str] = [
+            f"<{kind.name}>" if kind in VALUE_KINDS else kind.value for kind in self.kinds
+        ]
+        for kind in self.kinds:
+            if kind in VALUE_KINDS:
+                self._values[self.kind_ids[kind]] = {}
+        for index, (kind, text) in enumerate(self.entries, start=len(self.kinds)):
+            self._values[self.kind_ids[kind]][text] = index
+            self._spellings.append(text)
+
+    @classmethod
+    def from_counts(
+        cls, counts: Counter, max_size: Optional[int] = None, min_count: int = 1
+    ) -> "Vocabulary":
+        """The most frequent entries of counts, max_size IDs in all including the kinds."""
+        kinds = list(TokenKind)
+        order = {kind: index for index, kind in enumerate(kinds)}
+        entries = sorted(
+            (
+                (count, kind, text)
+                for (kind, text), count in counts.items()
+                if count >= min_count and kind in VALUE_KINDS
+            ),
+            key=lambda item: (-item[0], order[item[1]], item[2]),
+        )
+        if max_size is not None:
+            entries = entries[: max(max_size - len(kinds), 0)]
+        return cls(((kind, text) for _, kind, text in entries), kinds)
+
+    def __len__(self):
+        return len(self._spellings)
+
+    def id_of(self, kind: TokenKind, text: Optional[str] = None) -> int:
+        """ID of a token; for a varying kind, text missing from the vocabulary gives the kind's ID."""
+        kind_id = self.kind_ids[kind]
+        values = self._values[kind_id]
+        if values is None or text is None:
+            return kind_id
+        return values.get(text, kind_id)
+
+    def token(self, token_id: int) -> Entry:
+        """(kind, text) of an ID; the text of an out-of-vocabulary bucket is its placeholder."""
+        if token_id < len(self.kinds):
+            return self.kinds[token_id], self._spellings[token_id]
+        return self.entries[token_id - len(self.kinds)]
+
+    def is_unknown(self, token_id: int) -> bool:
+        return token_id < len(self.kinds) and self._values[token_id] is not None
+
+    def encode(self, text: str, trivia: bool = True) -> array:
+        """IDs of the tokens of text, EOF excluded; without trivia, decoding loses the spacing."""
+        ids = array("I")
+        append = ids.append
+        kind_ids = self.kind_ids
+        values_by_kind = self._values
+        for token in Cursor(text).iter_tokens(skip_trivia=not trivia):
+            kind = token.type
+            if kind is TokenKind.EOF:
+                break
+            kind_id = kind_ids[kind]
+            values = values_by_kind[kind_id]
+            if values is None:
+                append(kind_id)
+            else:
+                append(values.get(text[token.start_pos : token.end_pos], kind_id))
+        return ids
+
+    def decode(self, ids: Iterable[int]) -> str:
+        spellings = self._spellings
+        try:
+            return "".join([spellings[token_id] for token_id in ids])
+        except IndexError:
+            raise ValueError("token ID out of range") from None
+
+    def to_json(self) -> dict:
+        return {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "kinds": [kind.name for kind in self.kinds],
+            # [kind index, text]; the ID is the position after the kinds
+            "entries": [[self.kind_ids[kind], text] for kind, text in self.entries],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Vocabulary":
+        if data.get("format") != FORMAT or data.get("version") != FORMAT_VERSION:
+            raise ValueError("not a cjlang vocabulary, or an unsupported version")
+        try:
+            kinds = [TokenKind[name] for name in data["kinds"]]
+        except KeyError as e:
+            raise ValueError(f"unknown token kind in vocabulary: {e}") from None
+        return cls(((kinds[kind], text) for kind, text in data["entries"]), kinds)
+
+    def save(self, path: str):
+        """Write compact JSON, gzip-compressed when path ends with .gz."""
+        data = json.dumps(self.to_json(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if path.endswith(".gz"):
+            data = gzip.compress(data, mtime=0)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path: str) -> "Vocabulary":
+        with open(path, "rb") as f:
+            data = f.read()
+        if path.endswith(".gz"):
+            data = gzip.decompress(data)
+        return cls.from_json(json.loads(data.decode("utf-8")))
+
+
+def build_vocabulary(
+    paths: Sequence[str],
+    max_size: Optional[int] = None,
+    min_count: int = 1,
+    jobs: int = 1,
+    trivia: bool = True,
+) -> Vocabulary:
+    return Vocabulary.from_counts(count_files(paths, jobs, trivia), max_size, min_count)
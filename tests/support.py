@@ -0,0 +1,37 @@
+"""Sources and temporary files shared by the test modules."""
+
+import os
+import tempfile
+import unittest
+from typing import Iterable, List, Optional
+
+
+def main_source(*statements: str) -> str:
+    """A small file in package demo whose main function holds the statements, one per line."""
+    body = "".join(f"    {statement}\n" for statement in statements)
+    return f"package demo\n\nfunc main(): Unit {{\n{body}}}\n"
+
+
+SOURCE = main_source("let value = 1")
+
+
+def temporary_directory(test: unittest.TestCase) -> str:
+    """A directory removed again once the test is done."""
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    return directory.name
+
+
+def write_source(directory: str, name: str, text: str, mtime_ns: Optional[int] = None) -> str:
+    """Write text to directory/name as UTF-8, optionally setting its mtime, and return the path."""
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def write_sources(directory: str, texts: Iterable[str]) -> List[str]:
+    """Write each text to directory/file<i>.cj and return the paths in order."""
+    return [write_source(directory, f"file{i}.cj", text) for i, text in enumerate(texts)]
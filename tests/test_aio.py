@@ -0,0 +1,102 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from cjlang.aio import AsyncDriver, aparse_file, aparse_files, atokenize_file, atokenize_files
+from support import SOURCE, temporary_directory, write_sources
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool recording how many calls were submitted and how many ran."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+        self.started = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+
+        def run():
+            with self.lock:
+                self.started += 1
+            self.gate.wait(5)
+            return fn(*args, **kwargs)
+
+        return super().submit(run)
+
+
+class TestAsyncDriver(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.paths = write_sources(
+            self.directory, [SOURCE if i != 3 else "let a = 0b12\n" for i in range(10)]
+        )
+
+    async def test_single_file(self):
+        tokens = await atokenize_file(self.paths[0], details=True)
+        self.assertEqual(tokens.details[0]["kind"], "PACKAGE")
+        tree = await aparse_file(self.paths[0])
+        self.assertEqual((tree.error, tree.diagnostics), (None, []))
+        missing = await aparse_file(os.path.join(self.directory, "missing.cj"))
+        self.assertIsNotNone(missing.error)
+
+    async def test_files(self):
+        results = [result async for result in aparse_files(self.paths, concurrency=3)]
+        self.assertEqual(sorted(result.path for result in results), sorted(self.paths))
+        self.assertEqual([result.path for result in results if result.has_errors()], [self.paths[3]])
+        tokens = [result async for result in atokenize_files(self.paths[:2])]
+        self.assertTrue(all(result.tokens > 0 for result in tokens))
+
+    async def test_process_pool(self):
+        async with AsyncDriver(ProcessPoolExecutor(2), concurrency=4) as driver:
+            results = [result async for result in driver.parse_files(self.paths)]
+        self.assertEqual(len(results), len(self.paths))
+
+    async def test_backpressure_and_early_exit(self):
+        executor = CountingExecutor(max_workers=2)
+        async with AsyncDriver(executor, concurrency=2) as driver:
+            files = driver.parse_files(self.paths)
+            await files.__anext__()
+            self.assertLessEqual(executor.submitted, 3)
+            await files.aclose()
+        self.assertLessEqual(executor.started, 3)
+
+    async def test_cancellation(self):
+        executor = CountingExecutor(max_workers=1)
+        executor.gate.clear()
+        driver = AsyncDriver(executor, concurrency=2)
+
+        async def consume():
+            return [result async for result in driver.parse_files(self.paths)]
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        executor.gate.set()
+        executor.shutdown()
+        # The one call that had started finished; the queued one was cancelled
+        self.assertEqual((executor.submitted, executor.started), (2, 1))
+
+    async def test_shared_concurrency(self):
+        executor = CountingExecutor(max_workers=4)
+        executor.gate.clear()
+        driver = AsyncDriver(executor, concurrency=2)
+        calls = [asyncio.ensure_future(driver.parse_file(path)) for path in self.paths[:4]]
+        await asyncio.sleep(0.05)
+        self.assertEqual(executor.submitted, 2)
+        executor.gate.set()
+        await asyncio.gather(*calls)
+        self.assertEqual(executor.submitted, 4)
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
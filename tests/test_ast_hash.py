@@ -0,0 +1,78 @@
+import unittest
+
+from cjlang.ast.node import Node, NodeKind, changed_children
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+
+SOURCE = """package demo
+import std.collection.*
+
+func first(value: Int64): Int64 {
+    return value + 1
+}
+
+func second(): Unit {
+}
+
+class Box {
+    var size: Int64 = 0
+}
+"""
+
+
+def parse(text):
+    parser = CangjieParser(Cursor(text))
+    return parser.parse(), parser.tokens
+
+
+class TestStructuralHash(unittest.TestCase):
+    def test_equal_trees(self):
+        tree, tokens = parse(SOURCE)
+        # Indentation and comments move offsets, not structure
+        other, other_tokens = parse(SOURCE.replace("    ", "  ").replace("{\n", "{ /* open */\n"))
+        self.assertTrue(tree.same_structure(tokens, other, other_tokens))
+        self.assertEqual(len(tree.structural_hash(tokens)), 16)
+        self.assertIs(tree.structural_hash(tokens), tree.structural_hash(tokens))
+
+    def test_token_text(self):
+        tree, tokens = parse(SOURCE)
+        for old, new in (("value + 1", "value + 2"), ("second", "third"), ("size", "length")):
+            other, other_tokens = parse(SOURCE.replace(old, new))
+            self.assertFalse(tree.same_structure(tokens, other, other_tokens), new)
+
+    def test_kind_and_children(self):
+        tokens = Cursor("a b").tokenize()
+        leaf = Node(NodeKind.Preamble, 0, 3)
+        self.assertNotEqual(
+            leaf.structural_hash(tokens), Node(NodeKind.PackageHeader, 0, 3).structural_hash(tokens)
+        )
+        parent = Node(NodeKind.Preamble, 0, 3)
+        parent.add_child(Node(NodeKind.PackageHeader, 1, 2))
+        self.assertNotEqual(parent.structural_hash(tokens), leaf.structural_hash(tokens))
+
+    def test_changed_children(self):
+        tree, tokens = parse(SOURCE)
+        self.assertEqual(changed_children(tree, tokens, tree, tokens), ([], []))
+
+        text = SOURCE.replace("value + 1", "value - 1") + "\nfunc third(): Unit {\n}\n"
+        other, other_tokens = parse(text)
+        removed, added = changed_children(tree, tokens, other, other_tokens)
+        self.assertEqual([node.kind for node in removed], [NodeKind.FunctionDefinition])
+        self.assertIs(removed[0], tree.children[1])
+        self.assertEqual([node.kind for node in added], [NodeKind.FunctionDefinition] * 2)
+        self.assertEqual(tokens[removed[0].token_start + 1].value, "first")
+        self.assertEqual(other_tokens[added[1].token_start + 1].value, "third")
+
+    def test_reordered_children(self):
+        tree, tokens = parse(SOURCE)
+        first = SOURCE.index("func first")
+        second = SOURCE.index("func second")
+        box = SOURCE.index("class Box")
+        swapped = SOURCE[:first] + SOURCE[second:box] + SOURCE[first:second] + SOURCE[box:]
+        other, other_tokens = parse(swapped)
+        self.assertEqual(changed_children(tree, tokens, other, other_tokens), ([], []))
+        self.assertFalse(tree.same_structure(tokens, other, other_tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
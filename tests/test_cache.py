@@ -0,0 +1,129 @@
+import os
+import threading
+import unittest
+
+from cjlang.cache import NODE_BYTES, TOKEN_BYTES, ParseCache, default_cache
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+from cjlang.parser.parser import CangjieParser
+from support import main_source, temporary_directory, write_source
+
+SOURCE = main_source("let value = 0b12")
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = self.write("main.cj", SOURCE)
+
+    def write(self, name: str, text: str, mtime_ns: int = 1_000_000_000) -> str:
+        return write_source(self.directory, name, text, mtime_ns)
+
+    def test_file_hits(self):
+        cache = ParseCache()
+        entry = cache.parse_file(self.path)
+        self.assertIs(cache.parse_file(self.path), entry)
+        self.assertIs(cache.parse_file(os.path.relpath(self.path)), entry)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 1, 1))
+
+        parser = CangjieParser(Cursor(SOURCE, self.path))
+        tree = parser.parse()
+        self.assertEqual([node.kind for _, node in entry.tree], [node.kind for _, node in tree])
+        self.assertEqual(entry.tokens, parser.tokens)
+        self.assertEqual(len(entry.diagnostics), 1)
+        self.assertEqual(entry.diagnostics[0]["file"], os.path.abspath(self.path))
+
+    def test_modes(self):
+        cache = ParseCache()
+        tokens = cache.tokenize_file(self.path)
+        parsed = cache.parse_file(self.path)
+        self.assertIsNone(tokens.tree)
+        self.assertIn(TokenKind.WS, [token.type for token in tokens.tokens])
+        self.assertNotIn(TokenKind.WS, [token.type for token in parsed.tokens])
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_changed_file(self):
+        cache = ParseCache()
+        first = cache.parse_file(self.path)
+        self.write("main.cj", SOURCE, mtime_ns=2_000_000_000)
+        second = cache.parse_file(self.path)
+        self.assertIsNot(second, first)
+        # The entry for the old contents is dropped, not left to age out
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.stats()["size"], second.memory)
+        cache.invalidate(self.path)
+        self.assertEqual(cache.stats()["entries"], 0)
+        with self.assertRaises(OSError):
+            cache.parse_file(os.path.join(self.directory, "missing.cj"))
+
+    def test_refresh(self):
+        cache = ParseCache()
+        cache.parse_file(self.path)
+        other = self.write("other.cj", "let a = 1\n")
+        cache.tokenize_file(other)
+        cache.parse_file(other)
+        self.assertEqual(cache.refresh(), [])
+        self.write("main.cj", SOURCE + "let b = 1\n", mtime_ns=2_000_000_000)
+        os.remove(other)
+        self.assertEqual(sorted(cache.refresh()), sorted([os.path.abspath(self.path), other]))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["analyses"]), (1, 4))
+        self.assertEqual(len(cache.parse_file(self.path).diagnostics), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_texts(self):
+        cache = ParseCache()
+        entry = cache.parse_text(SOURCE, "a.cj")
+        self.assertIs(cache.parse_text(SOURCE, "a.cj"), entry)
+        self.assertIsNot(cache.parse_text(SOURCE, "b.cj"), entry)
+        self.assertIsNot(cache.parse_text(SOURCE + "\n", "a.cj"), entry)
+        self.assertIsNot(cache.tokenize_text(SOURCE, "a.cj"), entry)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        broken = cache.tokenize_text("let a = 1 $")
+        self.assertIn("Unexpected character", broken.error)
+        self.assertIs(cache.tokenize_text("let a = 1 $"), broken)
+
+    def test_budget(self):
+        entry = ParseCache().parse_text(SOURCE)
+        nodes = sum(1 for _ in entry.tree)
+        self.assertGreaterEqual(entry.memory, len(entry.tokens) * TOKEN_BYTES + nodes * NODE_BYTES)
+
+        cache = ParseCache(budget_bytes=entry.memory * 2)
+        paths = [self.write(f"{n}.cj", SOURCE) for n in range(3)]
+        for path in paths:
+            cache.parse_file(path)
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (2, 1))
+        self.assertLessEqual(stats["size"], stats["budget"])
+        # The first file was least recently used
+        cache.parse_file(paths[1])
+        cache.parse_file(paths[0])
+        self.assertEqual(cache.stats()["evictions"], 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_threads(self):
+        cache = ParseCache()
+        paths = [self.write(f"{n}.cj", SOURCE * (n + 1)) for n in range(8)]
+        results = [None] * 8
+
+        def parse(index: int):
+            results[index] = [cache.parse_file(path) for path in paths]
+
+        threads = [threading.Thread(target=parse, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = [len(entry.tokens) for entry in results[0]]
+        for entries in results:
+            self.assertEqual([len(entry.tokens) for entry in entries], expected)
+        self.assertEqual(cache.stats()["entries"], len(paths))
+
+    def test_default_cache(self):
+        self.assertIs(default_cache(), default_cache())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from cjlang import __version__
+from cjlang.cli import expand_inputs, main
+from support import SOURCE as GOOD
+from support import temporary_directory, write_source
+BAD = "let a = 0b12\n"
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = root = temporary_directory(self)
+        os.makedirs(os.path.join(root, "sub"))
+        self.good = write_source(root, "good.cj", GOOD)
+        self.bad = write_source(root, os.path.join("sub", "bad.cj"), BAD)
+        write_source(root, "notes.txt", "not a source file")
+
+    def run_main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            status = main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_expand_inputs(self):
+        root = self.directory
+        self.assertEqual(expand_inputs([root]), [self.good, self.bad])
+        self.assertEqual(expand_inputs([os.path.join(root, "**", "*.cj")]), [self.good, self.bad])
+        self.assertEqual(expand_inputs([self.bad, root]), [self.bad, self.good])
+        self.assertEqual(expand_inputs([os.path.join(root, "*.txt.cj")]), [])
+
+    def test_check(self):
+        status, out, _ = self.run_main("check", self.good)
+        self.assertEqual((status, out), (0, ""))
+        status, out, _ = self.run_main("check", self.directory)
+        self.assertEqual(status, 1)
+        self.assertIn(f"{self.bad}:1:11: error: illegal digit", out)
+
+    def test_tokenize(self):
+        status, out, _ = self.run_main("tokenize", self.good)
+        self.assertEqual(status, 0)
+        self.assertEqual(out.splitlines()[0], f"{self.good}:1:0\tPACKAGE\tpackage")
+
+    def test_parse_json(self):
+        status, out, _ = self.run_main("parse", "--format", "json", self.good, self.bad)
+        self.assertEqual(status, 1)
+        good, bad = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(good["file"], self.good)
+        self.assertEqual(good["nodes"][0]["kind"], "TranslationUnit")
+        self.assertEqual(bad["diagnostics"][0]["category"], "Lexical Issue")
+
+    def test_check_jsonl(self):
+        missing = os.path.join(self.directory, "missing.cj")
+        status, out, _ = self.run_main("check", "--format", "jsonl", self.good, self.bad, missing)
+        self.assertEqual(status, 1)
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual([record["file"] for record in records], [self.bad, missing])
+        self.assertEqual(
+            records[0],
+            {
+                "file": self.bad,
+                "line": 1,
+                "column": 11,
+                "severity": "error",
+                "category": "Lexical Issue",
+                "message": "illegal digit in binary literal '2'",
+            },
+        )
+        self.assertEqual(records[1]["category"], "Fatal Issue")
+
+    def test_check_sarif(self):
+        status, out, _ = self.run_main("parse", "--format", "sarif", "-j", "2", self.good, self.bad)
+        self.assertEqual(status, 1)
+        log = json.loads(out)
+        driver = log["runs"][0]["tool"]["driver"]
+        self.assertEqual((driver["name"], driver["version"]), ("cjlang", __version__))
+        [result] = log["runs"][0]["results"]
+        self.assertEqual(result["ruleId"], "Lexical Issue")
+        location = result["locations"][0]["physicalLocation"]
+        self.assertEqual(location["artifactLocation"]["uri"], self.bad)
+        self.assertEqual(location["region"], {"startLine": 1, "startColumn": 12})
+
+    def test_missing_inputs(self):
+        status, _, err = self.run_main("check", os.path.join(self.directory, "*.none"))
+        self.assertEqual(status, 2)
+        self.assertIn("no input files", err)
+        status, out, _ = self.run_main("check", os.path.join(self.directory, "missing.cj"))
+        self.assertEqual(status, 1)
+        self.assertIn("missing.cj: error:", out)
+
+    def test_stats_and_trace(self):
+        trace = os.path.join(self.directory, "trace.json")
+        status, _, err = self.run_main("check", "--stats", "--trace", trace, "-j", "2", self.good, self.bad)
+        self.assertEqual(status, 1)
+        self.assertIn("2 files", err)
+        with open(trace, encoding="utf-8") as f:
+            names = {event["name"] for event in json.load(f)["traceEvents"]}
+        self.assertTrue({"read", "lex", "parse", "diagnostics"} <= names)
+
+    def test_version_is_lazy(self):
+        code = (
+            "import sys; from cjlang.cli import main\n"
+            "try:\n    main(['--version'])\nexcept SystemExit:\n    pass\n"
+            "print('cjlang.lexer.cursor' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.split(), ["cjlang", __version__, "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
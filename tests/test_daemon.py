@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+import unittest
+
+from cjlang.daemon import Daemon
+from cjlang.jsonrpc import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, RpcError
+from cjlang.utils.lru import LRUCache
+from support import SOURCE, temporary_directory, write_source
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_order(self):
+        evicted = []
+        cache = LRUCache(10, sizeof=len, on_evict=lambda key, value: evicted.append(key))
+        cache.put("a", "xxxx")
+        cache.put("b", "xxxx")
+        self.assertEqual(cache.get("a"), "xxxx")
+        cache.put("c", "xxxx")
+        self.assertEqual(evicted, ["b"])
+        self.assertEqual(list(cache.keys()), ["a", "c"])
+        self.assertEqual(cache.size, 8)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_replace_and_oversized(self):
+        cache = LRUCache(10, sizeof=len)
+        cache.put("a", "xxxx")
+        cache.put("a", "xx")
+        self.assertEqual(cache.size, 2)
+        self.assertFalse(cache.put("b", "x" * 11))
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.pop("a"), "xx")
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = self.write("main.cj", SOURCE)
+
+    def write(self, name: str, text: str) -> str:
+        return write_source(self.directory, name, text)
+
+    def serve(self, *requests):
+        reader = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+        writer = io.StringIO()
+        Daemon().serve_stream(reader, writer)
+        return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+    def test_requests(self):
+        check, tokenize, parse, stats = self.serve(
+            {"jsonrpc": "2.0", "id": 1, "method": "check", "params": {"paths": [self.path]}},
+            {"jsonrpc": "2.0", "id": 2, "method": "tokenize", "params": {"path": self.path}},
+            {"jsonrpc": "2.0", "id": 3, "method": "parse", "params": {"path": self.path}},
+            {"jsonrpc": "2.0", "id": 4, "method": "stats"},
+        )
+        self.assertEqual(check["result"], [{"file": self.path, "error": None, "diagnostics": []}])
+        self.assertEqual(tokenize["result"]["tokens"][0]["kind"], "PACKAGE")
+        self.assertEqual(parse["result"]["nodes"][0]["kind"], "TranslationUnit")
+        self.assertEqual(stats["id"], 4)
+        self.assertEqual(stats["result"]["analyses"], 1)
+        self.assertEqual(stats["result"]["hits"], 2)
+
+    def test_changed_file(self):
+        daemon = Daemon()
+        daemon.parse({"path": self.path})
+        daemon.parse({"path": self.path})
+        self.assertEqual(daemon.cache.refresh(), [])
+        self.write("main.cj", SOURCE + "let b = 0b12\n")
+        self.assertEqual(daemon.cache.refresh(), [os.path.abspath(self.path)])
+        [result] = daemon.check({"paths": [self.path]})
+        self.assertEqual(result["diagnostics"][0]["category"], "Lexical Issue")
+        self.assertEqual(daemon.stats({})["analyses"], 2)
+
+    def test_unreadable(self):
+        path = self.write("bad.cj", "")
+        with open(path, "wb") as f:
+            f.write(b"\xff\xfe")
+        [result] = Daemon().check({"paths": [path]})
+        self.assertIsNotNone(result["error"])
+        with self.assertRaises(RpcError):
+            Daemon().parse({"path": path})
+
+    def test_errors(self):
+        replies = self.serve(
+            {"jsonrpc": "2.0", "id": 1, "method": "format"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tokenize", "params": {}},
+            {"jsonrpc": "2.0", "id": 3, "method": "parse", "params": {"path": "missing.cj"}},
+            {"jsonrpc": "2.0", "method": "stats"},
+        )
+        self.assertEqual(
+            [reply["error"]["code"] for reply in replies],
+            [METHOD_NOT_FOUND, INVALID_PARAMS, INVALID_PARAMS],
+        )
+        writer = io.StringIO()
+        Daemon().serve_stream(io.StringIO("{not json\n"), writer)
+        self.assertEqual(json.loads(writer.getvalue())["error"]["code"], PARSE_ERROR)
+
+    def test_shutdown(self):
+        replies = self.serve(
+            {"jsonrpc": "2.0", "id": 1, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 2, "method": "stats"},
+        )
+        self.assertEqual(replies, [{"jsonrpc": "2.0", "id": 1, "result": None}])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+    def test_unix_socket(self):
+        socket_path = os.path.join(self.directory, "daemon.sock")
+        daemon = Daemon()
+        server = threading.Thread(target=daemon.serve_unix, args=(socket_path,))
+        server.start()
+        deadline = time.monotonic() + 5
+        while not os.path.exists(socket_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(socket_path)
+            stream = client.makefile("rw", encoding="utf-8")
+            for request_id, method in ((1, "check"), (2, "shutdown")):
+                request = {"jsonrpc": "2.0", "id": request_id, "method": method}
+                request["params"] = {"paths": [self.path]}
+                stream.write(json.dumps(request) + "\n")
+                stream.flush()
+                self.assertEqual(json.loads(stream.readline())["id"], request_id)
+        server.join(5)
+        self.assertFalse(server.is_alive())
+        self.assertFalse(os.path.exists(socket_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
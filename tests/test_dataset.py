@@ -0,0 +1,87 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stderr
+
+from cjlang.cli import main
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+from support import main_source, temporary_directory, write_sources
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from cjlang.dataset import KINDS, NO_SYMBOL, load_shards, read_manifest, token_arrays, write_shards
+
+SOURCE = main_source("let value = 1 // comment", "println(value)")
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class TestTokenArrays(unittest.TestCase):
+    def test_matches_tokens(self):
+        tokens = [token for token in Cursor(SOURCE).iter_tokens(skip_trivia=True)][:-1]
+        arrays = token_arrays(SOURCE)
+        self.assertEqual(len(arrays), len(tokens))
+        self.assertEqual([KINDS[kind] for kind in arrays.kinds], [token.type for token in tokens])
+        self.assertEqual(arrays.starts.tolist(), [token.start_pos for token in tokens])
+        self.assertEqual(arrays.ends.tolist(), [token.end_pos for token in tokens])
+        names = [
+            SOURCE[start:end]
+            for start, end, symbol in zip(arrays.starts, arrays.ends, arrays.symbols)
+            if symbol != NO_SYMBOL
+        ]
+        self.assertEqual(names, ["demo", "value", "println", "value"])
+        self.assertEqual(arrays.symbols[arrays.kinds == KINDS.index(TokenKind.IDENT)].tolist(), [0, 1, 2, 1])
+
+    def test_trivia(self):
+        arrays = token_arrays(SOURCE, trivia=True)
+        self.assertIn(KINDS.index(TokenKind.LINE_COMMENT), arrays.kinds.tolist())
+        self.assertEqual(len(token_arrays("")), 0)
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.paths = write_sources(
+            self.directory, [SOURCE, "let x = 1\n", "let a = #\n", SOURCE.replace("value", "仓颉")]
+        )
+        self.output = os.path.join(self.directory, "out")
+
+    def check_round_trip(self, compressed: bool, jobs: int):
+        manifest = write_shards(self.paths, self.output, files_per_shard=2, jobs=jobs, compressed=compressed)
+        self.assertEqual(read_manifest(self.output), manifest)
+        self.assertEqual([shard["files"] for shard in manifest["shards"]], [2, 1])
+        self.assertEqual(manifest["shards"][1]["errors"][0]["path"], self.paths[2])
+        shards = list(load_shards(self.output))
+        self.assertEqual(shards[1].paths, [self.paths[3]])
+        arrays = shards[1].tokens(0)
+        expected = token_arrays(SOURCE.replace("value", "仓颉"))
+        self.assertEqual(arrays.kinds.tolist(), expected.kinds.tolist())
+        self.assertEqual(arrays.starts.tolist(), expected.starts.tolist())
+        self.assertEqual([shards[1].name(symbol) for symbol in arrays.symbols if symbol != NO_SYMBOL][1], "仓颉")
+        self.assertEqual(len(shards[0].tokens(1)), len(token_arrays("let x = 1\n")))
+        return shards
+
+    def test_npy_memory_mapped(self):
+        shards = self.check_round_trip(compressed=False, jobs=2)
+        self.assertIsInstance(shards[0].arrays["kinds"], numpy.memmap)
+
+    def test_npz(self):
+        self.check_round_trip(compressed=True, jobs=1)
+        self.assertTrue(os.path.exists(os.path.join(self.output, "shard-00000.npz")))
+
+    def test_cli(self):
+        err = io.StringIO()
+        with redirect_stderr(err):
+            status = main(["export", "--files-per-shard", "3", self.output, self.directory])
+        self.assertEqual(status, 1)
+        self.assertIn("3 files", err.getvalue())
+        self.assertEqual(sum(len(shard) for shard in load_shards(self.output)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import json
+import unittest
+
+from cjlang.diagnostics.diagnostic import Level, LineIndex, SourceLocation, get_line_column
+from cjlang.diagnostics.emitter import JsonLinesEmitter, SarifEmitter, SourceManager
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.lexer.cursor import Cursor
+
+
+class TestDiagnosticEngine(unittest.TestCase):
+    def test_counters(self):
+        engine = DiagnosticEngine()
+        self.assertFalse(engine.has_errors())
+        engine.warning("unused variable", SourceLocation("a.cj", 1, 0), "Semantic Issue")
+        self.assertFalse(engine.has_errors())
+        engine.error("Expected '}'", SourceLocation("a.cj", 2, 0), "Parse Issue")
+        engine.error("Expected '}'", SourceLocation("a.cj", 3, 0), "Parse Issue")
+
+        self.assertTrue(engine.has_errors())
+        self.assertEqual(engine.count(Level.ERROR), 2)
+        self.assertEqual(engine.count(Level.WARNING), 1)
+        self.assertEqual(engine.count(Level.NOTE), 0)
+        self.assertEqual(engine.count_category("Parse Issue"), 2)
+        self.assertEqual(engine.count_category("Lexical Issue"), 0)
+
+    def test_deduplicate(self):
+        engine = DiagnosticEngine()
+        for _ in range(1000):
+            engine.error("Expected '}'", SourceLocation("a.cj", 2, 0), "Parse Issue")
+        self.assertEqual(len(engine.diagnostics), 1)
+        self.assertEqual(engine.count(Level.ERROR), 1)
+        self.assertEqual(engine.suppressed, 999)
+
+        engine = DiagnosticEngine(deduplicate=False)
+        for _ in range(10):
+            engine.error("Expected '}'", SourceLocation("a.cj", 2, 0), "Parse Issue")
+        self.assertEqual(len(engine.diagnostics), 10)
+
+    def test_summary(self):
+        engine = DiagnosticEngine()
+        engine.note("see declaration", SourceLocation("a.cj", 1, 0), "Semantic Issue")
+        for line in range(1, 413):
+            engine.error("Expected '}'", SourceLocation("a.cj", line, 4), "Lexical Issue")
+        self.assertEqual(
+            engine.summary(),
+            [
+                (412, Level.ERROR, "Expected '}'", "Lexical Issue"),
+                (1, Level.NOTE, "see declaration", "Semantic Issue"),
+            ],
+        )
+
+        engine.clear()
+        self.assertEqual(engine.summary(), [])
+        self.assertFalse(engine.has_errors())
+
+    def test_lexer_reports(self):
+        cursor = Cursor("0b102 0b102")
+        cursor.tokenize()
+        self.assertEqual(cursor.diagnostics.count(Level.ERROR), 2)
+        self.assertEqual(cursor.diagnostics.count_category("Lexical Issue"), 2)
+        self.assertEqual(cursor.diagnostics.summary()[0][0], 2)
+
+
+class TestLineIndex(unittest.TestCase):
+    def test_matches_get_line_column(self):
+        text = "let a = 1\r\n\nfunc main() {\n  0b102\n}"
+        index = LineIndex(text)
+        for pos in range(len(text) + 1):
+            self.assertEqual(index.line_column(pos), get_line_column(text, pos))
+        self.assertEqual(index.line_text(1), "let a = 1")
+        self.assertEqual(index.line_text(4), "  0b102")
+        self.assertEqual(index.line_text(5), "}")
+        self.assertEqual(index.line_text(6), "")
+
+
+class TestEmitters(unittest.TestCase):
+    def make_engine(self, *consumers):
+        engine = DiagnosticEngine()
+        for consumer in consumers:
+            engine.add_consumer(consumer)
+        return engine
+
+    def test_json_lines_streaming(self):
+        sources = SourceManager()
+        text = "let a = 0b102\nlet b = 0b1"
+        sources.add("a.cj", text)
+        stream = io.StringIO()
+        emitter = JsonLinesEmitter(stream, sources, buffer_size=2)
+        engine = self.make_engine(emitter)
+
+        Cursor(text, "a.cj", engine).tokenize()
+        self.assertEqual(stream.getvalue(), "")
+        emitter.finish()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            records,
+            [
+                {
+                    "file": "a.cj",
+                    "line": 1,
+                    "column": 12,
+                    "severity": "error",
+                    "category": "Lexical Issue",
+                    "message": "illegal digit in binary literal '2'",
+                    "snippet": "let a = 0b102",
+                }
+            ],
+        )
+
+        for line in range(3):
+            engine.warning("w", SourceLocation("a.cj", 2, line), "Semantic Issue")
+        # Two records fill the buffer and are flushed without waiting for finish()
+        self.assertEqual(len(stream.getvalue().splitlines()), 3)
+
+    def test_sarif(self):
+        sources = SourceManager()
+        sources.add("a.cj", "let a = 0b102")
+        stream = io.StringIO()
+        emitter = SarifEmitter(stream, sources, tool_version="0.0.1")
+        engine = self.make_engine(emitter)
+        engine.error("illegal digit", SourceLocation("a.cj", 1, 12), "Lexical Issue")
+        engine.warning("unused", SourceLocation("b.cj", 3, 0), "Semantic Issue")
+        emitter.finish()
+
+        log = json.loads(stream.getvalue())
+        self.assertEqual(log["version"], "2.1.0")
+        run = log["runs"][0]
+        self.assertEqual(
+            run["tool"]["driver"]["rules"],
+            [{"id": "Lexical Issue"}, {"id": "Semantic Issue"}],
+        )
+        first, second = run["results"]
+        self.assertEqual(first["level"], "error")
+        region = first["locations"][0]["physicalLocation"]["region"]
+        self.assertEqual(region, {"startLine": 1, "startColumn": 13, "snippet": {"text": "let a = 0b102"}})
+        self.assertEqual(second["ruleIndex"], 1)
+        self.assertNotIn("snippet", second["locations"][0]["physicalLocation"]["region"])
+
+
+if __name__ == "__main__":
+    unittest.main()
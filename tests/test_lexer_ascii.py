@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from cjlang.lexer.cursor import (
+    ASCII_CLASSES,
+    ASCII_ID_CONTINUE,
+    ASCII_ID_START,
+    ASCII_WHITESPACE,
+    Cursor,
+    is_id_continue,
+    is_id_start,
+    is_whitespace,
+)
+
+SOURCE = """package demo
+import std.collection.*
+
+// comment with 'quotes' and `ticks`
+public open class Box<T> <: Shape {
+    var size_1: Int64 = 0x1F + 0b1010i8 + 0o17u32 + 1_000
+    let ratio = .5 + 1.25e-3f64 + 3e2\t\x0b\x0c
+    let name = "hello \\"world\\"\\n" + b"raw" + b'x' + r'c' + rb + br
+    /* block */ func area(): Unit { size++ ; x ?? y && z ..= w |> v ~> u }\r
+}\r\n`raw` `class` _ __init main this_
+"""
+
+PIECES = list("abrxpefiu_019.-+*/%<>=&|!?@;,:()[]{} \t\n\r\x0b\x0c\"'`\\") + [
+    "0x",
+    "1.5",
+    "e3",
+    "i8",
+    "//",
+    "/*",
+    "*/",
+    "r'",
+    "b'",
+    'b"',
+    "func",
+    "open",
+    "class",
+]
+
+
+def lex(text, is_ascii):
+    """Tokens, or the exception, and the diagnostics of lexing text on one path."""
+    cursor = Cursor(text)
+    cursor.is_ascii = is_ascii
+    try:
+        result = [
+            (t.type, t.value, t.start_pos, t.end_pos, t.symbol, t.contextual)
+            for t in cursor.tokenize()
+        ]
+    except Exception as e:
+        result = (type(e), str(e))
+    diagnostics = [
+        (d.message, d.position.line, d.position.column) for d in cursor.diagnostics.diagnostics
+    ]
+    return result, diagnostics
+
+
+class TestAsciiFastPath(unittest.TestCase):
+    def test_classes(self):
+        self.assertEqual(len(ASCII_CLASSES), 128)
+        for code in range(128):
+            c = chr(code)
+            self.assertEqual(bool(ASCII_CLASSES[code] & ASCII_WHITESPACE), is_whitespace(c))
+            self.assertEqual(bool(ASCII_CLASSES[code] & ASCII_ID_START), is_id_start(c))
+            self.assertEqual(bool(ASCII_CLASSES[code] & ASCII_ID_CONTINUE), is_id_continue(c))
+
+    def test_selected(self):
+        self.assertTrue(Cursor(SOURCE).is_ascii)
+        self.assertTrue(Cursor("").is_ascii)
+        self.assertFalse(Cursor("let 名字 = 1").is_ascii)
+        self.assertTrue(Cursor(SOURCE).clone().is_ascii)
+
+    def test_matches_general_path(self):
+        for text in (SOURCE, "", "a", "_", " ", "\r", "r", "b", "r'", "b'x'"):
+            self.assertEqual(lex(text, True), lex(text, False), repr(text))
+
+    def test_random_texts(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 16)))
+            self.assertEqual(lex(text, True), lex(text, False), repr(text))
+
+    def test_skip_trivia(self):
+        fast = Cursor(SOURCE)
+        general = Cursor(SOURCE)
+        general.is_ascii = False
+        self.assertEqual(
+            [(t.type, t.start_pos) for t in fast.iter_tokens(skip_trivia=True)],
+            [(t.type, t.start_pos) for t in general.iter_tokens(skip_trivia=True)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import mmap
+import os
+import random
+import tempfile
+import unittest
+
+from cjlang.lexer.byte_cursor import ByteCursor, tokenize_bytes
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+
+SOURCE = """package demo
+import std.collection.*
+
+// 注释 with non-ASCII text
+public open class Box<T> <: Shape {
+    var size: Int64 = 0x1F + 0b1010i8 + 0o17u32 + 1_000
+    let ratio = .5 + 1.25e-3f64 + 3e2
+    let 名字 = "héllo \\"wörld\\"\\n" + b"raw" + b'x'
+    /* 块 */ func área(): Unit { size++ ; x ?? y && z ..= w |> v ~> u }
+}
+"""
+
+# Lexed by the Cursor fallback
+ODD = "let a = 0b12 + 1.5f + 0x1.8p3 + r'c' + `raw` + 1i7\n"
+
+PIECES = list("abrxpefiu_019.-+*/%<>=&|!?@;,:()[]{} \t\n\r\"'`\\") + [
+    "é",
+    "名",
+    "\u0085",
+    " ",
+    "٣",
+    "😀",
+    "0x",
+    "0b",
+    "1.5",
+    "e3",
+    "i8",
+    "f32",
+    "//",
+    "/*",
+    "*/",
+    "..",
+    "...",
+    "<:",
+    "->",
+    "=>",
+    "&&=",
+    "r'",
+    "b'",
+    "func",
+    "open",
+]
+
+
+def summary(tokens):
+    return [(t.type, t.value, t.start_pos, t.end_pos, t.symbol, t.contextual) for t in tokens]
+
+
+def lex(factory, text):
+    """Tokens, or the exception, and the diagnostics of lexing text."""
+    cursor = factory(text)
+    try:
+        result = summary(cursor.tokenize())
+    except Exception as e:
+        result = (type(e), str(e))
+    diagnostics = [
+        (d.message, d.position.line, d.position.column) for d in cursor.diagnostics.diagnostics
+    ]
+    return result, diagnostics
+
+
+def byte_cursor(text):
+    return ByteCursor(text.encode("utf-8"), code_points=True)
+
+
+class TestByteCursor(unittest.TestCase):
+    def test_matches_cursor(self):
+        for text in (SOURCE, ODD, "", "a", "1", "."):
+            self.assertEqual(lex(byte_cursor, text), lex(Cursor, text), text)
+
+    def test_byte_offsets(self):
+        data = SOURCE.encode("utf-8")
+        tokens = tokenize_bytes(data)
+        expected = Cursor(SOURCE).tokenize()
+        self.assertEqual([t.type for t in tokens], [t.type for t in expected])
+        cursor = ByteCursor(data)
+        for token, reference in zip(tokens[:-1], expected[:-1]):
+            self.assertEqual(
+                data[token.start_pos : token.end_pos].decode("utf-8"),
+                SOURCE[reference.start_pos : reference.end_pos],
+            )
+            self.assertEqual(cursor.code_point(token.start_pos), reference.start_pos)
+
+    def test_decodes_only_when_needed(self):
+        cursor = ByteCursor(SOURCE.encode("utf-8"))
+        cursor.tokenize()
+        self.assertIsNone(cursor._cursor)
+        cursor = ByteCursor(ODD.encode("utf-8"))
+        cursor.tokenize()
+        self.assertIsNotNone(cursor._cursor)
+
+    def test_buffers(self):
+        data = SOURCE.encode("utf-8")
+        expected = summary(tokenize_bytes(data))
+        self.assertEqual(summary(tokenize_bytes(bytearray(data))), expected)
+        self.assertEqual(summary(tokenize_bytes(memoryview(data))), expected)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "box.cj")
+            with open(path, "wb") as f:
+                f.write(data)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(summary(ByteCursor(mapped, path).tokenize()), expected)
+
+    def test_skip_trivia(self):
+        data = SOURCE.encode("utf-8")
+        tokens = list(ByteCursor(data, code_points=True).iter_tokens(skip_trivia=True))
+        self.assertEqual(summary(tokens), summary(Cursor(SOURCE).iter_tokens(skip_trivia=True)))
+        self.assertNotIn(TokenKind.WS, [token.type for token in tokens])
+
+    def test_symbols(self):
+        cursor = ByteCursor("size + size + `size` + 名字".encode("utf-8"))
+        symbols = [token.symbol for token in cursor.tokenize() if token.symbol is not None]
+        self.assertEqual(symbols, [0, 0, 0, 1])
+        self.assertEqual(cursor.symbols.total, 4)
+
+    def test_random_texts(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 16)))
+            self.assertEqual(lex(byte_cursor, text), lex(Cursor, text), repr(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from cjlang.lexer.checkpoints import Checkpoints, relex
+from cjlang.lexer.cursor import Cursor
+
+SOURCE = """package demo
+
+/* a block comment
+   over lines */
+func item(value: Int64): Int64 {
+    let text = "a string // not a comment"
+    let byte = b'y'
+    // a line comment
+    return value * 0x1F + 1.5e3 ..= 2
+}
+"""
+
+PIECES = list("abx_019.-+*/<>=&|!:(){} \t\n\"'`") + ["//", "/*", "*/", "r'", "..", "0x", "名"]
+
+
+def summary(tokens):
+    return [(t.type, t.value, t.start_pos, t.end_pos) for t in tokens]
+
+
+class TestCheckpoints(unittest.TestCase):
+    def test_from_tokens(self):
+        tokens = Cursor(SOURCE).tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every=4)
+        self.assertEqual(list(checkpoints.indices), list(range(0, len(tokens) - 1, 4)))
+        for offset, index in zip(checkpoints.offsets, checkpoints.indices):
+            self.assertEqual(tokens[index].start_pos, offset)
+        self.assertEqual(checkpoints.before(-1), (0, 0))
+        with self.assertRaises(ValueError):
+            Checkpoints(every=0)
+
+    def test_resume(self):
+        tokens = Cursor(SOURCE).tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every=3)
+        for offset in range(len(SOURCE) + 1):
+            cursor = Cursor(SOURCE)
+            index = checkpoints.resume(cursor, offset)
+            self.assertLessEqual(cursor.pos, offset)
+            self.assertEqual(summary(cursor.tokenize()), summary(tokens[index:]))
+
+    def test_relex_inside_comment(self):
+        cursor = Cursor(SOURCE)
+        tokens = cursor.tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every=2)
+        # Opening a block comment swallows the rest of the text
+        start = SOURCE.index("return")
+        text = SOURCE[:start] + "/*" + SOURCE[start:]
+        tokens, checkpoints = relex(Cursor(text), tokens, checkpoints, start, start, start + 2)
+        self.assertEqual(summary(tokens), summary(Cursor(text).tokenize()))
+
+    def test_relex_reuses_tail(self):
+        cursor = Cursor(SOURCE)
+        tokens = cursor.tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every=2)
+        tail = tokens[-3]
+        start = SOURCE.index("value:")
+        text = SOURCE[:start] + "count" + SOURCE[start + len("value") :]
+        new_tokens, _ = relex(
+            Cursor(text, symbols=cursor.symbols), tokens, checkpoints, start, start + 5, start + 5
+        )
+        self.assertIs(new_tokens[-3], tail)
+        self.assertEqual(summary(new_tokens), summary(Cursor(text).tokenize()))
+
+    def test_random_edits(self):
+        rng = random.Random(0)
+        text = SOURCE * 3
+        tokens = Cursor(text).tokenize()
+        checkpoints = Checkpoints.from_tokens(tokens, every=5)
+        edits = 0
+        while edits < 500:
+            start = rng.randint(0, len(text))
+            old_end = min(len(text), start + rng.choice([0, 1, 4]))
+            inserted = "".join(rng.choice(PIECES) for _ in range(rng.choice([0, 1, 3])))
+            new_text = text[:start] + inserted + text[old_end:]
+            try:
+                expected = Cursor(new_text).tokenize()
+            except Exception:
+                # The lexer raises on some characters; leave the text as it is
+                continue
+            tokens, checkpoints = relex(
+                Cursor(new_text), tokens, checkpoints, start, old_end, start + len(inserted)
+            )
+            self.assertEqual(summary(tokens), summary(expected), repr(new_text))
+            for offset, index in zip(checkpoints.offsets, checkpoints.indices):
+                self.assertEqual(expected[index].start_pos, offset)
+            text = new_text
+            edits += 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,5 +65,38 @@ class TestLexerNumber(unittest.TestCase):
         )
 
 
+    def test_prefixed_literal_ends(self):
+        for text, kind, end, next_kind in (
+            ("0x1F,", TokenKind.HEXADECIMAL_LITERAL, 4, TokenKind.COMMA),
+            ("0b10 +", TokenKind.BINARY_LITERAL, 4, TokenKind.WS),
+            ("0o17\n", TokenKind.OCTAL_LITERAL, 4, TokenKind.NL),
+            ("0x1F)", TokenKind.HEXADECIMAL_LITERAL, 4, TokenKind.RPAREN),
+        ):
+            cursor = Cursor(text)
+            expected = [Token(kind, text[:end], 0, end), Token(next_kind, None, end, end + 1)]
+            self.assertEqual(cursor.tokenize()[:2], expected, text)
+            self.assertEqual(cursor.diagnostics.diagnostics, [], text)
+
+    def test_prefixed_literal_separators_and_suffixes(self):
+        for text, kind in (
+            ("0o7_7", TokenKind.OCTAL_LITERAL),
+            ("0xF_F", TokenKind.HEXADECIMAL_LITERAL),
+            ("0b1_0i8", TokenKind.BINARY_LITERAL),
+            ("0xFFu8", TokenKind.HEXADECIMAL_LITERAL),
+        ):
+            cursor = Cursor(text)
+            self.assertEqual(cursor.tokenize()[0], Token(kind, text, 0, len(text)), text)
+            self.assertEqual(cursor.diagnostics.diagnostics, [], text)
+
+    def test_prefixed_literal_illegal_digit(self):
+        for text, message in (
+            ("0b12", "illegal digit in binary literal '2'"),
+            ("0o79", "illegal digit in octal literal '9'"),
+        ):
+            cursor = Cursor(text)
+            cursor.tokenize()
+            self.assertEqual([d.message for d in cursor.diagnostics.diagnostics], [message], text)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+from typing import List
+import unittest
+
+from cjlang.lexer.cursor import Cursor, Token
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.pipeline import (
+    TRIVIA_KINDS,
+    classify_keywords,
+    drop_trivia,
+    fold_newlines,
+    keep_trivia,
+    pipeline,
+    significant_tokens,
+)
+
+SOURCE = """let a: Int64 = 1 // one
+/* block */
+
+var b = a
+"""
+
+
+class TriviaFreeCursor(Cursor):
+    def whitespace(self) -> Token:
+        raise AssertionError("trivia token allocated")
+
+    def line_comment(self) -> Token:
+        raise AssertionError("trivia token allocated")
+
+    def delimited_comment(self) -> Token:
+        raise AssertionError("trivia token allocated")
+
+
+class TestLexerPipeline(unittest.TestCase):
+    def test_drop_trivia_matches_filter(self):
+        expected = [
+            token for token in Cursor(SOURCE).tokenize() if token.type not in TRIVIA_KINDS
+        ]
+        self.assertEqual(list(pipeline(Cursor(SOURCE), drop_trivia)), expected)
+
+    def test_drop_trivia_never_allocates_trivia(self):
+        tokens = list(pipeline(TriviaFreeCursor(SOURCE), drop_trivia))
+        self.assertEqual(tokens[-1].type, TokenKind.EOF)
+
+    def test_keep_trivia(self):
+        tokens = list(pipeline(Cursor(SOURCE), keep_trivia))
+        self.assertEqual(tokens[1], Token(TokenKind.IDENT, "a", 4, 5))
+        self.assertEqual(tokens[1].leading_trivia, [Token(TokenKind.WS, None, 3, 4)])
+        newline = tokens[6]
+        self.assertEqual(newline.type, TokenKind.NL)
+        self.assertEqual(
+            [token.type for token in newline.leading_trivia],
+            [TokenKind.WS, TokenKind.LINE_COMMENT],
+        )
+
+    def test_fold_newlines(self):
+        tokens = list(pipeline(Cursor(SOURCE), drop_trivia, fold_newlines))
+        kinds = [token.type for token in tokens]
+        self.assertEqual(kinds.count(TokenKind.NL), 2)
+        self.assertEqual(tokens[6], Token(TokenKind.NL, None, 23, 37))
+        self.assertEqual(tokens[7], Token(TokenKind.VAR, "var", 37, 40))
+
+    def test_classify_keywords(self):
+        tokens = list(pipeline(Cursor("let a: Int64 = this"), drop_trivia, classify_keywords))
+        self.assertEqual(
+            [token.type for token in tokens],
+            [
+                TokenKind.LET,
+                TokenKind.IDENT,
+                TokenKind.COLON,
+                TokenKind.INT64,
+                TokenKind.ASSIGN,
+                TokenKind.THIS,
+                TokenKind.EOF,
+            ],
+        )
+        self.assertEqual(tokens[0].value, "let")
+
+    def test_lazy(self):
+        cursor = Cursor(SOURCE)
+        tokens = pipeline(cursor, drop_trivia, fold_newlines, classify_keywords)
+        self.assertEqual(cursor.pos, 0)
+        self.assertEqual(next(tokens).type, TokenKind.LET)
+        self.assertEqual(cursor.pos, 3)
+
+    def test_significant_tokens(self):
+        tokens: List[Token] = significant_tokens(Cursor(SOURCE))
+        self.assertEqual(tokens[0].type, TokenKind.LET)
+        self.assertFalse(any(token.type in TRIVIA_KINDS for token in tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,12 +15,12 @@ class TestLexerSimple(unittest.TestCase):
         test_case = "let width1: Int32 = 32 // The newline character is treated as a terminator."
         tokens = self.get_tokens(test_case)
         taret_tokens = [
-            Token(TokenKind.IDENT, "let", 0, 3),
+            Token(TokenKind.LET, "let", 0, 3),
             Token(TokenKind.WS, None, 3, 4),
             Token(TokenKind.IDENT, "width1", 4, 10),
             Token(TokenKind.COLON, None, 10, 11),
             Token(TokenKind.WS, None, 11, 12),
-            Token(TokenKind.IDENT, "Int32", 12, 17),
+            Token(TokenKind.INT32, "Int32", 12, 17),
             Token(TokenKind.WS, None, 17, 18),
             Token(TokenKind.ASSIGN, None, 18, 19),
             Token(TokenKind.WS, None, 19, 20),
@@ -38,12 +38,12 @@ class TestLexerSimple(unittest.TestCase):
         test_case = "let 仓颉: Float64 = 1.1e3"
         tokens = self.get_tokens(test_case)
         taret_tokens = [
-            Token(TokenKind.IDENT, "let", 0, 3),
+            Token(TokenKind.LET, "let", 0, 3),
             Token(TokenKind.WS, None, 3, 4),
             Token(TokenKind.IDENT, "仓颉", 4, 6),
             Token(TokenKind.COLON, None, 6, 7),
             Token(TokenKind.WS, None, 7, 8),
-            Token(TokenKind.IDENT, "Float64", 8, 15),
+            Token(TokenKind.FLOAT64, "Float64", 8, 15),
             Token(TokenKind.WS, None, 15, 16),
             Token(TokenKind.ASSIGN, None, 16, 17),
             Token(TokenKind.WS, None, 17, 18),
@@ -59,14 +59,14 @@ class TestLexerSimple(unittest.TestCase):
         test_case = "var `a` = 5;"
         tokens = self.get_tokens(test_case)
         taret_tokens = [
-            Token(TokenKind.IDENT, "var", 0, 3),
+            Token(TokenKind.VAR, "var", 0, 3),
             Token(TokenKind.WS, None, 3, 4),
             Token(TokenKind.RAW_IDENT, "`a`", 4, 7),
             Token(TokenKind.WS, None, 7, 8),
             Token(TokenKind.ASSIGN, None, 8, 9),
             Token(TokenKind.WS, None, 9, 10),
             Token(TokenKind.DECIMAL_LITERAL, "5", 10, 11),
-            Token(TokenKind.COLON, None, 11, 12),
+            Token(TokenKind.SEMI, None, 11, 12),
             Token(TokenKind.EOF, None, None, None),
         ]
         self.assertEqual(
@@ -74,6 +74,43 @@ class TestLexerSimple(unittest.TestCase):
             taret_tokens,
         )
 
+    def test_keywords(self):
+        tokens = self.get_tokens("open class this_ is main")
+        self.assertEqual(
+            tokens,
+            [
+                Token(TokenKind.IDENT, "open", 0, 4),
+                Token(TokenKind.WS, None, 4, 5),
+                Token(TokenKind.CLASS, "class", 5, 10),
+                Token(TokenKind.WS, None, 10, 11),
+                Token(TokenKind.IDENT, "this_", 11, 16),
+                Token(TokenKind.WS, None, 16, 17),
+                Token(TokenKind.IS, "is", 17, 19),
+                Token(TokenKind.WS, None, 19, 20),
+                Token(TokenKind.MAIN, "main", 20, 24),
+                Token(TokenKind.EOF, None, None, None),
+            ],
+        )
+        self.assertIs(tokens[0].contextual, TokenKind.OPEN)
+        self.assertIsNone(tokens[4].contextual)
+        self.assertIsNone(tokens[2].contextual)
+
+    def test_raw_keyword(self):
+        tokens = self.get_tokens("`class`")
+        self.assertEqual(tokens[0], Token(TokenKind.RAW_IDENT, "`class`", 0, 7))
+
+    def test_empty_rune(self):
+        cursor = Cursor("r'' x")
+        tokens = cursor.tokenize()
+        self.assertEqual(tokens[0], Token(TokenKind.RUNE_LITERAL, "", 0, 3))
+        self.assertEqual(tokens[2], Token(TokenKind.IDENT, "x", 4, 5))
+        self.assertTrue(cursor.diagnostics.has_errors())
+
+    def test_colon_and_semicolon(self):
+        tokens = self.get_tokens("a: b;")
+        self.assertEqual(tokens[1], Token(TokenKind.COLON, None, 1, 2))
+        self.assertEqual(tokens[4], Token(TokenKind.SEMI, None, 4, 5))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+from cjlang.lexer.symbols import SymbolTable
+
+
+class TestSymbolTable(unittest.TestCase):
+    def test_intern(self):
+        table = SymbolTable()
+        a = table.intern("Int64")
+        b = table.intern("x")
+        self.assertEqual(table.intern("Int64"), a)
+        self.assertNotEqual(a, b)
+        self.assertEqual(table.name(b), "x")
+        self.assertEqual(table.lookup("x"), b)
+        self.assertIsNone(table.lookup("y"))
+        self.assertIn("x", table)
+        self.assertEqual(table.stats(), {"unique": 2, "total": 3, "unique_ratio": 2 / 3})
+
+    def test_lexer_interns_identifiers(self):
+        cursor = Cursor("let size = size + `size` + other")
+        tokens = [token for token in cursor.tokenize() if token.symbol is not None]
+        self.assertEqual(
+            [token.type for token in tokens],
+            [TokenKind.IDENT, TokenKind.IDENT, TokenKind.RAW_IDENT, TokenKind.IDENT],
+        )
+        self.assertEqual(tokens[0].symbol, tokens[1].symbol)
+        self.assertEqual(tokens[0].symbol, tokens[2].symbol)
+        self.assertNotEqual(tokens[0].symbol, tokens[3].symbol)
+        self.assertIs(tokens[0].value, tokens[1].value)
+        self.assertEqual(cursor.symbols.unique, 2)
+        self.assertEqual(cursor.symbols.total, 4)
+
+    def test_shared_session(self):
+        table = SymbolTable()
+        first = Cursor("alpha", symbols=table).tokenize()
+        second = Cursor("beta alpha", symbols=table).tokenize()
+        self.assertEqual(first[0].symbol, second[2].symbol)
+        self.assertEqual(len(table), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.viewport import LexedPrefix, lexed_prefix, tokenize_range
+
+BLOCK = """func item{n}(value: Int64): Int64 {{
+    /* a comment
+       with // and "quotes"
+    */
+    let text = "a string
+over two lines // still the string"
+    // a line comment /* not a block
+    return value * 0x1F + 1.5e3
+}}
+
+"""
+
+SOURCE = "package demo\n\n" + "".join(BLOCK.format(n=n) for n in range(40))
+
+
+def summary(tokens):
+    return [(t.type, t.value, t.start_pos, t.end_pos, t.symbol) for t in tokens]
+
+
+def restricted(text, start_line, end_line):
+    """Tokens of the full tokenization overlapping the lines."""
+    lines = text.split("\n")
+    start = sum(len(line) + 1 for line in lines[: start_line - 1])
+    end = min(len(text), sum(len(line) + 1 for line in lines[:end_line]))
+    tokens = Cursor(text).tokenize()
+    result = [t for t in tokens[:-1] if t.end_pos > start and t.start_pos < end]
+    if end >= len(text):
+        result.append(tokens[-1])
+    return result
+
+
+class TestTokenizeRange(unittest.TestCase):
+    def test_matches_full_tokenization(self):
+        lines = SOURCE.count("\n") + 1
+        rng = random.Random(0)
+        ranges = [(1, 1), (1, lines), (lines, lines), (4, 6), (6, 7)]
+        ranges += [sorted((rng.randint(1, lines), rng.randint(1, lines))) for _ in range(100)]
+        for start_line, end_line in ranges:
+            self.assertEqual(
+                summary(tokenize_range(SOURCE, start_line, end_line)),
+                summary(restricted(SOURCE, start_line, end_line)),
+                (start_line, end_line),
+            )
+
+    def test_starts_inside_comment_and_string(self):
+        tokens = tokenize_range(SOURCE, 5, 5)
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(tokens[0].type.name, "DELIMITED_COMMENT")
+        tokens = tokenize_range(SOURCE, 8, 8)
+        self.assertEqual(tokens[0].type.name, "LINE_STRING_LITERAL")
+
+    def test_lexes_only_up_to_range(self):
+        text = "let a = 1\n" * 10_000
+        prefix = lexed_prefix(text)
+        tokenize_range(text, 10, 12)
+        self.assertLess(prefix.frontier, len("let a = 1\n") * 13)
+        checkpoints = len(prefix.checkpoints)
+        # Going back resumes from a checkpoint without lexing further
+        self.assertEqual(summary(tokenize_range(text, 2, 3)), summary(restricted(text, 2, 3)))
+        self.assertLess(prefix.frontier, len("let a = 1\n") * 13)
+        self.assertEqual(len(prefix.checkpoints), checkpoints)
+        self.assertIs(lexed_prefix(text), prefix)
+
+    def test_checkpoints(self):
+        prefix = LexedPrefix(SOURCE, every=7)
+        tokens = Cursor(SOURCE).tokenize()
+        prefix.tokens(0, len(SOURCE))
+        self.assertEqual(list(prefix.checkpoints.indices), list(range(0, len(tokens) - 1, 7)))
+        for offset, index in zip(prefix.checkpoints.offsets, prefix.checkpoints.indices):
+            self.assertEqual(tokens[index].start_pos, offset)
+
+    def test_edges(self):
+        self.assertEqual(summary(tokenize_range("", 1, 1)), summary(Cursor("").tokenize()))
+        self.assertEqual(tokenize_range("a\n", 5, 6), [])
+        with self.assertRaises(ValueError):
+            tokenize_range("a\n", 0, 1)
+        with self.assertRaises(ValueError):
+            tokenize_range("a\n", 2, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
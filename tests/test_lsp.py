@@ -0,0 +1,337 @@
+import io
+import json
+import random
+import unittest
+
+from cjlang.diagnostics.diagnostic import LineIndex
+from cjlang.jsonrpc import read_framed_message, write_framed_message
+from cjlang.lexer.cursor import Cursor
+from cjlang.lsp.document import Document
+from cjlang.lsp import semantic
+from cjlang.lsp.server import LanguageServer
+from cjlang.parser.parser import CangjieParser
+from cjlang.utils.offsets import UTF8, UTF32, OffsetMap
+
+SOURCE = """package demo
+import std.io.*
+
+func first(a: Int64): Int64 {
+    let b = 0b101 + a // comment
+    return b
+}
+
+/* block
+   comment */
+public class Point {
+    var x: Int64 = 0
+}
+
+let 仓颉 = "text"
+func second() {
+    if (a < (b * 2)) {
+        first(0x1F)
+    }
+}
+"""
+
+SNIPPETS = ["a", "{", "}", "(", ")", "\n", "func ", "0b12", "/*", "*/", '"', "public ", "import a\n", "变量", "`", "@A\n"]
+
+
+def units(line_text, column):
+    return OffsetMap(line_text).to_units(column)
+
+
+def full_diagnostics(text):
+    cursor = Cursor(text)
+    CangjieParser(cursor).parse()
+    index = LineIndex(text)
+    return sorted(
+        (
+            d.position.line - 1,
+            units(index.line_text(d.position.line), d.position.column),
+            d.severity.value,
+            d.message,
+            d.category,
+        )
+        for d in cursor.diagnostics.diagnostics
+    )
+
+
+def document_diagnostics(document):
+    return sorted(
+        (line, character, severity.value, message, category)
+        for line, character, severity, message, category in document.diagnostics()
+    )
+
+
+class TestDocument(unittest.TestCase):
+    def test_segments(self):
+        document = Document(SOURCE)
+        self.assertEqual(document.text, SOURCE)
+        self.assertEqual(document.segment_lines(), [0, 3, 10, 14, 15])
+        self.assertEqual(document_diagnostics(document), full_diagnostics(SOURCE))
+
+    def test_edit_matches_full_analysis(self):
+        rng = random.Random(0)
+        for trial in range(40):
+            text = SOURCE
+            document = Document(text)
+            for _ in range(8):
+                lines = text.split("\n")
+                line = rng.randrange(len(lines))
+                column = rng.randrange(len(lines[line]) + 1)
+                end_line = min(len(lines) - 1, line + rng.randrange(2))
+                end_column = rng.randrange(len(lines[end_line]) + 1)
+                if (end_line, end_column) < (line, column):
+                    end_line, end_column = line, column
+                insert = rng.choice(SNIPPETS) if rng.random() < 0.8 else ""
+                index = LineIndex(text)
+                start = index.line_starts[line] + column
+                end = index.line_starts[end_line] + end_column
+                text = text[:start] + insert + text[end:]
+                try:
+                    expected = full_diagnostics(text)
+                except Exception:
+                    # The lexer gives up on the whole file; covered separately below
+                    break
+                document.apply_change(
+                    (line, units(lines[line], column)),
+                    (end_line, units(lines[end_line], end_column)),
+                    insert,
+                )
+                self.assertEqual(document.text, text)
+                self.assertEqual(document_diagnostics(document), expected, trial)
+
+    def test_edit_is_local(self):
+        document = Document(SOURCE)
+        segments = document.segments[:]
+        document.apply_change((11, 4), (11, 7), "let")
+        self.assertIs(document.segments[0], segments[0])
+        self.assertIs(document.segments[3], segments[3])
+
+    def test_lexer_failure_stays_local(self):
+        document = Document(SOURCE)
+        document.apply_change((16, 4), (16, 4), "#")
+        self.assertEqual(
+            [(line, message) for line, _, _, message, _ in document.diagnostics()],
+            [(16, "Unexpected character: #")],
+        )
+        document.apply_change((16, 4), (16, 5), "")
+        self.assertEqual(document.diagnostics(), [])
+
+    def test_lexer_failure_matches_reanalysis(self):
+        document = Document("func a() {\n  let x = 1\n}\n" * 3)
+        # Messages must not depend on where the re-lexed region starts
+        edits = [((7, 0), (7, 0), 'let s = "abc\n'), ((1, 6), (1, 7), "y"), ((4, 6), (4, 7), "z")]
+        for start, end, text in edits:
+            document.apply_change(start, end, text)
+            self.assertEqual(
+                document_diagnostics(document), document_diagnostics(Document(document.text))
+            )
+        self.assertEqual(
+            [message for _, _, _, message, _ in document.diagnostics()],
+            ["Unterminated string literal"],
+        )
+
+    def test_position_encodings(self):
+        text = "let s = \"😀\"\nlet 仓 = 0b2\n"
+        for encoding, emoji_end, binary in ((None, 11, 10), (UTF8, 13, 12), (UTF32, 10, 10)):
+            document = Document(text) if encoding is None else Document(text, encoding)
+            [(line, character, _, _, _)] = document.diagnostics()
+            self.assertEqual((line, character), (1, binary))
+            document.apply_change((0, 9), (0, emoji_end), "x")
+            self.assertEqual(document.text, "let s = \"x\"\nlet 仓 = 0b2\n")
+            # Past the end of the line clamps to it
+            document.apply_change((1, 99), (1, 99), "1")
+            self.assertEqual(document.text, "let s = \"x\"\nlet 仓 = 0b21\n")
+
+
+def decode(text, data):
+    """(line, text, token type, modifiers) of delta-encoded semantic tokens."""
+    lines = text.split("\n")
+    line = character = 0
+    result = []
+    for i in range(0, len(data), 5):
+        delta_line, delta_start, length, kind, modifiers = data[i : i + 5]
+        if delta_line:
+            line += delta_line
+            character = delta_start
+        else:
+            character += delta_start
+        units = lines[line].encode("utf-16-le")[2 * character : 2 * (character + length)]
+        result.append((line, units.decode("utf-16-le"), semantic.TOKEN_TYPES[kind], modifiers))
+    return result
+
+
+class TestSemanticTokens(unittest.TestCase):
+    def test_classes(self):
+        tokens = decode(SOURCE, semantic.join(Document(SOURCE).semantic_chunks()))
+        self.assertEqual(tokens[:3], [(0, "package", "keyword", 0), (0, "demo", "namespace", 0), (1, "import", "keyword", 0)])
+        self.assertIn((3, "first", "function", semantic.DECLARATION), tokens)
+        self.assertIn((3, "Int64", "type", semantic.DEFAULT_LIBRARY), tokens)
+        self.assertIn((4, "b", "variable", semantic.DECLARATION | semantic.READONLY), tokens)
+        self.assertIn((10, "public", "modifier", 0), tokens)
+        self.assertIn((10, "Point", "class", semantic.DECLARATION), tokens)
+        self.assertIn((14, "仓颉", "variable", semantic.DECLARATION | semantic.READONLY), tokens)
+        self.assertIn((14, '"text"', "string", 0), tokens)
+        self.assertIn((17, "first", "function", 0), tokens)
+        self.assertIn((17, "0x1F", "number", 0), tokens)
+
+    def test_multiline_token(self):
+        text = 'let a = 1\nlet s = "x\ny"\n'
+        self.assertEqual(
+            [token[:2] for token in decode(text, semantic.join(Document(text).semantic_chunks()))],
+            [(0, "let"), (0, "a"), (0, "="), (0, "1"), (1, "let"), (1, "s"), (1, "="), (1, '"x'), (2, 'y"')],
+        )
+
+    def test_edits_and_delta(self):
+        rng = random.Random(1)
+        document = Document(SOURCE)
+        text = SOURCE
+        for _ in range(40):
+            old = document.semantic_chunks()
+            lines = text.split("\n")
+            line = rng.randrange(len(lines))
+            column = rng.randrange(len(lines[line]) + 1)
+            insert = rng.choice(["a", "\n", "{", "}", "func f", "0x1", "let "])
+            offset = LineIndex(text).line_starts[line] + column
+            text = text[:offset] + insert + text[offset:]
+            position = (line, units(lines[line], column))
+            document.apply_change(position, position, insert)
+            new = semantic.join(document.semantic_chunks())
+            self.assertEqual(new, semantic.join(Document(text).semantic_chunks()))
+            edit = semantic.delta(old, document.semantic_chunks())
+            data = semantic.join(old)
+            data[edit["start"] : edit["start"] + edit["deleteCount"]] = edit["data"]
+            self.assertEqual(data, new)
+
+    def test_range(self):
+        document = Document(SOURCE)
+        tokens = decode(SOURCE, semantic.join(document.semantic_chunks(10, 12)))
+        self.assertEqual(tokens[0], (10, "public", "modifier", 0))
+        self.assertEqual({line for line, _, _, _ in tokens}, {10, 11})
+
+
+class TestLanguageServer(unittest.TestCase):
+    def exchange(self, *messages):
+        reader = io.BytesIO()
+        for message in messages:
+            write_framed_message(reader, message)
+        reader.seek(0)
+        writer = io.BytesIO()
+        status = LanguageServer(reader, writer, debounce=0).serve()
+        writer.seek(0)
+        replies = []
+        while True:
+            body = read_framed_message(writer)
+            if body is None:
+                return status, replies
+            replies.append(json.loads(body))
+
+    def test_session(self):
+        uri = "file:///demo.cj"
+        status, replies = self.exchange(
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}},
+            {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": uri, "languageId": "cangjie", "version": 1, "text": SOURCE}},
+            },
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": uri, "version": 2},
+                    "contentChanges": [
+                        {
+                            "range": {"start": {"line": 4, "character": 14}, "end": {"line": 4, "character": 17}},
+                            "text": "0b12",
+                        }
+                    ],
+                },
+            },
+            {"jsonrpc": "2.0", "method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        )
+        self.assertEqual(status, 0)
+        initialize, opened, changed, closed, shutdown = replies
+        self.assertEqual(initialize["result"]["capabilities"]["textDocumentSync"]["change"], 2)
+        self.assertEqual(opened["params"]["diagnostics"], [])
+        diagnostic = changed["params"]["diagnostics"][0]
+        self.assertEqual(diagnostic["range"]["start"]["line"], 4)
+        self.assertEqual(diagnostic["severity"], 1)
+        self.assertIn("binary literal", diagnostic["message"])
+        self.assertEqual(closed["params"], {"uri": uri, "diagnostics": []})
+        self.assertEqual(shutdown, {"jsonrpc": "2.0", "id": 2, "result": None})
+
+    def test_semantic_tokens(self):
+        uri = "file:///demo.cj"
+        document = {"uri": uri}
+        _, replies = self.exchange(
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": uri, "languageId": "cangjie", "version": 1, "text": SOURCE}},
+            },
+            {"jsonrpc": "2.0", "id": 2, "method": "textDocument/semanticTokens/full", "params": {"textDocument": document}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": uri, "version": 2},
+                    "contentChanges": [
+                        {"range": {"start": {"line": 11, "character": 8}, "end": {"line": 11, "character": 9}}, "text": "y"}
+                    ],
+                },
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "textDocument/semanticTokens/full/delta",
+                "params": {"textDocument": document, "previousResultId": "1"},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 4,
+                "method": "textDocument/semanticTokens/range",
+                "params": {"textDocument": document, "range": {"start": {"line": 0, "character": 0}, "end": {"line": 1, "character": 0}}},
+            },
+        )
+        initialize, _, full, _, delta, ranged = replies
+        self.assertEqual(initialize["result"]["capabilities"]["semanticTokensProvider"]["legend"], semantic.LEGEND)
+        self.assertEqual(full["result"]["resultId"], "1")
+        self.assertEqual(delta["result"]["resultId"], "2")
+        [edit] = delta["result"]["edits"]
+        data = full["result"]["data"]
+        self.assertLess(len(edit["data"]), len(data))
+        data[edit["start"] : edit["start"] + edit["deleteCount"]] = edit["data"]
+        self.assertIn((11, "y", "variable", semantic.DECLARATION), decode(SOURCE.replace("var x", "var y"), data))
+        self.assertEqual(ranged["result"]["data"][:10], data[:10])
+
+    def test_position_encoding(self):
+        capabilities = {"general": {"positionEncodings": ["utf-8", "utf-16"]}}
+        _, replies = self.exchange(
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": capabilities}},
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": "file:///a.cj", "version": 1, "text": "let 仓 = 0b2\n"}},
+            },
+        )
+        self.assertEqual(replies[0]["result"]["capabilities"]["positionEncoding"], "utf-8")
+        self.assertEqual(replies[1]["params"]["diagnostics"][0]["range"]["start"]["character"], 12)
+
+    def test_exit_without_shutdown(self):
+        status, replies = self.exchange({"jsonrpc": "2.0", "method": "exit"})
+        self.assertEqual((status, replies), (1, []))
+
+    def test_unknown_request(self):
+        _, replies = self.exchange({"jsonrpc": "2.0", "id": 7, "method": "textDocument/hover"})
+        self.assertEqual(replies[0]["error"]["code"], -32601)
+
+
+if __name__ == "__main__":
+    unittest.main()
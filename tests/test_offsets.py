@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from cjlang.utils.offsets import UTF8, UTF16, UTF32, OffsetMap, encoded_length
+
+
+class TestOffsetMap(unittest.TestCase):
+    def test_ascii(self):
+        offsets = OffsetMap("let a = 1\n")
+        self.assertTrue(offsets.is_ascii)
+        self.assertIsNone(offsets.utf16)
+        self.assertEqual(offsets.to_units(4, UTF8), 4)
+        self.assertEqual(offsets.from_units(99), 10)
+
+    def test_mixed(self):
+        text = "a仓😀b"
+        offsets = OffsetMap(text)
+        self.assertEqual([offsets.to_units(i) for i in range(5)], [0, 1, 2, 4, 5])
+        self.assertEqual([offsets.to_units(i, UTF8) for i in range(5)], [0, 1, 4, 8, 9])
+        self.assertEqual(offsets.length(UTF8), 9)
+        # A unit inside a character maps to the character
+        self.assertEqual(offsets.from_units(3), 2)
+        self.assertEqual(offsets.from_units(6, UTF8), 2)
+        self.assertEqual(offsets.convert(8, UTF8, UTF16), 4)
+        self.assertEqual(offsets.to_units(3, UTF32), 3)
+
+    def test_matches_encode(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            text = "".join(rng.choice("xx \n仓é😀") for _ in range(rng.randrange(300)))
+            offsets = OffsetMap(text, block=rng.choice([1, 7, 64]))
+            for encoding in (UTF8, UTF16, UTF32):
+                for i in range(len(text) + 1):
+                    units = encoded_length(text[:i], encoding)
+                    self.assertEqual(offsets.to_units(i, encoding), units)
+                    self.assertEqual(offsets.from_units(units, encoding), i)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            OffsetMap("仓").to_units(1, "utf-7")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from cjlang.ast.node import Node, NodeKind
+from cjlang.diagnostics.diagnostic import Level
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+
+SOURCE = """package demo.app
+
+import std.collection.*
+public import std.math.{abs, max}
+
+@Derive[Hashable]
+public open class Point <: Hashable {
+    var x: Int64 = 0
+    func size(): Int64 { x }
+}
+
+let origin = Point()
+
+func add(a: Int64, b: Int64): Int64
+{
+    return a + b
+}
+
+main() {
+    println(add(1, 2))
+}
+"""
+
+
+def parse(text: str):
+    parser = CangjieParser(Cursor(text))
+    return parser, parser.parse()
+
+
+class TestParser(unittest.TestCase):
+    def test_top_level(self):
+        parser, unit = parse(SOURCE)
+        self.assertFalse(parser.diagnostics.has_errors())
+        self.assertEqual(unit.kind, NodeKind.TranslationUnit)
+        self.assertEqual(
+            [child.kind for child in unit.children],
+            [
+                NodeKind.Preamble,
+                NodeKind.ClassDefinition,
+                NodeKind.VariableDeclaration,
+                NodeKind.FunctionDefinition,
+                NodeKind.MainDefinition,
+            ],
+        )
+        preamble = unit.children[0]
+        self.assertEqual(
+            [child.kind for child in preamble.children],
+            [NodeKind.PackageHeader, NodeKind.ImportList],
+        )
+        self.assertEqual(len(preamble.children[1].children), 2)
+
+        variable = unit.children[2]
+        texts = [token.value for token in parser.tokens[variable.token_start : variable.token_end]]
+        self.assertEqual(texts, ["let", "origin", None, "Point", None, None])
+
+    def test_errors(self):
+        parser, unit = parse("class A {\n  func f() {\n}\n")
+        self.assertEqual(parser.diagnostics.count(Level.ERROR), 1)
+        self.assertEqual(parser.diagnostics.diagnostics[0].message, "Expected '}'")
+
+        parser, unit = parse("1 + 2\nlet a = 1\n")
+        self.assertEqual(parser.diagnostics.count(Level.ERROR), 1)
+        self.assertEqual([child.kind for child in unit.children], [NodeKind.VariableDeclaration])
+
+    def test_walk(self):
+        parser, unit = parse(SOURCE)
+        nodes = [node for _, node in unit]
+        self.assertTrue(all(isinstance(node, Node) for node in nodes))
+        self.assertEqual(len(nodes), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
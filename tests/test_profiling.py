@@ -0,0 +1,109 @@
+import unittest
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+from cjlang.profiling import (
+    PRODUCTIONS,
+    SCANNERS,
+    TOKENS,
+    Profile,
+    ProfilingCursor,
+    ProfilingParser,
+    diff_reports,
+)
+
+SOURCE = """package demo
+import std.io.*
+
+func main(): Unit {
+    let value = 0x1F + 42 // answer
+    /* block */ print("text")
+}
+"""
+
+
+class TestProfiling(unittest.TestCase):
+    def test_tokens_match_plain_cursor(self):
+        profile = Profile()
+        tokens = ProfilingCursor(SOURCE, profile=profile).tokenize()
+        expected = Cursor(SOURCE).tokenize()
+        self.assertEqual(
+            [(t.type, t.value) for t in tokens], [(t.type, t.value) for t in expected]
+        )
+        report = profile.report()
+        self.assertEqual(sum(entry["calls"] for entry in report[TOKENS].values()), len(tokens))
+        self.assertEqual(sum(entry["chars"] for entry in report[TOKENS].values()), len(SOURCE))
+        self.assertEqual(report[TOKENS]["FUNC"]["calls"], 1)
+
+    def test_scanners(self):
+        profile = Profile()
+        ProfilingCursor(SOURCE, profile=profile).tokenize()
+        scanners = profile.report()[SCANNERS]
+        self.assertEqual(scanners["consume_number"]["calls"], 2)
+        self.assertEqual(scanners["consume_number"]["chars"], len("0x1F") + len("42"))
+        self.assertEqual(scanners["string"]["calls"], 1)
+        self.assertEqual(scanners["line_comment"]["chars"], len("// answer"))
+        self.assertEqual(scanners["delimited_comment"]["calls"], 1)
+
+    def test_productions(self):
+        profile = Profile()
+        parser = ProfilingParser(ProfilingCursor(SOURCE, profile=profile))
+        parser.parse()
+        productions = profile.report()[PRODUCTIONS]
+        self.assertEqual(productions["parse_translation_unit"]["calls"], 1)
+        self.assertEqual(productions["parse_translation_unit"]["chars"], len(parser.tokens) - 1)
+        self.assertEqual(productions["parse_top_level_object"]["calls"], 1)
+        self.assertEqual(productions["parse_import_list"]["calls"], 1)
+
+    def test_parse_records_trivia(self):
+        profile = Profile()
+        ProfilingParser(ProfilingCursor(SOURCE, profile=profile)).parse()
+        scanners = profile.report()[SCANNERS]
+        self.assertGreater(scanners["whitespace"]["calls"], 0)
+        self.assertEqual(scanners["line_comment"]["chars"], len("// answer"))
+        self.assertEqual(scanners["delimited_comment"]["chars"], len("/* block */"))
+
+    def test_parse_matches_plain_parser(self):
+        cursor = ProfilingCursor(SOURCE + "1 + 2\n")
+        parser = ProfilingParser(cursor)
+        self.assertIs(parser.profile, cursor.profile)
+        plain = CangjieParser(Cursor(SOURCE + "1 + 2\n"))
+        parser.parse()
+        plain.parse()
+        self.assertEqual(
+            [d.message for d in parser.diagnostics.diagnostics],
+            [d.message for d in plain.diagnostics.diagnostics],
+        )
+        self.assertTrue(parser.diagnostics.has_errors())
+
+    def test_plain_classes_uninstrumented(self):
+        self.assertIsNot(Cursor.identifier, ProfilingCursor.identifier)
+        self.assertIsNot(CangjieParser.skip_block, ProfilingParser.skip_block)
+        self.assertFalse(hasattr(Cursor(SOURCE), "profile"))
+
+    def test_format_report(self):
+        profile = Profile()
+        ProfilingCursor("let a = 1").tokenize()
+        self.assertEqual(profile.format_report(), "")
+        profile.record(TOKENS, "IDENT", 3, 2_000_000)
+        self.assertIn("IDENT", profile.format_report())
+        self.assertIn("2.000 ms", profile.format_report())
+
+    def test_diff_reports(self):
+        old, new = Profile(), Profile()
+        old.record(TOKENS, "IDENT", 3, 1000)
+        new.record(TOKENS, "IDENT", 3, 1050)
+        self.assertEqual(diff_reports(old.report(), new.report()), [])
+        new.record(TOKENS, "IDENT", 2, 1000)
+        new.record(SCANNERS, "string", 5, 10)
+        self.assertEqual(
+            diff_reports(old.report(), new.report()),
+            [
+                "tokens.IDENT: calls 1 -> 2, chars 3 -> 5, time 2.05x",
+                "scanners.string: calls 0 -> 1, chars 0 -> 5, time added",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import math
+import os
+import time
+from typing import Callable, List, Sequence
+import unittest
+
+from cjlang.diagnostics.diagnostic import LineIndex, Level, SourceLocation
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.lexer.cursor import Cursor
+from cjlang.parser.parser import CangjieParser
+
+# Wall-clock fits flake on loaded machines, so they only run when asked for:
+#   CJLANG_TIMING_TESTS=1 python -m pytest tests/test_scaling.py
+TIMING_TESTS = os.environ.get("CJLANG_TIMING_TESTS") == "1"
+
+# Sizes grow geometrically; an exponent near 1 is linear, near 2 quadratic.
+FACTOR = 2
+STEPS = 4
+MAX_EXPONENT = 1.35
+REPEAT = 3
+
+DECLARATION = """func item{n}(value: Int64): Int64 {{
+    let result = value * 0x1F + s[0..=5] // trailing comment
+    /* block */ return result
+}}
+"""
+
+
+def measure(function: Callable[[int], Callable[[], object]], size: int) -> float:
+    """Best wall time of the callable built by function(size); setup is not timed."""
+    run = function(size)
+    best = math.inf
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(function: Callable[[int], Callable[[], object]], base: int) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    sizes: List[int] = [base * FACTOR**step for step in range(STEPS)]
+    times: Sequence[float] = [measure(function, size) for size in sizes]
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum(
+        (x - mean_x) ** 2 for x in xs
+    )
+
+
+def tokenize(text: str) -> Callable[[], object]:
+    return lambda: Cursor(text).tokenize()
+
+
+@unittest.skipUnless(TIMING_TESTS, "set CJLANG_TIMING_TESTS=1 to run timing tests")
+class TestScaling(unittest.TestCase):
+    def assertNearLinear(self, function, base: int):
+        exponent = growth_exponent(function, base)
+        if exponent > MAX_EXPONENT:
+            # Timings are noisy on shared machines; confirm before failing
+            exponent = min(exponent, growth_exponent(function, base))
+        self.assertLessEqual(exponent, MAX_EXPONENT, f"growth exponent {exponent:.2f}")
+
+    def test_tokenize(self):
+        self.assertNearLinear(
+            lambda n: tokenize("".join(DECLARATION.format(n=i) for i in range(n))), 40
+        )
+
+    def test_tokenize_lexical_errors(self):
+        # Every line reports an error, so locating errors must not rescan the text
+        self.assertNearLinear(lambda n: tokenize("let a = 0b12\n" * n), 400)
+
+    def test_long_identifier(self):
+        self.assertNearLinear(lambda n: tokenize("a" * n), 20000)
+
+    def test_long_string(self):
+        self.assertNearLinear(lambda n: tokenize('"' + "ab\\n" * n + '"'), 8000)
+
+    def test_long_comment(self):
+        self.assertNearLinear(lambda n: tokenize("/*" + "x" * n + "*/"), 20000)
+
+    def test_parse(self):
+        def run(n: int):
+            text = "".join(DECLARATION.format(n=i) for i in range(n))
+            return lambda: CangjieParser(Cursor(text)).parse()
+
+        self.assertNearLinear(run, 40)
+
+    def test_parse_errors(self):
+        def run(n: int):
+            text = "1 + 2\n" * n
+            return lambda: CangjieParser(Cursor(text)).parse()
+
+        self.assertNearLinear(run, 300)
+
+    def test_diagnostic_reports(self):
+        def run(n: int):
+            def report():
+                engine = DiagnosticEngine()
+                for line in range(n):
+                    engine.error("Expected '}'", SourceLocation("a.cj", line, 0), "Parse Issue")
+                    engine.has_errors()
+                    engine.count(Level.ERROR)
+                engine.summary()
+
+            return report
+
+        self.assertNearLinear(run, 2000)
+
+    def test_line_index(self):
+        def run(n: int):
+            text = "let a = 1\n" * n
+            positions = range(0, len(text), 7)
+
+            def lookup():
+                index = LineIndex(text)
+                return [index.line_column(pos) for pos in positions]
+
+            return lookup
+
+        self.assertNearLinear(run, 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import cjlang.lexer.byte_cursor
+import cjlang.lexer.cursor
+from cjlang.diagnostics.diagnostic import Level, SourceLocation
+from cjlang.diagnostics.emitter import SARIF_LEVELS
+from cjlang.diagnostics.engine import DiagnosticEngine
+from cjlang.driver import PARSE, TOKENIZE, process_files
+from cjlang.keywords import CONTEXTUAL_KEYWORDS, KEYWORDS
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import CONTEXTUAL_KEYWORD_KINDS, KEYWORD_KINDS, TokenKind
+from cjlang.lexer.symbols import SymbolTable
+from cjlang.parser.parser import DEFINITION_KINDS, LINE_DECLARATION_KINDS
+from cjlang.profiling import ProfilingCursor
+from cjlang.utils.unicode_xid.tables import XID_Continue_table, XID_Start_table
+from support import temporary_directory, write_sources
+
+THREADS = 8
+
+SOURCE = """package demo{n}
+
+func item{n}(value: Int64): Int64 {{
+    let result = value * 0x1F + 0b12
+    return result
+}}
+
+class Box{n} {{
+    var size: Int64 = 0o79
+}}
+"""
+
+
+def records(engine: DiagnosticEngine):
+    return [
+        (d.severity, d.message, d.position.file_name, d.position.line, d.position.column)
+        for d in engine.diagnostics
+    ]
+
+
+def run_threads(target, count: int = THREADS):
+    """Start count threads on target(index) together and wait for all of them."""
+    barrier = threading.Barrier(count)
+
+    def run(index: int):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestSharedTables(unittest.TestCase):
+    def test_read_only(self):
+        for table in (
+            KEYWORD_KINDS,
+            CONTEXTUAL_KEYWORD_KINDS,
+            DEFINITION_KINDS,
+            LINE_DECLARATION_KINDS,
+            SARIF_LEVELS,
+        ):
+            with self.assertRaises(TypeError):
+                table["class"] = None
+        for table in (KEYWORDS, CONTEXTUAL_KEYWORDS, XID_Start_table, XID_Continue_table):
+            self.assertIsInstance(table, tuple)
+        self.assertIs(KEYWORD_KINDS["class"], TokenKind.CLASS)
+        # The lexers look identifiers up in the same read-only tables
+        for module in (cjlang.lexer.cursor, cjlang.lexer.byte_cursor):
+            self.assertIs(module.KEYWORD_KINDS, KEYWORD_KINDS)
+            self.assertIs(module.CONTEXTUAL_KEYWORD_KINDS, CONTEXTUAL_KEYWORD_KINDS)
+
+
+class TestDiagnosticEngineThreads(unittest.TestCase):
+    def test_concurrent_reports(self):
+        engine = DiagnosticEngine()
+
+        def report(index: int):
+            for line in range(500):
+                engine.error("shared", SourceLocation("a.cj", line, 0), "Parse Issue")
+                engine.warning(f"own {index}", SourceLocation("a.cj", line, 0), "Parse Issue")
+
+        run_threads(report)
+        self.assertEqual(len(engine.diagnostics), 500 + THREADS * 500)
+        self.assertEqual(engine.count(Level.ERROR), 500)
+        self.assertEqual(engine.count(Level.WARNING), THREADS * 500)
+        self.assertEqual(engine.count_category("Parse Issue"), len(engine.diagnostics))
+        self.assertEqual(engine.suppressed, (THREADS - 1) * 500)
+
+    def test_fork_and_merge(self):
+        texts = [SOURCE.format(n=n) for n in range(THREADS)]
+        serial = DiagnosticEngine()
+        for n, text in enumerate(texts):
+            Cursor(text, f"{n}.cj", serial).tokenize()
+
+        engine = DiagnosticEngine()
+        buffers = [engine.fork() for _ in texts]
+        run_threads(lambda n: Cursor(texts[n], f"{n}.cj", buffers[n]).tokenize())
+        engine.merge(buffers)
+        self.assertTrue(serial.diagnostics)
+        self.assertEqual(records(engine), records(serial))
+        self.assertEqual(engine.count(Level.ERROR), serial.count(Level.ERROR))
+
+    def test_merge_deduplicates(self):
+        first, second = DiagnosticEngine(), DiagnosticEngine()
+        for engine in (first, second, second):
+            engine.error("Expected '}'", SourceLocation("a.cj", 2, 0), "Parse Issue")
+        engine = DiagnosticEngine()
+        engine.merge([first, second])
+        self.assertEqual(len(engine.diagnostics), 1)
+        self.assertEqual(engine.suppressed, 2)
+
+    def test_clone_with_buffer(self):
+        for cursor_class in (Cursor, ProfilingCursor):
+            cursor = cursor_class("let a = 0b12\n")
+            clone = cursor.clone(cursor.diagnostics.fork())
+            self.assertIsInstance(clone, cursor_class)
+            clone.tokenize()
+            self.assertEqual(cursor.diagnostics.diagnostics, [])
+            self.assertIs(clone.symbols, cursor.symbols)
+            cursor.diagnostics.merge([clone.diagnostics])
+            self.assertTrue(cursor.diagnostics.has_errors())
+
+
+class TestSymbolTableThreads(unittest.TestCase):
+    def test_one_id_per_name(self):
+        symbols = SymbolTable()
+        names = [f"name{i}" for i in range(2000)]
+        seen = [None] * THREADS
+
+        def intern(index: int):
+            seen[index] = [symbols.intern(name) for name in names]
+
+        run_threads(intern)
+        self.assertEqual(len(symbols), len(names))
+        for ids in seen:
+            self.assertEqual(ids, seen[0])
+        self.assertEqual([symbols.name(symbol) for symbol in seen[0]], names)
+
+
+class TestThreadedDriver(unittest.TestCase):
+    def setUp(self):
+        directory = temporary_directory(self)
+        self.paths = write_sources(directory, [SOURCE.format(n=n) * (n % 4 + 1) for n in range(24)])
+        self.paths.append(os.path.join(directory, "missing.cj"))
+
+    def test_matches_serial(self):
+        for mode in (TOKENIZE, PARSE):
+            serial = process_files(self.paths, mode, details=True)
+            threaded = process_files(self.paths, mode, jobs=4, details=True, threads=True)
+            self.assertEqual(
+                [(r.path, r.tokens, r.diagnostics, r.error, r.details) for r in threaded],
+                [(r.path, r.tokens, r.diagnostics, r.error, r.details) for r in serial],
+            )
+
+    def test_shared_pool(self):
+        # Many cursors lexing the same texts at once
+        texts = [SOURCE.format(n=n) for n in range(4)] * 8
+
+        def spans(text: str):
+            return [(token.type, token.start_pos) for token in Cursor(text).tokenize()]
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            self.assertEqual(list(pool.map(spans, texts)), [spans(text) for text in texts])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import json
+import unittest
+
+from cjlang.driver import PARSE, TOKENIZE, process_file, process_files
+from cjlang.trace import Tracer
+from support import main_source, temporary_directory, write_sources
+
+SOURCE = main_source("let value = 0b102")
+
+
+class TestTracer(unittest.TestCase):
+    def test_span(self):
+        tracer = Tracer()
+        with tracer.span("lex", file="a.cj"):
+            pass
+        with self.assertRaises(ValueError):
+            with tracer.span("parse", file="a.cj"):
+                raise ValueError
+        self.assertEqual([span[0] for span in tracer.spans], ["lex", "parse"])
+        name, category, start, duration, pid, tid, args = tracer.spans[0]
+        self.assertEqual(category, "cjlang")
+        self.assertGreaterEqual(duration, 0)
+        self.assertEqual(pid, os.getpid())
+        self.assertEqual(args, {"file": "a.cj"})
+        self.assertEqual(set(tracer.totals()), {"lex", "parse"})
+        self.assertEqual(set(tracer.totals("file")), {"a.cj"})
+
+    def test_chrome_trace(self):
+        tracer = Tracer()
+        tracer.extend([("lex", "cjlang", 5000, 2000, 42, 1, {"file": "b.cj"})])
+        tracer.extend([("read", "cjlang", 3000, 1000, 42, 1, {"file": "b.cj"})])
+        trace = json.loads(json.dumps(tracer.to_chrome_trace()))
+        metadata, lex, read = trace["traceEvents"]
+        self.assertEqual(metadata["ph"], "M")
+        self.assertEqual(metadata["pid"], 42)
+        self.assertEqual(metadata["args"]["name"], "cjlang worker 42")
+        self.assertEqual((lex["ph"], lex["ts"], lex["dur"], lex["pid"]), ("X", 2.0, 2.0, 42))
+        self.assertEqual(read["ts"], 0.0)
+
+    def test_empty(self):
+        self.assertEqual(Tracer().to_chrome_trace()["traceEvents"], [])
+
+
+class TestDriver(unittest.TestCase):
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.paths = write_sources(self.directory, [SOURCE * (i + 1) for i in range(4)])
+
+    def test_process_file(self):
+        result = process_file(self.paths[0], TOKENIZE)
+        self.assertEqual(result.chars, len(SOURCE))
+        self.assertGreater(result.tokens, 0)
+        self.assertTrue(result.has_errors())
+        self.assertEqual(result.diagnostics[0]["file"], self.paths[0])
+        self.assertEqual(result.diagnostics[0]["line"], 4)
+        self.assertEqual(result.spans, [])
+
+    def test_phases(self):
+        tracer = Tracer()
+        process_files(self.paths[:1], PARSE, tracer=tracer)
+        self.assertEqual(
+            [span[0] for span in tracer.spans], ["batch", "read", "lex", "parse", "diagnostics"]
+        )
+        tracer = Tracer()
+        process_files(self.paths[:1], TOKENIZE, tracer=tracer)
+        self.assertNotIn("parse", tracer.totals())
+
+    def test_unreadable(self):
+        result = process_file(os.path.join(self.directory, "missing.cj"))
+        self.assertIsNotNone(result.error)
+        self.assertTrue(result.has_errors())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            process_file(self.paths[0], "format")
+
+    def test_parallel(self):
+        tracer = Tracer()
+        results = process_files(self.paths, PARSE, jobs=2, tracer=tracer)
+        serial = process_files(self.paths, PARSE)
+        self.assertEqual([r.path for r in results], self.paths)
+        self.assertEqual([r.tokens for r in results], [r.tokens for r in serial])
+        self.assertEqual([r.diagnostics for r in results], [r.diagnostics for r in serial])
+        worker_pids = {span[4] for span in tracer.spans if span[0] != "batch"}
+        self.assertNotIn(os.getpid(), worker_pids)
+        self.assertEqual(set(tracer.totals("file")), set(self.paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
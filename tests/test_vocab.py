@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from cjlang.lexer.cursor import Cursor
+from cjlang.lexer.kinds import TokenKind
+from cjlang.vocab import VALUE_KINDS, Vocabulary, build_vocabulary, count_text
+from support import main_source, temporary_directory, write_sources
+
+SOURCE = main_source("let value = 0x1F; // comment", "println(value + value)")
+
+
+class TestVocabulary(unittest.TestCase):
+    def counts(self, text=SOURCE) -> Counter:
+        counts: Counter = Counter()
+        count_text(text, counts)
+        return counts
+
+    def test_round_trip(self):
+        vocabulary = Vocabulary.from_counts(self.counts())
+        ids = vocabulary.encode(SOURCE)
+        self.assertEqual(vocabulary.decode(ids), SOURCE)
+        self.assertFalse(any(vocabulary.is_unknown(token_id) for token_id in ids))
+        self.assertEqual(ids[0], vocabulary.kind_ids[TokenKind.PACKAGE])
+
+    def test_one_spelling_per_kind(self):
+        # decode spells every kind outside VALUE_KINDS as kind.value
+        checked = set()
+        for kind in TokenKind:
+            if kind in VALUE_KINDS or not kind.value or kind.value[0].isalpha():
+                continue
+            text = f"a {kind.value} b"
+            try:
+                tokens = Cursor(text).tokenize()
+            except Exception:
+                # Spellings the lexer rejects, such as # and $
+                continue
+            for token in tokens[:-1]:
+                if token.type not in VALUE_KINDS:
+                    self.assertEqual(text[token.start_pos : token.end_pos], token.type.value, text)
+                    checked.add(token.type)
+            vocabulary = Vocabulary.from_counts(self.counts(text))
+            self.assertEqual(vocabulary.decode(vocabulary.encode(text)), text)
+        self.assertIn(TokenKind.SEMI, checked)
+        self.assertIn(TokenKind.COLON, checked)
+
+    def test_order_and_oov(self):
+        vocabulary = Vocabulary.from_counts(self.counts(), min_count=2)
+        kinds = len(vocabulary.kinds)
+        # Single spaces are the most frequent varying token
+        self.assertEqual(vocabulary.token(kinds), (TokenKind.WS, " "))
+        self.assertIn((TokenKind.IDENT, "value"), vocabulary.entries)
+        self.assertNotIn((TokenKind.IDENT, "println"), vocabulary.entries)
+        ids = vocabulary.encode(SOURCE)
+        self.assertIn(vocabulary.kind_ids[TokenKind.IDENT], ids)
+        self.assertIn("    <IDENT>(value + value)\n", vocabulary.decode(ids))
+        self.assertEqual(vocabulary.id_of(TokenKind.IDENT, "println"), vocabulary.kind_ids[TokenKind.IDENT])
+        limited = Vocabulary.from_counts(self.counts(), max_size=kinds + 1)
+        self.assertEqual(len(limited), kinds + 1)
+        with self.assertRaises(ValueError):
+            vocabulary.decode([len(vocabulary)])
+
+    def test_deterministic(self):
+        counts = self.counts()
+        reordered = Counter(dict(reversed(list(counts.items()))))
+        self.assertEqual(Vocabulary.from_counts(counts).entries, Vocabulary.from_counts(reordered).entries)
+
+    def test_save_and_load(self):
+        vocabulary = Vocabulary.from_counts(self.counts("let 仓颉 = \"text\"\n" + SOURCE))
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("vocab.json", "vocab.json.gz"):
+                path = os.path.join(directory, name)
+                vocabulary.save(path)
+                loaded = Vocabulary.load(path)
+                self.assertEqual(loaded.entries, vocabulary.entries)
+                self.assertEqual(loaded.encode(SOURCE), vocabulary.encode(SOURCE))
+        data = vocabulary.to_json()
+        data["kinds"] = data["kinds"][:-1] + ["NOT_A_KIND"]
+        with self.assertRaises(ValueError):
+            Vocabulary.from_json(data)
+
+    def test_build_in_parallel(self):
+        paths = write_sources(temporary_directory(self), [SOURCE, "let x = 1\n", "let bad = #\n"] * 3)
+        serial = build_vocabulary(paths)
+        parallel = build_vocabulary(paths, jobs=2)
+        self.assertEqual(serial.entries, parallel.entries)
+        self.assertIn((TokenKind.IDENT, "x"), serial.entries)
+        self.assertNotIn((TokenKind.IDENT, "bad"), serial.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()